@@ -2,16 +2,25 @@
 AICS与MLE职业发展轨迹数据分析
 """
 
+import sys
+import argparse
 import warnings
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 import numpy as np
 
+from heatmap import draw_heatmap
+from lazy_imports import lazy_import
+from render_profiles import PROFILES, DEFAULT_PROFILE, FORMATS, get_profile, save_chart
+from trend_forecast import forecast, market_estimates
+
+# matplotlib/seaborn 在首次渲染图表时才导入，导入本模块不做任何绘图初始化
+plt = lazy_import('matplotlib.pyplot', on_load=lambda _: setup_matplotlib_for_plotting())
+sns = lazy_import('seaborn')
+
 def setup_matplotlib_for_plotting():
     """
     Setup matplotlib and seaborn for plotting with proper configuration.
-    Call this function before creating any plots to ensure proper rendering.
+    Called automatically the first time pyplot is used, so chart functions
+    render correctly without an explicit setup call.
     """
     warnings.filterwarnings('default')  # Show all warnings
 
@@ -27,33 +36,26 @@ def setup_matplotlib_for_plotting():
     plt.rcParams["font.sans-serif"] = ["Noto Sans CJK SC", "WenQuanYi Zen Hei", "PingFang SC", "Arial Unicode MS", "Hiragino Sans GB"]
     plt.rcParams["axes.unicode_minus"] = False
 
-# 设置matplotlib
-setup_matplotlib_for_plotting()
+# 图表默认保存目录
+CHARTS_DIR = '/workspace/charts'
 
-print("🔍 开始创建AICS与MLE职业发展轨迹分析图表...")
+# 各图表的 figure 尺寸 (英寸)，render_memory 据此估算渲染内存
+FIGURE_SIZES = {
+    'salary_comparison': (12, 8),
+    'top_companies_salary_heatmap': (12, 8),
+    'skills_radar_chart': (10, 10),
+    'career_path_timeline': (14, 10),
+    'investment_trends': (12, 10),
+    'startup_exits_analysis': (12, 8),
+}
 
 # 1. 薪资对比分析
-def create_salary_comparison():
-    """创建AICS vs MLE薪资对比图"""
-    
-    # 基于收集的数据创建薪资对比数据
-    experience_levels = ['0-2年\n(入门级)', '3-5年\n(中级)', '6-8年\n(高级)', '8+年\n(资深)']
-    
-    # MLE薪资数据 (基于多个来源的平均值，单位：千美元)
-    mle_salaries = [118, 156, 184, 240]  # 来源：Glassdoor, levels.fyi等
-    
-    # AICS薪资数据 (基于AI专家薪资报告和行业调研)
-    # AICS作为更专业化的角色，薪资通常比一般MLE高10-30%
-    aics_salaries = [140, 200, 280, 350]
-    
-    # 顶级公司额外津贴 (OpenAI, Google, NVIDIA等)
-    top_company_premium = [50, 100, 200, 400]
+def draw_salary_comparison(ax, experience_levels, mle_salaries, aics_salaries, top_company_premium):
+    """在ax上绘制AICS vs MLE薪资对比柱状图 (供模板模式复用)"""
     
     x = np.arange(len(experience_levels))
     width = 0.25
     
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
     bars1 = ax.bar(x - width, mle_salaries, width, label='MLE (机器学习工程师)', alpha=0.8, color='#3498db')
     bars2 = ax.bar(x, aics_salaries, width, label='AICS (AI芯片专家)', alpha=0.8, color='#e74c3c')
     bars3 = ax.bar(x + width, [m + a + t for m, a, t in zip(mle_salaries, aics_salaries, top_company_premium)], 
@@ -80,61 +82,66 @@ def create_salary_comparison():
     ax.set_xticklabels(experience_levels)
     ax.legend(loc='upper left', fontsize=11)
     ax.grid(True, alpha=0.3, axis='y')
-    
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/salary_comparison.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("✅ 薪资对比图已保存至 /workspace/charts/salary_comparison.png")
 
-# 2. 顶级公司薪资热力图
-def create_top_companies_heatmap():
-    """创建顶级公司薪资热力图"""
-    
-    companies = ['OpenAI', 'Google', 'NVIDIA', 'Meta', 'Microsoft', 'Amazon', 'Apple', 'Anthropic']
-    roles = ['入门级\nMLE', '中级\nMLE', '高级\nMLE', '入门级\nAICS', '中级\nAICS', '高级\nAICS']
+def create_salary_comparison(output_dir=CHARTS_DIR, profile=None):
+    """创建AICS vs MLE薪资对比图"""
+    # 薪资数据集要加载抽取快照，只在画图时导入，避免拖慢模块导入
+    from salary_store import LEVELS, market_stats
     
-    # 薪资数据矩阵 (千美元) - 基于levels.fyi和行业报告
-    salary_matrix = np.array([
-        [248, 394, 875, 280, 450, 1000],  # OpenAI
-        [180, 280, 450, 200, 320, 500],   # Google
-        [170, 280, 420, 190, 350, 480],   # NVIDIA
-        [190, 320, 500, 220, 380, 580],   # Meta
-        [175, 260, 380, 195, 300, 450],   # Microsoft
-        [160, 240, 350, 180, 280, 400],   # Amazon
-        [170, 250, 380, 190, 290, 450],   # Apple
-        [220, 350, 600, 250, 400, 700],   # Anthropic
-    ])
+    # 基于收集的数据创建薪资对比数据
+    experience_levels = ['0-2年\n(入门级)', '3-5年\n(中级)', '6-8年\n(高级)', '8+年\n(资深)']
     
-    fig, ax = plt.subplots(figsize=(12, 8))
+    # MLE / AICS 各级别薪资中位数 (千美元)，来自薪资数据集中的整理数据
+    # AICS作为更专业化的角色，薪资通常比一般MLE高10-30%
+    medians = market_stats().pivot('median', ['MLE', 'AICS'], LEVELS[:4]).round().astype(int)
+    mle_salaries, aics_salaries = medians.tolist()
     
-    # 创建热力图
-    im = ax.imshow(salary_matrix, cmap='YlOrRd', aspect='auto')
+    # 顶级公司额外津贴 (OpenAI, Google, NVIDIA等)
+    top_company_premium = [50, 100, 200, 400]
     
-    # 设置刻度标签
-    ax.set_xticks(np.arange(len(roles)))
-    ax.set_yticks(np.arange(len(companies)))
-    ax.set_xticklabels(roles, fontsize=11)
-    ax.set_yticklabels(companies, fontsize=11)
+    fig, ax = plt.subplots(figsize=FIGURE_SIZES['salary_comparison'])
+    draw_salary_comparison(ax, experience_levels, mle_salaries, aics_salaries, top_company_premium)
     
-    # 添加数值标签
-    for i in range(len(companies)):
-        for j in range(len(roles)):
-            text = ax.text(j, i, f'${salary_matrix[i, j]}K',
-                          ha="center", va="center", color="white", fontweight='bold', fontsize=10)
+    output_path = save_chart(plt.gcf(), output_dir, 'salary_comparison', profile)
+    plt.close()
+    print(f"✅ 薪资对比图已保存至 {output_path}")
+
+# 2. 顶级公司薪资热力图
+def draw_top_companies_heatmap(ax, companies, roles, salary_matrix, order=None):
+    """
+    在ax上绘制公司 × 岗位薪资热力图
+    数百家公司时按像素预算合并相邻行并跳过放不下的数值标签，order 见 heatmap.draw_heatmap
+    """
+    result = draw_heatmap(ax, salary_matrix, companies, roles, value_format='${}K',
+                          fontsize=10, fontweight='bold', tick_fontsize=11, order=order)
     
     ax.set_title('顶级科技公司薪资对比热力图 (2024-2025)', fontsize=16, fontweight='bold', pad=20)
     
     # 添加颜色条
-    cbar = plt.colorbar(im, ax=ax, shrink=0.8)
+    cbar = ax.figure.colorbar(result.image, ax=ax, shrink=0.8)
     cbar.set_label('年薪 (千美元)', rotation=270, labelpad=20, fontsize=12)
+    return result
+
+def create_top_companies_heatmap(output_dir=CHARTS_DIR, profile=None):
+    """创建顶级公司薪资热力图"""
+    from salary_store import CURATED_COMPANIES, CURATED_COMPANY_COLUMNS, CURATED_SOURCE, default_salary_store
+    
+    companies = list(CURATED_COMPANIES)
+    roles = [f'{level}\n{role}' for role, level in CURATED_COMPANY_COLUMNS]
+    
+    # 薪资数据矩阵 (千美元) - 公司 × (岗位, 级别) 的薪资中位数，基于levels.fyi和行业报告
+    stats = default_salary_store().groupby(('company', 'role', 'level'), ('median',), source=CURATED_SOURCE)
+    salary_matrix = stats.pivot('median', companies, CURATED_COMPANY_COLUMNS)
+    
+    fig, ax = plt.subplots(figsize=FIGURE_SIZES['top_companies_salary_heatmap'])
+    draw_top_companies_heatmap(ax, companies, roles, salary_matrix)
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/top_companies_salary_heatmap.png', dpi=300, bbox_inches='tight')
+    output_path = save_chart(plt.gcf(), output_dir, 'top_companies_salary_heatmap', profile)
     plt.close()
-    print("✅ 顶级公司薪资热力图已保存至 /workspace/charts/top_companies_salary_heatmap.png")
+    print(f"✅ 顶级公司薪资热力图已保存至 {output_path}")
 
 # 3. 技能要求雷达图
-def create_skills_radar_chart():
+def create_skills_radar_chart(output_dir=CHARTS_DIR, profile=None):
     """创建AICS vs MLE技能要求雷达图"""
     
     categories = ['编程能力', '数学统计', '硬件知识', '系统设计', '机器学习', '云平台', '团队协作', '领导力']
@@ -150,7 +157,7 @@ def create_skills_radar_chart():
     mle_scores += mle_scores[:1]
     aics_scores += aics_scores[:1]
     
-    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+    fig, ax = plt.subplots(figsize=FIGURE_SIZES['skills_radar_chart'], subplot_kw=dict(projection='polar'))
     
     # 绘制MLE
     ax.plot(angles, mle_scores, 'o-', linewidth=2, label='MLE (机器学习工程师)', color='#3498db')
@@ -171,28 +178,48 @@ def create_skills_radar_chart():
     plt.title('AICS vs MLE 技能要求对比雷达图', size=16, fontweight='bold', pad=30)
     plt.legend(loc='upper right', bbox_to_anchor=(1.2, 1.1), fontsize=12)
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/skills_radar_chart.png', dpi=300, bbox_inches='tight')
+    output_path = save_chart(plt.gcf(), output_dir, 'skills_radar_chart', profile)
     plt.close()
-    print("✅ 技能要求雷达图已保存至 /workspace/charts/skills_radar_chart.png")
+    print(f"✅ 技能要求雷达图已保存至 {output_path}")
 
 # 4. 职业发展路径图
-def create_career_path_timeline():
+# 每条岗位路径的模拟轨迹数：分位数误差约为 ±1%，单核模拟约0.3秒
+CAREER_SIMULATION_PATHS = 200_000
+
+def draw_career_bands(ax, bands, color):
+    """绘制模拟轨迹的 p10-p90、p25-p75 薪资区间与中位数"""
+    years = np.arange(len(bands[50]))
+    ax.fill_between(years, bands[10], bands[90], color=color, alpha=0.10, linewidth=0, label='模拟区间 p10-p90')
+    ax.fill_between(years, bands[25], bands[75], color=color, alpha=0.20, linewidth=0, label='模拟区间 p25-p75')
+    ax.plot(years, bands[50], '--', linewidth=1.5, color=color, alpha=0.8, label='模拟中位数')
+
+def create_career_path_timeline(output_dir=CHARTS_DIR, profile=None):
     """创建职业发展路径时间线图"""
+    from career_simulation import TRACKS, model_from_store, simulate_careers
+    from salary_store import market_stats
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=FIGURE_SIZES['career_path_timeline'])
+    
+    # 各阶段对应的级别：工作年限与薪资均取薪资数据集中该级别的中位数
+    path_levels = ['入门级', '中级', '高级', '架构师', '高管']
+    salaries = market_stats().pivot('median', ['MLE', 'AICS'], path_levels).round().astype(int).tolist()
+    timelines = market_stats(value='yoe').pivot('median', ['MLE', 'AICS'], path_levels).tolist()
     
     # MLE发展路径
     mle_stages = ['初级MLE\n(0-2年)', '中级MLE\n(2-5年)', '高级MLE\n(5-8年)', 'ML架构师\n(8-12年)', 'CTO/VP\n(12年+)']
-    mle_timeline = [1, 3, 6, 10, 15]
-    mle_salaries = [118, 156, 184, 280, 400]
+    mle_timeline, mle_salaries = timelines[0], salaries[0]
     
     # AICS发展路径
     aics_stages = ['硬件工程师\n(0-3年)', 'AI芯片工程师\n(3-6年)', '高级AICS\n(6-10年)', '芯片架构师\n(10-15年)', '创业/CTO\n(15年+)']
-    aics_timeline = [1.5, 4.5, 8, 12.5, 18]
-    aics_salaries = [140, 200, 280, 450, 600]
+    aics_timeline, aics_salaries = timelines[1], salaries[1]
+    
+    # 蒙特卡洛模拟的逐年薪资分位数区间 (固定种子，输出可复现)
+    model = model_from_store()
+    bands = {track: simulate_careers(model, CAREER_SIMULATION_PATHS, track, seed=0).percentiles()
+             for track in TRACKS}
     
     # 绘制MLE路径
+    draw_career_bands(ax1, bands['MLE'], '#3498db')
     ax1.plot(mle_timeline, mle_salaries, 'o-', linewidth=3, markersize=8, color='#3498db', label='MLE职业路径')
     for i, (x, y, stage) in enumerate(zip(mle_timeline, mle_salaries, mle_stages)):
         ax1.annotate(stage, (x, y), textcoords="offset points", xytext=(0,15), 
@@ -201,13 +228,15 @@ def create_career_path_timeline():
                     ha='center', fontsize=10, fontweight='bold', color='#2980b9')
     
     ax1.set_xlim(0, 20)
-    ax1.set_ylim(50, 450)
+    ax1.set_ylim(50, max(450, bands['MLE'][90].max() * 1.05))
     ax1.set_xlabel('职业年限', fontsize=12, fontweight='bold')
     ax1.set_ylabel('年薪 (千美元)', fontsize=12, fontweight='bold')
     ax1.set_title('MLE (机器学习工程师) 职业发展路径', fontsize=14, fontweight='bold')
     ax1.grid(True, alpha=0.3)
+    ax1.legend(loc='upper left', fontsize=10)
     
     # 绘制AICS路径
+    draw_career_bands(ax2, bands['AICS'], '#e74c3c')
     ax2.plot(aics_timeline, aics_salaries, 'o-', linewidth=3, markersize=8, color='#e74c3c', label='AICS职业路径')
     for i, (x, y, stage) in enumerate(zip(aics_timeline, aics_salaries, aics_stages)):
         ax2.annotate(stage, (x, y), textcoords="offset points", xytext=(0,15), 
@@ -216,30 +245,69 @@ def create_career_path_timeline():
                     ha='center', fontsize=10, fontweight='bold', color='#c0392b')
     
     ax2.set_xlim(0, 20)
-    ax2.set_ylim(50, 650)
+    ax2.set_ylim(50, max(650, bands['AICS'][90].max() * 1.05))
     ax2.set_xlabel('职业年限', fontsize=12, fontweight='bold')
     ax2.set_ylabel('年薪 (千美元)', fontsize=12, fontweight='bold')
     ax2.set_title('AICS (AI芯片专家) 职业发展路径', fontsize=14, fontweight='bold')
     ax2.grid(True, alpha=0.3)
+    ax2.legend(loc='upper left', fontsize=10)
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/career_path_timeline.png', dpi=300, bbox_inches='tight')
+    output_path = save_chart(plt.gcf(), output_dir, 'career_path_timeline', profile)
     plt.close()
-    print("✅ 职业发展路径图已保存至 /workspace/charts/career_path_timeline.png")
+    print(f"✅ 职业发展路径图已保存至 {output_path}")
 
 # 5. AI芯片市场投资趋势图
-def create_investment_trends():
+FORECAST_YEARS = (2025, 2030)
+# extract/ 中没有2030年市场估计时沿用的原图数值 (十亿美元)
+DEFAULT_MARKET_2030 = 295
+
+
+def draw_forecast_interval(ax, xs, point, lower, upper, color, label):
+    """在预测年份上画预测区间的误差线"""
+    point, lower, upper = (np.asarray(v, dtype=np.float64) for v in (point, lower, upper))
+    ax.errorbar(xs, point, yerr=[point - lower, upper - point], fmt='none', ecolor=color,
+                elinewidth=2, capsize=6, zorder=3, label=label)
+
+
+def market_forecast(history, market_history, anchor_year=FORECAST_YEARS[-1]):
+    """
+    市场规模预测：以各机构对 anchor_year 的直接估计 (中位数) 为锚点，
+    从本图2024年数值按锚点隐含的复合增长率外推各预测年份；最低/最高估计给出区间
+
+    Returns:
+        (点预测, 下界, 上界)，各为 FORECAST_YEARS 上的数组
+    """
+    estimates = market_estimates(anchor_year) or [DEFAULT_MARKET_2030]
+    anchors = [estimates[0], float(np.median(estimates)), estimates[-1]]
+    span = anchor_year - history[-1]
+    rates = [(anchor / market_history[-1]) ** (1 / span) - 1 for anchor in anchors]
+    paths = forecast(history, [market_history] * len(anchors), FORECAST_YEARS, 'cagr', rate=rates).point
+    lower, point, upper = paths
+    return point, lower, upper
+
+
+def create_investment_trends(output_dir=CHARTS_DIR, profile=None):
     """创建AI芯片市场投资趋势图"""
     
-    years = ['2020', '2021', '2022', '2023', '2024', '2025E', '2030E']
-    market_size = [15, 22, 35, 55, 85, 113, 295]  # 单位：十亿美元
-    vc_investment = [0.8, 1.2, 2.1, 1.8, 2.5, 3.2, 5.0]  # 风险投资，单位：十亿美元
+    history = [2020, 2021, 2022, 2023, 2024]
+    market_history = [15, 22, 35, 55, 85]  # 单位：十亿美元
+    vc_history = [0.8, 1.2, 2.1, 1.8, 2.5]  # 风险投资，单位：十亿美元
+    # 市场规模锚定机构对2030年的直接估计，风险投资按历史线性趋势外推
+    # (5个点的对数线性拟合外推6年会把2030年放大到130亿美元以上，线性趋势与原图估计一致)
+    market = market_forecast(history, market_history)
+    vc = forecast(history, vc_history, FORECAST_YEARS, 'linear')
+
+    years = [str(y) for y in history] + [f'{y}E' for y in FORECAST_YEARS]
+    market_size = market_history + [int(round(v)) for v in market[0]]
+    vc_investment = vc_history + [round(float(v), 1) for v in vc.point[0]]
+    forecast_x = years[len(history):]
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=FIGURE_SIZES['investment_trends'])
     
     # 市场规模趋势
     ax1.plot(years, market_size, 'o-', linewidth=3, markersize=8, color='#2ecc71', label='AI芯片市场规模')
     ax1.fill_between(years, market_size, alpha=0.3, color='#2ecc71')
+    draw_forecast_interval(ax1, forecast_x, *market, '#27ae60', '机构估计区间')
     
     for x, y in zip(years, market_size):
         ax1.annotate(f'${y}B', (x, y), textcoords="offset points", xytext=(0,10), 
@@ -252,6 +320,7 @@ def create_investment_trends():
     
     # 风险投资趋势
     bars = ax2.bar(years, vc_investment, alpha=0.8, color='#f39c12', label='风险投资额')
+    draw_forecast_interval(ax2, forecast_x, *vc.series(0), '#d35400', f'{vc.level:.0%} 预测区间')
     
     for bar, value in zip(bars, vc_investment):
         height = bar.get_height()
@@ -267,13 +336,12 @@ def create_investment_trends():
     ax2.grid(True, alpha=0.3, axis='y')
     ax2.legend()
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/investment_trends.png', dpi=300, bbox_inches='tight')
+    output_path = save_chart(plt.gcf(), output_dir, 'investment_trends', profile)
     plt.close()
-    print("✅ 投资趋势图已保存至 /workspace/charts/investment_trends.png")
+    print(f"✅ 投资趋势图已保存至 {output_path}")
 
 # 6. 创业退出案例分析
-def create_startup_exits_analysis():
+def create_startup_exits_analysis(output_dir=CHARTS_DIR, profile=None):
     """创建AI芯片创业公司退出案例分析"""
     
     companies = ['Graphcore\n(SoftBank收购)', 'Cerebras\n(IPO申请)', 'Habana\n(Intel收购)', 'Mellanox\n(NVIDIA收购)', 'Mobileye\n(Intel收购)']
@@ -282,7 +350,7 @@ def create_startup_exits_analysis():
     exit_types = ['收购', 'IPO', '收购', '收购', '收购']
     colors = ['#e74c3c', '#f39c12', '#e74c3c', '#e74c3c', '#e74c3c']
     
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig, ax = plt.subplots(figsize=FIGURE_SIZES['startup_exits_analysis'])
     
     bars = ax.bar(companies, valuations, color=colors, alpha=0.8)
     
@@ -306,30 +374,85 @@ def create_startup_exits_analysis():
     ax.legend(handles=legend_elements, loc='upper right', fontsize=11)
     
     plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/startup_exits_analysis.png', dpi=300, bbox_inches='tight')
+    output_path = save_chart(plt.gcf(), output_dir, 'startup_exits_analysis', profile)
     plt.close()
-    print("✅ 创业退出案例分析图已保存至 /workspace/charts/startup_exits_analysis.png")
-
-# 创建charts目录
-import os
-os.makedirs('/workspace/charts', exist_ok=True)
-
-# 执行所有分析
-print("📊 开始生成分析图表...")
-create_salary_comparison()
-create_top_companies_heatmap()
-create_skills_radar_chart()
-create_career_path_timeline()
-create_investment_trends()
-create_startup_exits_analysis()
-
-print("\n🎉 所有分析图表已生成完成！")
-print("📁 图表保存位置：/workspace/charts/")
-print("📋 生成的图表列表：")
-print("   1. salary_comparison.png - 薪资对比分析")
-print("   2. top_companies_salary_heatmap.png - 顶级公司薪资热力图")
-print("   3. skills_radar_chart.png - 技能要求雷达图")
-print("   4. career_path_timeline.png - 职业发展路径图")
-print("   5. investment_trends.png - 投资趋势图")
-print("   6. startup_exits_analysis.png - 创业退出案例分析")
+    print(f"✅ 创业退出案例分析图已保存至 {output_path}")
+
+# 图表注册表：名称即输出文件名，保证并行渲染时输出路径确定
+CHARTS = {
+    'salary_comparison': create_salary_comparison,
+    'top_companies_salary_heatmap': create_top_companies_heatmap,
+    'skills_radar_chart': create_skills_radar_chart,
+    'career_path_timeline': create_career_path_timeline,
+    'investment_trends': create_investment_trends,
+    'startup_exits_analysis': create_startup_exits_analysis,
+}
+
+def main(argv=None):
+    """生成所有AICS与MLE分析图表"""
+    # 渲染调度、缓存与计时只有命令行入口用到，推迟导入以保持模块导入开销
+    from parallel_render import memory_plan, render_charts, print_report
+    from render_cache import RenderCache, DEFAULT_CACHE_MAX_BYTES, print_cache_report
+    from render_memory import print_memory_plan
+    from render_metrics import export_metrics, print_metrics_report
+
+    parser = argparse.ArgumentParser(description='生成AICS与MLE职业发展轨迹分析图表')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='并行渲染的工作进程数 (默认使用全部可用核心，1为串行)')
+    parser.add_argument('-o', '--output-dir', default=CHARTS_DIR, help='图表保存目录')
+    parser.add_argument('--charts', nargs='+', choices=list(CHARTS), default=None,
+                        help='只渲染指定的图表 (默认全部)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='增量构建缓存目录，输入和样式未变化的图表直接复用')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_BYTES / 1024 / 1024,
+                        help='缓存容量上限 (MB)，超出时淘汰最久未使用的图表')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='渲染配置：draft 快速预览，web 网页缩略图，publication 出版质量')
+    parser.add_argument('--format', choices=FORMATS, default=None, help='输出格式 (默认PNG)')
+    parser.add_argument('--dpi', type=int, default=None, help='覆盖渲染配置的分辨率')
+    parser.add_argument('--metrics-dir', default=None,
+                        help='采集分阶段渲染耗时，累计写入该目录下的JSON与Prometheus文件')
+    parser.add_argument('--memory-budget-mb', type=float, default=None,
+                        help='渲染总内存预算 (MB)，据此限制并发，超出额度的大图分块渲染')
+    args = parser.parse_args(argv)
+    profile = get_profile(args.profile, args.format, args.dpi)
+
+    print("🔍 开始创建AICS与MLE职业发展轨迹分析图表...")
+
+    # 执行所有分析
+    print("📊 开始生成分析图表...")
+    memory_budget = int(args.memory_budget_mb * 1024 * 1024) if args.memory_budget_mb else None
+    if memory_budget:
+        try:
+            print_memory_plan(memory_plan('aics_mle_analysis', args.charts, args.workers, profile, memory_budget))
+        except ValueError as exc:
+            parser.error(str(exc))
+    results = render_charts('aics_mle_analysis', args.output_dir, args.charts,
+                            workers=args.workers, cache_dir=args.cache_dir, profile=profile,
+                            metrics=args.metrics_dir is not None, memory_budget=memory_budget)
+    failed = print_report(results)
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+        print_cache_report(results, cache, cache.evict())
+    if args.metrics_dir:
+        recorded = [result.metrics for result in results if result.metrics is not None]
+        print_metrics_report(recorded)
+        export_metrics(recorded, args.metrics_dir)
+        print(f"📈 渲染计时已累计写入 {args.metrics_dir}")
+
+    if failed:
+        print("\n⚠️ 部分分析图表生成失败，请查看上方错误信息")
+    else:
+        print("\n🎉 所有分析图表已生成完成！")
+    print(f"📁 图表保存位置：{args.output_dir}")
+    print("📋 生成的图表列表：")
+    print(f"   1. salary_comparison{profile.extension} - 薪资对比分析")
+    print(f"   2. top_companies_salary_heatmap{profile.extension} - 顶级公司薪资热力图")
+    print(f"   3. skills_radar_chart{profile.extension} - 技能要求雷达图")
+    print(f"   4. career_path_timeline{profile.extension} - 职业发展路径图")
+    print(f"   5. investment_trends{profile.extension} - 投资趋势图")
+    print(f"   6. startup_exits_analysis{profile.extension} - 创业退出案例分析")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+职业发展评分引擎 - 向量化计算全部用户的维度得分与综合得分
+输入为 用户 × 维度 × 指标 的评分数组，按职业阶段权重一次性计算，
+不再逐用户循环
+
+    维度得分 = Σ(指标权重 × 指标评分) / Σ(指标权重)      (只统计有记录的指标)
+    综合得分 = Σ(阶段维度权重 × 维度得分) / Σ(阶段维度权重) (只统计有得分的维度)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from progress_data import DIMENSION_CODES, normalize_dimension
+
+# 各职业阶段的维度权重 (%)，顺序与 DIMENSION_CODES 一致，见 docs/progress_tracking_indicators.md
+STAGE_WEIGHTS = {
+    'junior': [35, 25, 20, 10, 10],
+    'mid': [30, 30, 15, 15, 10],
+    'senior': [25, 30, 15, 20, 10],
+    'expert': [20, 25, 15, 25, 15],
+}
+
+STAGE_NAMES = list(STAGE_WEIGHTS)
+
+# 阶段 × 维度 的权重表，每行归一化
+STAGE_WEIGHT_TABLE = np.array([STAGE_WEIGHTS[stage] for stage in STAGE_NAMES], dtype=np.float64)
+STAGE_WEIGHT_TABLE /= STAGE_WEIGHT_TABLE.sum(axis=1, keepdims=True)
+
+# 按工作年限划分职业阶段的边界 (年)：<3 初级，3-8 中级，8-15 高级，15+ 顶级
+STAGE_YEAR_BOUNDS = [3, 8, 15]
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+@dataclass
+class ScoreResult:
+    """评分结果，第一维均为用户"""
+    total: np.ndarray        # (U,)   综合得分
+    dimension: np.ndarray    # (U, D) 维度得分，无记录的维度为 NaN
+    target: np.ndarray       # (U, D) 维度目标分，无目标的维度为 NaN
+    gap: np.ndarray          # (U, D) 目标分 - 当前得分
+    total_target: np.ndarray  # (U,)  按同样阶段权重汇总的目标分
+    total_gap: np.ndarray    # (U,)   综合目标分 - 综合得分
+
+
+def stage_index(stages):
+    """把阶段名称数组 (如 'mid') 转为 STAGE_NAMES 中的下标数组"""
+    stages = np.asarray(stages)
+    if np.issubdtype(stages.dtype, np.integer):
+        return stages
+    names, inverse = np.unique(stages, return_inverse=True)
+    unknown = set(names) - set(STAGE_NAMES)
+    if unknown:
+        raise ValueError(f"未知职业阶段: {', '.join(sorted(map(str, unknown)))}")
+    lookup = np.array([STAGE_NAMES.index(name) for name in names])
+    return lookup[inverse]
+
+
+def stage_from_experience(years):
+    """按工作年限推断职业阶段下标"""
+    return np.digitize(np.asarray(years, dtype=np.float64), STAGE_YEAR_BOUNDS)
+
+
+def _weighted_nanmean(values, weights, axis):
+    """忽略 NaN 的加权平均；全为 NaN 时结果为 NaN"""
+    present = ~np.isnan(values)
+    w = np.where(present, weights, 0.0)
+    total_w = w.sum(axis=axis)
+    total = np.where(present, values, 0.0)
+    total = (total * w).sum(axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total_w > 0, total / total_w, np.nan)
+
+
+def stage_weighted_total(dimension_scores, stages='mid'):
+    """
+    按阶段权重汇总维度得分
+
+    Args:
+        dimension_scores: (..., D) 维度得分
+        stages: 单个阶段名，或与前导维度形状一致的阶段名/下标数组
+    """
+    dimension_scores = np.asarray(dimension_scores, dtype=np.float64)
+    if isinstance(stages, str):
+        weights = STAGE_WEIGHT_TABLE[STAGE_NAMES.index(stages)]
+    else:
+        weights = STAGE_WEIGHT_TABLE[stage_index(stages)]
+    return _weighted_nanmean(dimension_scores, weights, axis=-1)
+
+
+def score_users(scores, targets=None, stages='mid', indicator_weights=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    一次计算所有用户的维度得分、综合得分与目标差距
+
+    Args:
+        scores: (U, D, I) 指标评分，缺失指标为 NaN
+        targets: (U, D, I) 指标目标分 (progress_records.target_score)，可选
+        stages: 阶段名，或长度为 U 的阶段名/下标数组
+        indicator_weights: (D, I) 维度内指标权重，默认等权
+        chunk_size: 每批处理的用户数，控制中间数组的内存占用
+
+    Returns:
+        ScoreResult
+    """
+    scores = np.asarray(scores)
+    n_users, n_dims, n_indicators = scores.shape
+    if indicator_weights is None:
+        indicator_weights = np.ones((n_dims, n_indicators))
+    indicator_weights = np.asarray(indicator_weights, dtype=np.float64)
+    stage_idx = None if isinstance(stages, str) else stage_index(stages)
+
+    dimension = np.empty((n_users, n_dims))
+    target = np.full((n_users, n_dims), np.nan)
+    total = np.empty(n_users)
+    total_target = np.full(n_users, np.nan)
+    for start in range(0, n_users, chunk_size):
+        end = min(start + chunk_size, n_users)
+        chunk_stages = stages if stage_idx is None else stage_idx[start:end]
+        dimension[start:end] = _weighted_nanmean(scores[start:end].astype(np.float64), indicator_weights, axis=-1)
+        total[start:end] = stage_weighted_total(dimension[start:end], chunk_stages)
+        if targets is not None:
+            target[start:end] = _weighted_nanmean(np.asarray(targets[start:end], dtype=np.float64),
+                                                  indicator_weights, axis=-1)
+            total_target[start:end] = stage_weighted_total(target[start:end], chunk_stages)
+    return ScoreResult(total, dimension, target, target - dimension, total_target, total_target - total)
+
+
+def build_score_tensor(user_ids, dimensions, indicators, scores, targets=None, record_dates=None):
+    """
+    由 progress_records 的列数组构建 用户 × 维度 × 指标 评分数组
+
+    同一 (用户, 维度, 指标) 有多条记录时取 record_date 最新的一条。
+
+    Args:
+        user_ids, dimensions, indicators: 等长的列数组
+        scores: 评分列
+        targets: target_score 列，可选
+        record_dates: 记录日期列 (可排序，如 'YYYY-MM-DD' 或 datetime64)，可选
+
+    Returns:
+        (用户ID数组, 每个维度的指标名称列表, 评分数组, 目标数组或None)
+    """
+    n_dims = len(DIMENSION_CODES)
+    dim_names, dim_inverse = np.unique(np.asarray(dimensions).astype(str), return_inverse=True)
+    dim_lookup = np.array([DIMENSION_CODES.index(normalize_dimension(name))
+                           if normalize_dimension(name) else -1 for name in dim_names])
+    dim_idx = dim_lookup[dim_inverse]
+    rows = np.flatnonzero(dim_idx >= 0)
+    dim_idx = dim_idx[rows]
+
+    users, user_idx = np.unique(np.asarray(user_ids)[rows], return_inverse=True)
+
+    # 指标在各自维度内编号：(维度, 指标) 组合排序后，减去该维度第一个组合的位置
+    ind_names, ind_idx = np.unique(np.asarray(indicators)[rows].astype(str), return_inverse=True)
+    pairs, pair_idx = np.unique(dim_idx * len(ind_names) + ind_idx, return_inverse=True)
+    pair_dims = pairs // len(ind_names)
+    slots = np.arange(len(pairs)) - np.searchsorted(pair_dims, pair_dims)
+    indicator_names = [ind_names[pairs[pair_dims == d] % len(ind_names)].tolist() for d in range(n_dims)]
+    n_indicators = int(slots.max()) + 1 if len(slots) else 1
+
+    # 按 (单元格, 日期) 排序后每个单元格取最后一条，即最新记录
+    cell = (user_idx * n_dims + dim_idx) * n_indicators + slots[pair_idx]
+    order_keys = (cell,) if record_dates is None else (np.asarray(record_dates)[rows], cell)
+    order = np.lexsort(order_keys)
+    last = np.append(cell[order][1:] != cell[order][:-1], True)
+    order = order[last]
+    cell, rows = cell[order], rows[order]
+
+    shape = (len(users), n_dims, n_indicators)
+    score_tensor = np.full(shape, np.nan, dtype=np.float32)
+    score_tensor.reshape(-1)[cell] = np.asarray(scores, dtype=np.float32)[rows]
+    target_tensor = None
+    if targets is not None:
+        target_tensor = np.full(shape, np.nan, dtype=np.float32)
+        target_tensor.reshape(-1)[cell] = np.asarray(targets, dtype=np.float32)[rows]
+    return users, indicator_names, score_tensor, target_tensor
+
+
+def build_score_tensor_from_batches(batches):
+    """由 table_loader.iter_batches 读取的 progress_records 批次构建评分数组"""
+    from table_loader import concat_batches
+    columns = concat_batches(batches)
+    return build_score_tensor(columns['user_id'], columns['dimension'], columns['indicator'],
+                              columns['score'], columns.get('target_score'), columns.get('record_date'))
@@ -0,0 +1,289 @@
+"""
+职业轨迹蒙特卡洛模拟 - 为职业发展路径图提供逐年薪资分位数区间
+每条轨迹从入门级开始逐年推进，模拟三类随机事件：
+
+    晋升时机   各级别停留年限服从Gamma分布，均值取薪资数据集中相邻级别的工作年限中位数之差；
+               越往上晋升成功的概率越低，未能晋升的轨迹停留在当前级别
+    薪资增长   个人薪资溢价 (对数正态，终身不变) × 级别基准薪资 × 级别内逐年涨薪 (正态增长率)
+    岗位转换   每年按转换概率在 MLE / AICS 之间切换，切换后按新岗位同级别的基准薪资计薪
+
+轨迹按块向量化模拟，每块只把薪资落入对数分箱的计数累加到 年 × 分箱 直方图中，
+内存占用与轨迹总数无关；直方图可直接相加，大规模模拟按块分发到多个进程后合并。
+每块使用由种子派生的独立随机流，相同种子的结果与进程数无关
+
+用法:
+    python career_simulation.py --paths 2000000 --workers 4
+    python career_simulation.py --track AICS --seed 7
+"""
+
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+
+from salary_store import market_stats
+
+TRACKS = ('MLE', 'AICS')
+# 路径图上的级别阶梯 (资深为同级别的高年限档，不作为单独的晋升阶段)
+LADDER = ('入门级', '中级', '高级', '架构师', '高管')
+
+DEFAULT_HORIZON = 20
+DEFAULT_CHUNK_PATHS = 100_000
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# 薪资直方图的对数分箱 (千美元)：相邻分箱相差约0.4%，分位数误差在此范围内
+SALARY_RANGE = (10.0, 20_000.0)
+SALARY_BINS = 2048
+# 到达各级别年份的分箱宽度 (年)
+REACH_BIN_YEARS = 0.1
+
+
+@dataclass(frozen=True)
+class CareerModel:
+    """
+    模拟参数；base_salary / level_years 形状为 (岗位, 级别)，按 TRACKS 与 LADDER 排列
+
+    level_years: 到达各级别的典型工作年限，相邻之差即该级别的平均停留年限
+    reach_prob: 晋升到各级别的成功概率 (第一项为入门级，恒为1)
+    tenure_shape: 停留年限Gamma分布的形状参数，越大越集中
+    premium_sigma: 个人薪资溢价的对数标准差
+    growth_mean, growth_sd: 级别内年涨薪率
+    switch_prob: 每年从该岗位转到另一岗位的概率
+    """
+    base_salary: tuple
+    level_years: tuple
+    reach_prob: tuple = (1.0, 0.95, 0.85, 0.5, 0.25)
+    tenure_shape: float = 4.0
+    premium_sigma: float = 0.25
+    growth_mean: float = 0.04
+    growth_sd: float = 0.03
+    switch_prob: tuple = (0.02, 0.03)
+
+
+def model_from_store(store=None, **overrides):
+    """按薪资数据集中 (岗位, 级别) 的薪资与工作年限中位数构建模型"""
+    salaries = market_stats(store=store).pivot('median', TRACKS, LADDER)
+    years = market_stats(value='yoe', store=store).pivot('median', TRACKS, LADDER)
+    if np.isnan(salaries).any() or np.isnan(years).any():
+        raise ValueError("薪资数据集缺少部分岗位/级别的中位数，无法构建职业模拟模型")
+    return CareerModel(tuple(map(tuple, salaries)), tuple(map(tuple, years)), **overrides)
+
+
+@dataclass
+class SimulationResult:
+    """
+    模拟结果
+
+    salary_hist: (年, 分箱) 薪资直方图；level_counts / track_counts: (年, 级别/岗位) 人数；
+    reach_hist: (级别, 年份分箱) 首次到达各级别的年份直方图
+    """
+    n_paths: int
+    horizon: int
+    salary_hist: np.ndarray
+    level_counts: np.ndarray
+    track_counts: np.ndarray
+    reach_hist: np.ndarray
+    elapsed: float = 0.0
+
+    @property
+    def years(self):
+        return np.arange(self.horizon + 1)
+
+    def merge(self, other):
+        self.n_paths += other.n_paths
+        self.salary_hist += other.salary_hist
+        self.level_counts += other.level_counts
+        self.track_counts += other.track_counts
+        self.reach_hist += other.reach_hist
+
+    def percentiles(self, percentiles=DEFAULT_PERCENTILES):
+        """逐年薪资分位数 (千美元)：{百分位: (年,) 数组}，在对数分箱内线性插值"""
+        edges = np.log(salary_edges())
+        cdf = np.cumsum(self.salary_hist, axis=1)
+        result = {}
+        for p in percentiles:
+            target = p / 100 * cdf[:, -1]
+            values = np.empty(len(cdf))
+            for year, row in enumerate(cdf):
+                i = min(np.searchsorted(row, target[year]), SALARY_BINS - 1)
+                below = row[i - 1] if i else 0
+                frac = (target[year] - below) / max(row[i] - below, 1)
+                values[year] = np.exp(edges[i] + frac * (edges[i + 1] - edges[i]))
+            result[p] = values
+        return result
+
+    def level_share(self):
+        """逐年各级别人数占比 (年, 级别)"""
+        return self.level_counts / np.maximum(self.level_counts.sum(axis=1, keepdims=True), 1)
+
+    def track_share(self):
+        return self.track_counts / np.maximum(self.track_counts.sum(axis=1, keepdims=True), 1)
+
+    def reach_median(self):
+        """到达各级别的年份中位数 (只统计在模拟期内到达的轨迹)，从未有人到达的级别为NaN"""
+        cdf = np.cumsum(self.reach_hist, axis=1)
+        result = np.full(len(cdf), np.nan)
+        for level, row in enumerate(cdf):
+            if row[-1]:
+                result[level] = (np.searchsorted(row, row[-1] / 2) + 0.5) * REACH_BIN_YEARS
+        return result
+
+    def reach_rate(self):
+        """模拟期内到达各级别的轨迹比例"""
+        return self.reach_hist.sum(axis=1) / max(self.n_paths, 1)
+
+
+def salary_edges():
+    return np.geomspace(*SALARY_RANGE, SALARY_BINS + 1)
+
+
+def _empty_result(horizon):
+    reach_bins = int(np.ceil((horizon + 1) / REACH_BIN_YEARS))
+    return SimulationResult(
+        n_paths=0, horizon=horizon,
+        salary_hist=np.zeros((horizon + 1, SALARY_BINS), dtype=np.int64),
+        level_counts=np.zeros((horizon + 1, len(LADDER)), dtype=np.int64),
+        track_counts=np.zeros((horizon + 1, len(TRACKS)), dtype=np.int64),
+        reach_hist=np.zeros((len(LADDER), reach_bins), dtype=np.int64),
+    )
+
+
+def _simulate_chunk(model, n, start_track, horizon, seed_seq):
+    """模拟一块轨迹，返回该块的直方图"""
+    rng = np.random.default_rng(seed_seq)
+    result = _empty_result(horizon)
+    result.n_paths = n
+    base = np.asarray(model.base_salary, dtype=np.float64)
+    years = np.asarray(model.level_years, dtype=np.float64)
+    reach_prob = np.asarray(model.reach_prob, dtype=np.float64)
+    switch_prob = np.asarray(model.switch_prob, dtype=np.float64)
+    mean_tenure = np.diff(years, axis=1)  # (岗位, 级别-1)：从该级别晋升到下一级的平均年限
+    top = len(LADDER) - 1
+    log_lo = np.log(SALARY_RANGE[0])
+    bin_scale = SALARY_BINS / (np.log(SALARY_RANGE[1]) - log_lo)
+    reach_bins = result.reach_hist.shape[1]
+
+    def next_promotion(now, track, level):
+        """下一次晋升的时间；已到顶或晋升失败的轨迹为inf"""
+        at_top = level >= top
+        nxt = np.minimum(level + 1, top)
+        tenure = mean_tenure[track, np.minimum(level, top - 1)]
+        when = now + rng.gamma(model.tenure_shape, tenure / model.tenure_shape)
+        fails = rng.random(len(level)) >= reach_prob[nxt]
+        return np.where(at_top | fails, np.inf, when)
+
+    track = np.full(n, start_track, dtype=np.int8)
+    level = np.zeros(n, dtype=np.int8)
+    premium = rng.lognormal(0.0, model.premium_sigma, n)
+    growth = np.ones(n)
+    promote_at = next_promotion(0.0, track, level)
+    result.reach_hist[0, 0] = n
+
+    for year in range(horizon + 1):
+        if year:
+            switch = rng.random(n) < switch_prob[track]
+            track = np.where(switch, 1 - track, track).astype(np.int8)
+            # 一年内可能连续晋升 (停留年限很短时)，逐次处理直到本年没有待晋升的轨迹
+            promoted = np.zeros(n, dtype=bool)
+            due = promote_at <= year
+            while due.any():
+                idx = np.flatnonzero(due)
+                reached = promote_at[idx]
+                level[idx] += 1
+                reach_bin = np.minimum((reached / REACH_BIN_YEARS).astype(np.int64), reach_bins - 1)
+                np.add.at(result.reach_hist, (level[idx], reach_bin), 1)
+                promote_at[idx] = next_promotion(reached, track[idx], level[idx])
+                promoted[idx] = True
+                due = promote_at <= year
+            rate = rng.normal(model.growth_mean, model.growth_sd, n)
+            growth = np.where(promoted, 1.0, growth * (1 + rate))
+        salary = base[track, level] * premium * growth
+        bins = np.clip(((np.log(salary) - log_lo) * bin_scale).astype(np.int64), 0, SALARY_BINS - 1)
+        result.salary_hist[year] += np.bincount(bins, minlength=SALARY_BINS)
+        result.level_counts[year] += np.bincount(level, minlength=len(LADDER))
+        result.track_counts[year] += np.bincount(track, minlength=len(TRACKS))
+    return result
+
+
+def simulate_careers(model=None, n_paths=1_000_000, start_track='MLE', horizon=DEFAULT_HORIZON, seed=0,
+                     chunk_paths=DEFAULT_CHUNK_PATHS, workers=1):
+    """
+    模拟 n_paths 条职业轨迹
+
+    Args:
+        model: CareerModel，默认按薪资数据集构建
+        start_track: 起始岗位，见 TRACKS
+        horizon: 模拟年数 (第0年为入职当年)
+        seed: 随机种子；每块使用 SeedSequence 派生的独立随机流，结果与 workers 无关
+        chunk_paths: 每块轨迹数，决定单块的内存占用
+        workers: 进程数，None或0表示使用全部可用核心，1表示在当前进程串行模拟
+
+    Returns:
+        SimulationResult
+    """
+    if start_track not in TRACKS:
+        raise ValueError(f"未知岗位: {start_track} (可选 {', '.join(TRACKS)})")
+    model = model or model_from_store()
+    start = time.perf_counter()
+    sizes = [chunk_paths] * (n_paths // chunk_paths)
+    if n_paths % chunk_paths:
+        sizes.append(n_paths % chunk_paths)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(model, size, TRACKS.index(start_track), horizon, s) for size, s in zip(sizes, seeds)]
+
+    if workers is None or workers <= 0:
+        from parallel_render import available_cpus
+        workers = available_cpus()
+    workers = max(1, min(workers, len(tasks)))
+    result = _empty_result(horizon)
+    if workers == 1:
+        for task in tasks:
+            result.merge(_simulate_chunk(*task))
+    else:
+        # 进程池只在并行模拟时导入，图表模块导入本模块时不承担 multiprocessing 的开销
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn')) as pool:
+            for partial in pool.map(_simulate_chunk, *zip(*tasks)):
+                result.merge(partial)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_simulation(result, track, percentiles=DEFAULT_PERCENTILES):
+    bands = result.percentiles(percentiles)
+    shares = result.level_share()
+    header = ''.join(f'{f"p{p}":>9}' for p in percentiles)
+    print(f"\n🎲 {track} 起步：{result.n_paths:,} 条轨迹，{result.elapsed:.2f}s")
+    print(f"{'年':>4}{header}   {'各级别占比 (' + ' / '.join(LADDER) + ')'}")
+    for year in result.years:
+        cells = ''.join(f'{bands[p][year]:9.0f}' for p in percentiles)
+        share = ' / '.join(f'{s:4.0%}' for s in shares[year])
+        print(f"{year:>4}{cells}   {share}")
+    reach = result.reach_median()
+    rates = result.reach_rate()
+    print('📈 到达各级别：' + '，'.join(
+        f'{name} {rate:.0%} (中位 {year:.1f}年)' for name, rate, year in zip(LADDER[1:], rates[1:], reach[1:])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='职业轨迹蒙特卡洛模拟 (薪资单位：千美元)')
+    parser.add_argument('--paths', type=int, default=1_000_000, help='轨迹数量')
+    parser.add_argument('--track', choices=TRACKS, nargs='+', default=list(TRACKS), help='起始岗位')
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON, help='模拟年数')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK_PATHS, help='每块轨迹数')
+    parser.add_argument('-j', '--workers', type=int, default=0, help='进程数，0表示全部可用核心')
+    args = parser.parse_args(argv)
+
+    model = model_from_store()
+    for track in args.track:
+        result = simulate_careers(model, args.paths, track, args.horizon, args.seed, args.chunk, args.workers)
+        print_simulation(result, track)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""
+图表性能基准 - 测量每个图表函数的耗时、峰值内存与输出文件大小
+每个 (用例, 规模) 在独立的spawn进程中运行，峰值RSS互不干扰；
+结果可保存为基线JSON，之后的运行与基线比较，超过阈值即视为性能回退
+
+用法:
+    python chart_benchmark.py --save-baseline chart_baseline.json     # 记录基线
+    python chart_benchmark.py --baseline chart_baseline.json          # 比较，回退时返回1
+    python chart_benchmark.py --cases comprehensive_dashboard --sizes 6 24
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+import warnings
+import statistics
+import contextlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+import aics_mle_analysis as aics
+import progress_visualization as pv
+from dashboard_batch import render_user_dashboards, dashboard_path
+from lazy_imports import ensure_loaded
+from progress_data import DashboardData, DIMENSION_CODES, GOAL_LABELS, TREND_DIMENSIONS
+from radar_grid import render_radar_pages, synthetic_team
+from render_profiles import PROFILES, DEFAULT_PROFILE, chart_path, get_profile, save_chart
+
+BASELINE_VERSION = 1
+
+# 各指标允许的相对增幅
+DEFAULT_THRESHOLDS = {'seconds': 0.25, 'peak_rss_mb': 0.20, 'output_bytes': 0.10}
+# 耗时变化小于该值 (秒) 时视为噪声，不判定回退
+MIN_SECONDS_DELTA = 0.05
+
+
+@dataclass
+class BenchCase:
+    """
+    一个基准用例
+
+    run(output_dir, size, profile) 渲染一次并返回生成的文件路径列表；
+    sizes 为合成输入的规模 (用户数、月份数等)，内置示例数据的图表只有一个规模 1
+    """
+    name: str
+    run: object
+    sizes: tuple = (1,)
+    unit: str = ''
+
+
+@dataclass
+class BenchResult:
+    """单个 (用例, 规模) 的测量结果"""
+    case: str
+    size: int
+    seconds: float           # 多次运行的中位数
+    seconds_min: float
+    peak_rss_mb: float       # 子进程峰值RSS
+    base_rss_mb: float       # 开始渲染前 (导入完成后) 的RSS
+    output_bytes: int
+    runs: int = 1
+    error: str = None
+
+    @property
+    def key(self):
+        return f'{self.case}@{self.size}'
+
+
+# ---- 用例定义 ----
+
+def _module_chart(module, chart_name):
+    def run(output_dir, size, profile):
+        module.CHARTS[chart_name](output_dir=output_dir, profile=profile)
+        return [chart_path(output_dir, chart_name, profile)]
+    return run
+
+
+def synthetic_dashboard(months, goals=5, seed=0):
+    """规模为 months 个月趋势、goals 个目标的Dashboard数据"""
+    rng = random.Random(seed)
+    trends = {dim: [round(rng.uniform(4, 9), 1) for _ in range(months)] for dim in TREND_DIMENSIONS}
+    return DashboardData(
+        user_id=f'synthetic_{months}',
+        total_score=7.3,
+        target_score=8.5,
+        dimension_scores=list(pv.SAMPLE_DASHBOARD.dimension_scores),
+        trend_months=[f'{m % 12 + 1}月' for m in range(months)],
+        trends=trends,
+        goals=[f'目标{i + 1}' for i in range(goals)],
+        goal_completion=[rng.randint(30, 100) for _ in range(goals)],
+        warnings_text=pv.SAMPLE_DASHBOARD.warnings_text,
+    )
+
+
+def _run_dashboard(output_dir, size, profile):
+    pv.create_comprehensive_dashboard(output_dir, synthetic_dashboard(size), profile=profile)
+    return [chart_path(output_dir, 'comprehensive_dashboard', profile)]
+
+
+def _run_salary_levels(output_dir, size, profile):
+    rng = random.Random(size)
+    levels = [f'L{i + 1}' for i in range(size)]
+    mle = [rng.randint(100, 400) for _ in levels]
+    aics_salaries = [m + rng.randint(10, 80) for m in mle]
+    premium = [rng.randint(20, 200) for _ in levels]
+    fig, ax = aics.plt.subplots(figsize=(12, 8))
+    try:
+        aics.draw_salary_comparison(ax, levels, mle, aics_salaries, premium)
+        return [save_chart(fig, output_dir, 'salary_comparison', profile)]
+    finally:
+        aics.plt.close(fig)
+
+
+def _run_companies_heatmap(output_dir, size, profile):
+    rng = np.random.default_rng(size)
+    companies = [f'公司{i + 1}' for i in range(size)]
+    roles = ['初级\nMLE', '高级\nMLE', '专家\nMLE', '初级\nAICS', '高级\nAICS', '专家\nAICS']
+    salary_matrix = rng.integers(150, 1000, size=(size, len(roles)))
+    fig, ax = aics.plt.subplots(figsize=(12, 8))
+    try:
+        aics.draw_top_companies_heatmap(ax, companies, roles, salary_matrix, order='cluster')
+        return [save_chart(fig, output_dir, 'top_companies_salary_heatmap', profile)]
+    finally:
+        aics.plt.close(fig)
+
+
+def synthetic_bundles(n_users, months=6, seed=0):
+    """按 user_id 排序的合成 (user_id, progress_records, career_goals, skill_assessments) 流"""
+    rng = random.Random(seed)
+    for u in range(n_users):
+        user_id = f'user_{u:06d}'
+        progress = [
+            {'user_id': user_id, 'dimension': dim, 'indicator': f'{dim}_{i}',
+             'score': round(rng.uniform(3, 10), 1), 'target_score': 8.5,
+             'record_date': f'2025-{m + 1:02d}-15'}
+            for dim in DIMENSION_CODES for i in range(3) for m in range(months)
+        ]
+        goals = [{'user_id': user_id, 'goal_type': goal_type, 'target_value': 100,
+                  'current_value': rng.randint(0, 100), 'status': 'active'}
+                 for goal_type in list(GOAL_LABELS)[:5]]
+        skills = [{'user_id': user_id, 'skill_name': f'技能{i}', 'current_level': rng.randint(1, 3),
+                   'target_level': rng.randint(3, 5)} for i in range(4)]
+        yield user_id, progress, goals, skills
+
+
+def _run_dashboard_batch(output_dir, size, profile):
+    stats = render_user_dashboards(synthetic_bundles(size), output_dir, profile=profile, progress_every=0)
+    if stats.failed:
+        raise RuntimeError(f'{stats.failed} 个用户渲染失败')
+    return [dashboard_path(output_dir, f'user_{u:06d}', profile) for u in range(size)]
+
+
+def _run_radar_grid(output_dir, size, profile):
+    users, skills, current, target = synthetic_team(size, seed=size)
+    return render_radar_pages(current, users, skills, output_dir, 'team_skills_radar',
+                              reference=target, title='团队技能雷达', profile=profile)
+
+
+def build_cases():
+    """全部基准用例：12个图表函数的内置数据，以及可调规模的合成输入"""
+    cases = {}
+    for module in (aics, pv):
+        for chart_name in module.CHARTS:
+            cases[chart_name] = BenchCase(chart_name, _module_chart(module, chart_name))
+    for case in (
+        BenchCase('comprehensive_dashboard@months', _run_dashboard, (6, 24, 96), '月'),
+        BenchCase('salary_comparison@levels', _run_salary_levels, (4, 16, 64), '级'),
+        BenchCase('top_companies_heatmap@companies', _run_companies_heatmap, (8, 100, 400, 1600), '公司'),
+        BenchCase('dashboard_batch@users', _run_dashboard_batch, (4, 16, 64), '用户'),
+        BenchCase('radar_grid@users', _run_radar_grid, (30, 200, 1000), '用户'),
+    ):
+        cases[case.name] = case
+    return cases
+
+
+# ---- 测量 ----
+
+def _rss_mb():
+    # Linux 上 ru_maxrss 单位为KB，macOS 为字节
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 / 1024
+
+
+def _measure(case_name, size, profile, repeat):
+    """在子进程中执行：预热一次后运行 repeat 次"""
+    # 两个图表模块的matplotlib初始化都会重置警告过滤器，先完成初始化
+    ensure_loaded(aics.plt)
+    ensure_loaded(pv.plt)
+    # 图表自身的打印输出与缺字警告会淹没测量结果
+    warnings.simplefilter('ignore')
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    case = build_cases()[case_name]
+    base_rss = _rss_mb()
+    times = []
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        paths = case.run(output_dir, size, profile)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            paths = case.run(output_dir, size, profile)
+            times.append(time.perf_counter() - start)
+            pv.plt.close('all')
+        output_bytes = sum(os.path.getsize(path) for path in paths)
+    return BenchResult(case_name, size, statistics.median(times), min(times),
+                       _rss_mb(), base_rss, output_bytes, repeat)
+
+
+def run_benchmarks(case_names=None, sizes=None, profile=None, repeat=3):
+    """
+    运行基准测试
+
+    Args:
+        case_names: 用例名称列表，默认全部
+        sizes: 只运行这些规模 (不在用例规模表中的规模会被忽略)
+        profile: 渲染配置，默认出版质量
+        repeat: 每个规模的计时次数
+
+    Returns:
+        BenchResult 列表
+    """
+    profile = get_profile(profile)
+    cases = build_cases()
+    case_names = case_names or list(cases)
+    unknown = [name for name in case_names if name not in cases]
+    if unknown:
+        raise ValueError(f"未知基准用例: {', '.join(unknown)}")
+
+    results = []
+    ctx = mp.get_context('spawn')
+    for name in case_names:
+        for size in cases[name].sizes:
+            if sizes and size not in sizes:
+                continue
+            # 每次测量使用全新进程，峰值RSS只反映当前用例
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                try:
+                    result = pool.submit(_measure, name, size, profile, repeat).result()
+                except Exception as exc:
+                    result = BenchResult(name, size, float('nan'), float('nan'),
+                                         float('nan'), float('nan'), 0, error=repr(exc))
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def print_result(result):
+    if result.error:
+        print(f"❌ {result.key}: {result.error}")
+        return
+    print(f"⏱️ {result.key:<40} {result.seconds:7.3f}s (最快 {result.seconds_min:.3f}s)  "
+          f"峰值RSS {result.peak_rss_mb:7.1f}MB  输出 {result.output_bytes / 1024:9.1f}KB")
+
+
+# ---- 基线 ----
+
+def environment_info():
+    ensure_loaded(pv.plt)
+    import matplotlib
+    return {
+        'python': platform.python_version(),
+        'matplotlib': matplotlib.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def save_baseline(path, results, profile):
+    data = {
+        'version': BASELINE_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'profile': profile.name,
+        'environment': environment_info(),
+        'results': {r.key: asdict(r) for r in results if not r.error},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{path} 的基线版本 {data.get('version')} 不受支持")
+    return data
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self):
+        return self.current / self.baseline - 1 if self.baseline else float('inf')
+
+
+def compare(results, baseline, thresholds=None):
+    """返回超过阈值的 Regression 列表；基线中没有的用例跳过"""
+    thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    regressions = []
+    for result in results:
+        reference = baseline['results'].get(result.key)
+        if reference is None:
+            continue
+        if result.error:
+            regressions.append(Regression(result.key, 'error', 0.0, float('nan')))
+            continue
+        for metric, limit in thresholds.items():
+            old, new = reference[metric], getattr(result, metric)
+            if metric == 'seconds' and new - old < MIN_SECONDS_DELTA:
+                continue
+            if new > old * (1 + limit):
+                regressions.append(Regression(result.key, metric, old, new))
+    return regressions
+
+
+def print_regressions(regressions, baseline):
+    if baseline.get('environment') != environment_info():
+        print("⚠️ 当前环境与基线记录的环境不同，比较结果仅供参考")
+    if not regressions:
+        print("\n✅ 未发现性能回退")
+        return
+    print(f"\n❌ 发现 {len(regressions)} 项性能回退：")
+    for r in regressions:
+        if r.metric == 'error':
+            print(f"   {r.key}: 运行失败")
+        else:
+            print(f"   {r.key} {r.metric}: {r.baseline:.3f} -> {r.current:.3f} (+{r.ratio:.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='图表函数性能基准')
+    parser.add_argument('--cases', nargs='+', default=None, help='只运行这些用例 (默认全部)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=None, help='只运行这些规模')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE, help='渲染配置')
+    parser.add_argument('--repeat', type=int, default=3, help='每个规模的计时次数')
+    parser.add_argument('--baseline', default=None, help='与该基线文件比较，出现回退时返回1')
+    parser.add_argument('--save-baseline', default=None, help='把本次结果保存为基线文件')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='统一的相对回退阈值 (如0.2表示20%%)，默认按指标分别设置')
+    parser.add_argument('--json', default=None, help='把本次结果写入JSON文件')
+    parser.add_argument('--list', action='store_true', help='列出全部用例')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in build_cases().values():
+            sizes = ', '.join(f'{s}{case.unit}' for s in case.sizes) if case.unit else '内置数据'
+            print(f"   {case.name:<40} {sizes}")
+        return 0
+
+    unknown = [name for name in args.cases or () if name not in build_cases()]
+    if unknown:
+        parser.error(f"未知基准用例: {', '.join(unknown)} (用 --list 查看全部用例)")
+
+    profile = get_profile(args.profile)
+    print(f"🏁 开始图表性能基准 (配置 {profile.name}，每个规模运行 {args.repeat} 次)...")
+    results = run_benchmarks(args.cases, args.sizes, profile, args.repeat)
+    failed = sum(1 for r in results if r.error)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in results], f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, profile)
+        print(f"💾 基线已保存至 {args.save_baseline}")
+
+    regressions = []
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline.get('profile') != profile.name:
+            print(f"⚠️ 基线使用的渲染配置为 {baseline.get('profile')}，本次为 {profile.name}")
+        thresholds = None
+        if args.threshold is not None:
+            thresholds = {metric: args.threshold for metric in DEFAULT_THRESHOLDS}
+        regressions = compare(results, baseline, thresholds)
+        print_regressions(regressions, baseline)
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+图表模板 - 同类图表重复渲染时复用figure
+figure、坐标轴和artist只创建一次，之后每次渲染只更新柱高、折线数据、
+饼图扇区和文字标签，再重新保存，省去重复的布局计算与artist创建开销
+"""
+
+import numpy as np
+
+import aics_mle_analysis as aics
+import progress_visualization as pv
+from render_profiles import get_profile, savefig_kwargs
+
+# savefig bbox_inches='tight' 的默认留白 (英寸)
+TIGHT_PAD_INCHES = 0.1
+
+
+class ChartTemplate:
+    """
+    图表模板基类
+
+    子类在 __init__ 中建好figure并记录需要更新的artist，在 update() 中只修改数据。
+    figure尺寸取自图表模块的 FIGURE_SIZES，是否执行 tight_layout 与 save_chart 一样由渲染配置决定，
+    模板输出与对应图表函数的输出保持一致。
+    fixed_bbox=True 时首次保存计算一次紧凑边界并在之后复用；每次保存前检查
+    variable_texts() 中随数据变化的文字是否超出缓存的边界，超出时自动重新计算，
+    也可调用 refit() 强制重新计算
+    """
+
+    def __init__(self, fig, fixed_bbox=True, profile=None):
+        self.fig = fig
+        self.fixed_bbox = fixed_bbox
+        self.profile = get_profile(profile)
+        self._bbox = None
+        self._bbox_dpi = None
+
+    def _layout(self):
+        """与 save_chart(layout=True) 相同：只有紧凑布局的配置才执行 tight_layout"""
+        if self.profile.tight:
+            self.fig.tight_layout()
+
+    def refit(self):
+        """丢弃缓存的紧凑边界，下次保存时重新计算"""
+        self._bbox = None
+
+    def variable_texts(self):
+        """update() 会改变内容或位置的文字artist，子类按需覆盖"""
+        return []
+
+    def _fits(self, renderer):
+        """随数据变化的文字是否都仍在缓存的紧凑边界内 (只测量这几段文字，不计算整图边界)"""
+        to_inches = self.fig.dpi_scale_trans.inverted()
+        for text in self.variable_texts():
+            if not text.get_visible() or not text.get_text():
+                continue
+            extent = text.get_window_extent(renderer).transformed(to_inches)
+            if (extent.x0 < self._bbox.x0 or extent.y0 < self._bbox.y0
+                    or extent.x1 > self._bbox.x1 or extent.y1 > self._bbox.y1):
+                return False
+        return True
+
+    def save(self, path, profile=None):
+        """按渲染配置保存当前状态 (默认为创建模板时的配置；配置不做紧凑布局时直接按figure尺寸保存)"""
+        profile = self.profile if profile is None else get_profile(profile)
+        if not (self.fixed_bbox and profile.tight):
+            self.fig.savefig(path, **savefig_kwargs(self.fig, profile))
+            return
+        dpi = savefig_kwargs(self.fig, profile)['dpi']
+        if self._bbox is not None and (dpi != self._bbox_dpi or not self._fits(self.fig.canvas.get_renderer())):
+            self.refit()
+        if self._bbox is None:
+            self._bbox, self._bbox_dpi = self._tight_bbox(dpi), dpi
+        self.fig.savefig(path, **savefig_kwargs(self.fig, profile, bbox=self._bbox))
+
+    def _tight_bbox(self, dpi):
+        """
+        按保存时的dpi测量紧凑边界：文字度量随dpi略有变化，
+        按屏幕dpi测量会与图表函数 bbox_inches='tight' 的输出差一两个像素
+        """
+        screen_dpi = self.fig.dpi
+        self.fig.set_dpi(dpi)
+        try:
+            return self.fig.get_tightbbox(self.fig.canvas.get_renderer()).padded(TIGHT_PAD_INCHES)
+        finally:
+            self.fig.set_dpi(screen_dpi)
+
+    def close(self):
+        pv.plt.close(self.fig)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _closed(values):
+    """雷达图数据首尾相接"""
+    values = list(values)
+    return values + values[:1]
+
+
+def _radar_angles(n):
+    return _closed(np.linspace(0, 2*np.pi, n, endpoint=False))
+
+
+class SalaryComparisonTemplate(ChartTemplate):
+    """AICS vs MLE薪资对比柱状图模板 (create_salary_comparison)"""
+
+    def __init__(self, experience_levels, mle_salaries, aics_salaries, top_company_premium,
+                 fixed_bbox=True, profile=None):
+        fig, ax = pv.plt.subplots(figsize=aics.FIGURE_SIZES['salary_comparison'])
+        super().__init__(fig, fixed_bbox, profile)
+        aics.draw_salary_comparison(ax, experience_levels, mle_salaries, aics_salaries, top_company_premium)
+        self._layout()
+        self.ax = ax
+        self.n_levels = len(experience_levels)
+        self._bars = ax.containers[:3]
+        self._labels = list(ax.texts)
+
+    def update(self, mle_salaries, aics_salaries, top_company_premium):
+        if not len(mle_salaries) == len(aics_salaries) == len(top_company_premium) == self.n_levels:
+            raise ValueError(f"模板按 {self.n_levels} 个经验水平创建，数据长度不一致")
+        top = [m + a + t for m, a, t in zip(mle_salaries, aics_salaries, top_company_premium)]
+        labels = iter(self._labels)
+        for bars, heights in zip(self._bars, (mle_salaries, aics_salaries, top)):
+            for bar, height in zip(bars, heights):
+                bar.set_height(height)
+                label = next(labels)
+                label.xy = (bar.get_x() + bar.get_width() / 2, height)
+                label.set_text(f'${height}K')
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class OverallProgressTemplate(ChartTemplate):
+    """五维度评估雷达图模板 (create_overall_progress_chart)"""
+
+    def __init__(self, dimensions, fixed_bbox=True, profile=None):
+        fig = pv.plt.figure(figsize=pv.FIGURE_SIZES['overall_progress_radar'])
+        super().__init__(fig, fixed_bbox, profile)
+        ax = fig.add_subplot(111, projection='polar')
+        pv.draw_overall_progress(ax, dimensions, [0.0] * len(dimensions), 0.0)
+        self._layout()
+        self.angles = _radar_angles(len(dimensions))
+        # 前5条是背景环线，第6条是数据线；填充区域与总分文字各一个
+        self._line = ax.lines[5]
+        self._area = ax.patches[-1]
+        self._total = fig.texts[-1]
+
+    def update(self, scores, total_score):
+        closed = _closed(scores)
+        if len(closed) != len(self.angles):
+            raise ValueError(f"模板按 {len(self.angles) - 1} 个维度创建，数据长度不一致")
+        self._line.set_data(self.angles, closed)
+        self._area.set_xy(np.column_stack([self.angles, closed]))
+        self._total.set_text(f'综合评分: {total_score:.1f}/10.0')
+
+
+class DashboardTemplate(ChartTemplate):
+    """综合Dashboard模板 (create_comprehensive_dashboard)"""
+
+    def __init__(self, data=pv.SAMPLE_DASHBOARD, fixed_bbox=True, profile=None):
+        # 网格布局自行管理子图间距，与 create_comprehensive_dashboard 一样不执行 tight_layout
+        fig, axes = pv.build_dashboard_layout()
+        super().__init__(fig, fixed_bbox, profile)
+        pv.draw_dashboard(axes, data)
+        self.axes = axes
+        ax1, ax2, ax3, ax4, ax5 = axes
+        self._wedges = ax1.patches[:2]
+        # pie() 会为每个扇区添加一个空标签，中心评分文字是其后的倒数第二个文本
+        self._score = ax1.texts[-2]
+        self._radar_line = ax2.lines[0]
+        self._radar_area = ax2.patches[0]
+        self._angles = _radar_angles(len(data.dimension_scores))
+        self._capture_trends(data)
+        self._capture_goals()
+        self._warnings = ax5.texts[0]
+
+    def variable_texts(self):
+        ax1, ax2, ax3, ax4, ax5 = self.axes
+        return [self._score, *ax3.get_xticklabels(), *ax3.get_yticklabels(), *ax4.get_yticklabels(),
+                *self._goal_labels, self._warnings]
+
+    def _capture_trends(self, data):
+        self._trend_lines = list(self.axes[2].lines)
+        self._trend_keys = list(data.trends)
+        self._months = list(data.trend_months)
+
+    def _capture_goals(self):
+        ax4 = self.axes[3]
+        self._goal_bars = list(ax4.patches)
+        self._goal_labels = list(ax4.texts)
+
+    def update(self, data):
+        ax1, ax2, ax3, ax4, ax5 = self.axes
+
+        # 环形图：按 pie(counterclock=False, startangle=90) 的规则重新计算扇区角度
+        boundary = 90 - 360 * data.total_score / 10
+        self._wedges[0].set_theta1(boundary)
+        self._wedges[0].set_theta2(90)
+        self._wedges[1].set_theta1(-270)
+        self._wedges[1].set_theta2(boundary)
+        self._score.set_text(f'{data.total_score:.1f}/10')
+
+        closed = _closed(pv.radar_scores(data.dimension_scores))
+        self._radar_line.set_data(self._angles, closed)
+        self._radar_area.set_xy(np.column_stack([self._angles, closed]))
+
+        if list(data.trends) != self._trend_keys:
+            # 趋势序列的数量或维度变化时重建这一个子图，折线与图例标签随之更新
+            ax3.cla()
+            pv.draw_key_trends(ax3, data.trend_months, data.trends)
+            self._capture_trends(data)
+        else:
+            positions = np.arange(len(data.trend_months))
+            for line, trend in zip(self._trend_lines, data.trends.values()):
+                line.set_data(positions, trend)
+            if list(data.trend_months) != self._months:
+                ax3.set_xticks(positions)
+                ax3.set_xticklabels(data.trend_months)
+                self._months = list(data.trend_months)
+            ax3.relim()
+            ax3.autoscale_view()
+
+        if len(data.goals) != len(self._goal_bars):
+            # 目标数量变化时只重建这一个子图
+            ax4.cla()
+            pv.draw_goal_completion(ax4, data.goals, data.goal_completion)
+            self._capture_goals()
+        else:
+            ax4.set_yticklabels(data.goals)
+            for bar, label, comp in zip(self._goal_bars, self._goal_labels, data.goal_completion):
+                bar.set_width(comp)
+                bar.set_facecolor(pv.completion_color(comp))
+                label.set_position((comp + 1, bar.get_y() + bar.get_height()/2))
+                label.set_text(f'{comp}%')
+
+        self._warnings.set_text(data.warnings_text)
@@ -0,0 +1,133 @@
+"""
+综合Dashboard批量生成 - 按用户数据流逐个渲染
+所有用户共用同一个Dashboard模板，每个用户只更新artist数据
+
+用法:
+    python dashboard_batch.py --progress progress_records.jsonl \
+        --goals career_goals.jsonl --skills skill_assessments.csv -o /workspace/charts/users
+(导出文件可为CSV或JSONL，均需按 user_id 的字符串顺序排序，如 ORDER BY user_id::text)
+"""
+
+import os
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+
+import progress_visualization as pv
+from career_scoring import STAGE_NAMES
+from chart_templates import DashboardTemplate
+from progress_data import build_dashboard_data, iter_user_bundles
+from progress_rollup import MonthlyRollup
+from render_profiles import PROFILES, DEFAULT_PROFILE, FORMATS, get_profile
+from table_loader import iter_rows
+
+
+@dataclass
+class BatchStats:
+    """批量渲染统计"""
+    users: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def users_per_second(self):
+        return self.users / self.elapsed if self.elapsed else 0.0
+
+
+def dashboard_path(output_dir, user_id, profile=None):
+    """用户Dashboard的输出路径，扩展名随渲染配置的格式变化"""
+    return os.path.join(output_dir, f'dashboard_{user_id}{get_profile(profile).extension}')
+
+
+def render_user_dashboards(bundles, output_dir, stage='mid', profile=None, progress_every=1000, rollup=None):
+    """
+    为数据流中的每个用户生成一张综合Dashboard
+
+    Args:
+        bundles: 可迭代的 (user_id, progress_records, career_goals, skill_assessments)，
+                 如 iter_user_bundles() 的输出；逐个消费，不会整体读入内存
+        output_dir: 输出目录，文件名为 dashboard_<user_id>.<格式扩展名>
+        stage: 职业阶段，决定维度权重
+        profile: 渲染配置名称或 RenderProfile，默认出版质量
+        progress_every: 每渲染多少个用户打印一次吞吐量，0表示不打印
+        rollup: progress_rollup.MonthlyRollup，提供时趋势面板从月度汇总读取
+
+    Returns:
+        BatchStats
+    """
+    profile = get_profile(profile)
+    os.makedirs(output_dir, exist_ok=True)
+    template = None
+    stats = BatchStats()
+    start = time.perf_counter()
+    try:
+        for user_id, progress, goals, skills in bundles:
+            try:
+                data = build_dashboard_data(user_id, progress, goals, skills, stage, rollup)
+                if template is None:
+                    template = DashboardTemplate(data, profile=profile)
+                else:
+                    template.update(data)
+                template.save(dashboard_path(output_dir, user_id, profile), profile)
+            except Exception as exc:
+                stats.failed += 1
+                print(f"❌ 用户 {user_id} 的Dashboard生成失败: {exc}")
+            stats.users += 1
+            if progress_every and stats.users % progress_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"   已处理 {stats.users} 个用户 ({stats.users / elapsed:.1f} 用户/秒)")
+    finally:
+        if template is not None:
+            template.close()
+        stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+# 生成Dashboard只需要的列，读取时裁剪其余列
+PROGRESS_COLUMNS = ['user_id', 'dimension', 'indicator', 'score', 'target_score', 'record_date']
+GOAL_COLUMNS = ['user_id', 'goal_type', 'target_value', 'current_value', 'status', 'progress_percentage']
+SKILL_COLUMNS = ['user_id', 'skill_name', 'current_level', 'target_level']
+
+
+def read_table(path, table, columns):
+    """流式读取数据表导出，未提供文件时视为空表"""
+    if path is None:
+        return iter(())
+    return iter_rows(path, table, columns=columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按用户批量生成综合Dashboard')
+    parser.add_argument('--progress', required=True, help='progress_records 导出 (CSV/JSONL，按user_id文本排序)')
+    parser.add_argument('--goals', default=None, help='career_goals 导出 (CSV/JSONL，按user_id文本排序)')
+    parser.add_argument('--skills', default=None, help='skill_assessments 导出 (CSV/JSONL，按user_id文本排序)')
+    parser.add_argument('-o', '--output-dir', default=os.path.join(pv.CHARTS_DIR, 'users'), help='输出目录')
+    parser.add_argument('--rollup', default=None, help='progress_rollup 月度汇总文件 (.npz)，趋势面板从中读取')
+    parser.add_argument('--stage', choices=STAGE_NAMES, default='mid', help='职业阶段权重')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='渲染配置：draft 快速预览，web 网页缩略图，publication 出版质量')
+    parser.add_argument('--format', choices=FORMATS, default=None, help='输出格式 (默认PNG)')
+    parser.add_argument('--dpi', type=int, default=None, help='覆盖渲染配置的分辨率')
+    args = parser.parse_args(argv)
+    profile = get_profile(args.profile, args.format, args.dpi)
+
+    print("📊 开始批量生成用户Dashboard...")
+    bundles = iter_user_bundles(read_table(args.progress, 'progress_records', PROGRESS_COLUMNS),
+                                read_table(args.goals, 'career_goals', GOAL_COLUMNS),
+                                read_table(args.skills, 'skill_assessments', SKILL_COLUMNS))
+    rollup = MonthlyRollup.load(args.rollup) if args.rollup else None
+    try:
+        stats = render_user_dashboards(bundles, args.output_dir, args.stage, profile, rollup=rollup)
+    except ValueError as exc:
+        # 导出文件未按 user_id 排序，继续合并会拆分或错配用户数据
+        print(f"❌ {exc}")
+        return 1
+    print(f"\n✅ 共处理 {stats.users} 个用户，失败 {stats.failed} 个，"
+          f"耗时 {stats.elapsed:.1f}s ({stats.users_per_second:.2f} 用户/秒)")
+    print(f"📁 Dashboard保存位置：{args.output_dir}")
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
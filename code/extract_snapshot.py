@@ -0,0 +1,592 @@
+"""
+extract/ 语料快照 - 把调研JSON编译为带索引的二进制快照
+编译时逐文件校验、展平为 (路径, 文本, 数值) 事实记录，并按公司、岗位、
+MBTI类型、指标名建立倒排索引；加载时通过mmap直接映射数组，无需重新解析JSON。
+源文件的修改时间或内容哈希变化后快照自动失效并重新编译。
+读取调研数据的模块 (薪资、趋势、MBTI、学习资源) 通过 read_document() 取还原后的文档，不再各自解析源文件
+
+用法:
+    python extract_snapshot.py               # 编译 (或校验已有快照) 并打印摘要
+    python extract_snapshot.py --query company OpenAI
+"""
+
+import os
+import re
+import sys
+import mmap
+import json
+import struct
+import hashlib
+import argparse
+import tempfile
+from dataclasses import dataclass
+
+import numpy as np
+
+EXTRACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'extract')
+SNAPSHOT_NAME = '.extract.snap'
+
+SNAPSHOT_MAGIC = b'AIXSNAP1'
+SNAPSHOT_VERSION = 2
+_ALIGN = 8
+
+# 文件状态：ok 正常结构化数据，raw 只有原始文本，error 抓取失败只有 error_details，invalid 无法解析
+FILE_STATUSES = ('ok', 'raw', 'error', 'invalid')
+
+# 数值单位，快照中按下标存储
+UNITS = ['', 'USD', 'CNY', 'EUR', '%']
+
+# 叶子值的JSON类型，快照中按下标存储，还原文档时据此恢复原始类型
+VALUE_KINDS = ('str', 'int', 'float', 'bool')
+
+# 快照内路径分量的分隔符：键名本身可能含 / (如 "区域薪资（美元/年）")，展示时再用 / 连接
+_PATH_SEP = '\x1f'
+_LIST_INDEX = re.compile(r'\[\d+\]')
+
+# 公司名称及别名 (别名按小写匹配)
+COMPANIES = {
+    'OpenAI': ['openai'],
+    'NVIDIA': ['nvidia', '英伟达'],
+    'Google': ['google', '谷歌', 'deepmind'],
+    'Meta': ['meta'],
+    'Microsoft': ['microsoft', '微软'],
+    'Anthropic': ['anthropic'],
+    'Apple': ['apple', '苹果'],
+    'Amazon': ['amazon', '亚马逊'],
+    'Intel': ['intel', '英特尔'],
+    'AMD': ['amd'],
+    'Cerebras': ['cerebras'],
+    'Graphcore': ['graphcore'],
+    'Groq': ['groq'],
+    'SambaNova': ['sambanova'],
+    'SoftBank': ['softbank', '软银'],
+    'G42': ['g42'],
+    'Uber': ['uber'],
+    'Databricks': ['databricks'],
+    'Baidu': ['baidu', '百度'],
+    'Alibaba': ['alibaba', '阿里巴巴'],
+    'Tencent': ['tencent', '腾讯'],
+    'ByteDance': ['bytedance', '字节跳动'],
+    'Huawei': ['huawei', '华为'],
+}
+
+# 岗位名称及别名；更具体的岗位排在前面，匹配后从文本中移除，避免 "机器学习工程师" 再命中 "工程师"
+ROLES = {
+    '机器学习工程师': ['机器学习工程师', 'machine learning engineer', 'ml工程师', 'ml engineer', 'mle'],
+    'AI工程师': ['ai工程师', 'ai engineer', '人工智能工程师'],
+    '算法工程师': ['算法工程师', 'nlp工程师', 'cv工程师', '视觉工程师'],
+    '数据科学家': ['数据科学家', 'data scientist'],
+    '研究科学家': ['研究科学家', 'research scientist', '研究员', 'researcher', '首席科学家'],
+    '数据工程师': ['数据工程师', 'data engineer'],
+    '提示工程师': ['提示工程师', 'prompt engineer'],
+    '硬件工程师': ['硬件工程师', 'hardware engineer', '电气工程师', 'electrical engineer'],
+    '软件工程师': ['软件工程师', 'software engineer', 'swe'],
+    '产品经理': ['产品经理', 'product manager'],
+    '工程经理': ['工程经理', 'engineering manager'],
+    'CTO': ['cto', '首席技术官'],
+    '咨询顾问': ['咨询顾问', 'consultant', 'ai顾问'],
+}
+
+_MBTI_RE = re.compile(r'(?<![A-Za-z])([EI][NS][TF][JP])(?![A-Za-z])')
+_AMOUNT_RE = re.compile(
+    r'^(?:约|~|≈|超过|可达|高达)?\s*(\$|¥|￥|€)?\s*(\d[\d,]*(?:\.\d+)?)\s*([KkMmBb]|万|亿)?\+?\s*(%|美元|元|欧元)?')
+_SCALE = {'k': 1e3, 'm': 1e6, 'b': 1e9, '万': 1e4, '亿': 1e8}
+_CURRENCY = {'$': 'USD', '美元': 'USD', '¥': 'CNY', '￥': 'CNY', '元': 'CNY', '€': 'EUR', '欧元': 'EUR'}
+
+
+def _alias_pattern(aliases):
+    """拉丁字母别名按词边界匹配 (避免 meta 命中 metadata)，中文别名按子串匹配"""
+    parts = [rf'(?<![a-z0-9]){re.escape(a)}(?![a-z0-9])' if a.isascii() else re.escape(a) for a in aliases]
+    return re.compile('|'.join(parts))
+
+
+_COMPANY_PATTERNS = [(name, _alias_pattern(aliases)) for name, aliases in COMPANIES.items()]
+_ROLE_PATTERNS = [(name, _alias_pattern(aliases)) for name, aliases in ROLES.items()]
+
+# 建立索引的维度
+INDEX_KINDS = ('company', 'role', 'mbti', 'metric')
+
+
+@dataclass
+class Fact:
+    """快照中的一条事实记录：源文件中的一个叶子值"""
+    file: str
+    path: str      # 以 / 连接的键路径，列表下标记为 [i]
+    text: str      # 叶子值的文本形式
+    number: float  # 解析出的数值，无法解析时为 NaN
+    unit: str      # UNITS 之一
+
+
+@dataclass
+class SourceFile:
+    """快照清单中的源文件条目"""
+    name: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    status: str
+    message: str = ''
+    fact_start: int = 0
+    fact_end: int = 0
+
+
+def parse_amount(text):
+    """
+    解析 "$248K"、"约160,000"、"$1.24M+"、"2.08%" 等金额/比例文本，
+    "130,000 – 189,000" 这类区间取下界
+
+    Returns:
+        (数值, 单位)，无法解析时为 (NaN, '')
+    """
+    if isinstance(text, bool):
+        return float('nan'), ''
+    if isinstance(text, (int, float)):
+        return float(text), ''
+    match = _AMOUNT_RE.match(text.strip())
+    if not match:
+        return float('nan'), ''
+    symbol, digits, scale, suffix = match.groups()
+    value = float(digits.replace(',', ''))
+    if scale:
+        value *= _SCALE[scale.lower()]
+    if suffix == '%':
+        return value, '%'
+    return value, _CURRENCY.get(symbol or suffix, '')
+
+
+def normalize_metric(key):
+    """指标名：去掉括号中的单位说明，英文转小写、空格统一为下划线"""
+    key = re.sub(r'[（(][^）)]*[）)]', '', str(key)).strip()
+    return re.sub(r'\s+', '_', key.lower())
+
+
+def _flatten(value, path=()):
+    """深度优先展平为 (路径元组, 叶子值)"""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _flatten(child, path + (str(key),))
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            yield from _flatten(child, path + (f'[{i}]',))
+    elif value is not None and value != '':
+        yield path, value
+
+
+def _value_kind(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    return 'float' if isinstance(value, float) else 'str'
+
+
+def _restore(node):
+    """还原时先全部建成字典，再把键均为 [i] 的字典转回列表"""
+    if not isinstance(node, dict):
+        return node
+    values = {key: _restore(child) for key, child in node.items()}
+    if values and all(_LIST_INDEX.fullmatch(key) for key in values):
+        return list(values.values())
+    return values
+
+
+def _file_terms(name):
+    """文件名中的公司名 (如 openai_salary_data.json) 作用于文件内全部记录"""
+    stem = name.rsplit('.', 1)[0].replace('_', ' ')
+    return {company for company, pattern in _COMPANY_PATTERNS if pattern.search(stem)}
+
+
+def index_terms(path, text, file_companies=()):
+    """一条事实记录在各索引维度下的键"""
+    haystack = ' '.join(path) + ' ' + text
+    lowered = haystack.lower()
+    companies = set(file_companies)
+    companies.update(name for name, pattern in _COMPANY_PATTERNS if pattern.search(lowered))
+    roles = set()
+    for name, pattern in _ROLE_PATTERNS:
+        if pattern.search(lowered):
+            roles.add(name)
+            lowered = pattern.sub(' ', lowered)
+    metric = next((p for p in reversed(path) if not p.startswith('[')), None)
+    return {
+        'company': companies,
+        'role': roles,
+        'mbti': set(_MBTI_RE.findall(haystack)),
+        'metric': {normalize_metric(metric)} if metric else set(),
+    }
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_entry(extract_dir, name, with_hash=True):
+    path = os.path.join(extract_dir, name)
+    st = os.stat(path)
+    return SourceFile(name, st.st_size, st.st_mtime_ns, _file_digest(path) if with_hash else '', 'ok')
+
+
+def list_sources(extract_dir=EXTRACT_DIR):
+    return sorted(name for name in os.listdir(extract_dir) if name.endswith('.json'))
+
+
+def _load_source(extract_dir, entry):
+    """读取并校验单个源文件，返回展平后的叶子列表；状态与原因写回 entry"""
+    try:
+        with open(os.path.join(extract_dir, entry.name), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        entry.status, entry.message = 'invalid', str(exc)
+        return []
+    if not isinstance(data, dict):
+        entry.status, entry.message = 'invalid', f'顶层应为对象，实际为 {type(data).__name__}'
+        return []
+    if set(data) == {'error_details'}:
+        entry.status, entry.message = 'error', str(data['error_details'])
+        return []
+    if set(data) == {'raw_content'}:
+        entry.status = 'raw'
+    return list(_flatten(data))
+
+
+def _blob(strings):
+    """字符串列表 -> (偏移数组, UTF-8字节数组)"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _postings(term_lists):
+    """每条记录的键集合 -> (排序后的键列表, CSR偏移, 记录ID数组)"""
+    by_key = {}
+    for fact_id, terms in enumerate(term_lists):
+        for term in terms:
+            by_key.setdefault(term, []).append(fact_id)
+    keys = sorted(by_key)
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum([len(by_key[k]) for k in keys], out=offsets[1:])
+    ids = [i for k in keys for i in by_key[k]]
+    return keys, offsets, np.array(ids, dtype=np.int32)
+
+
+def compile_snapshot(extract_dir=EXTRACT_DIR, snapshot_path=None):
+    """
+    编译 extract_dir 下全部JSON为快照文件
+
+    Returns:
+        清单中的 SourceFile 列表 (含被标记为 error/invalid 的文件)
+    """
+    snapshot_path = snapshot_path or os.path.join(extract_dir, SNAPSHOT_NAME)
+    files, fact_file, paths, texts, numbers, units, kinds = [], [], [], [], [], [], []
+    terms = {kind: [] for kind in INDEX_KINDS}
+    for file_id, name in enumerate(list_sources(extract_dir)):
+        entry = _source_entry(extract_dir, name)
+        entry.fact_start = len(paths)
+        companies = _file_terms(name)
+        for path, value in _load_source(extract_dir, entry):
+            text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+            number, unit = parse_amount(value)
+            fact_file.append(file_id)
+            paths.append(_PATH_SEP.join(path))
+            texts.append(text)
+            numbers.append(number)
+            units.append(UNITS.index(unit))
+            kinds.append(VALUE_KINDS.index(_value_kind(value)))
+            for kind, keys in index_terms(path, text, companies).items():
+                terms[kind].append(keys)
+        entry.fact_end = len(paths)
+        files.append(entry)
+
+    arrays = {
+        'fact_file': np.array(fact_file, dtype=np.int32),
+        'fact_number': np.array(numbers, dtype=np.float64),
+        'fact_unit': np.array(units, dtype=np.uint8),
+        'fact_kind': np.array(kinds, dtype=np.uint8),
+    }
+    arrays['path_offsets'], arrays['path_blob'] = _blob(paths)
+    arrays['text_offsets'], arrays['text_blob'] = _blob(texts)
+    index_keys = {}
+    for kind in INDEX_KINDS:
+        index_keys[kind], arrays[f'{kind}_offsets'], arrays[f'{kind}_ids'] = _postings(terms[kind])
+    _write_snapshot(snapshot_path, {
+        'version': SNAPSHOT_VERSION,
+        'files': [vars(entry) for entry in files],
+        'indexes': index_keys,
+    }, arrays)
+    return files
+
+
+def _write_snapshot(snapshot_path, header, arrays):
+    """
+    文件布局：魔数 | 头部长度 (uint64) | JSON头部 | 按8字节对齐的数组数据
+    头部记录每个数组的 (偏移, dtype, 长度)，偏移相对于数据区起点
+    """
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = [offset, array.dtype.str, len(array)]
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header = dict(header, arrays=layout)
+    raw = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    raw += b' ' * (-(len(SNAPSHOT_MAGIC) + 8 + len(raw)) % _ALIGN)
+
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack('<Q', len(raw)))
+            f.write(raw)
+            for array in arrays.values():
+                data = np.ascontiguousarray(array).tobytes()
+                f.write(data + b'\0' * (-len(data) % _ALIGN))
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ExtractSnapshot:
+    """
+    只读快照，数组直接映射到文件；字符串按需解码
+
+    lookup('company', 'OpenAI') 等查询只做一次字典查找和一次切片
+    """
+
+    def __init__(self, snapshot_path):
+        self.path = snapshot_path
+        with open(snapshot_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{snapshot_path} 不是extract快照文件")
+        start = len(SNAPSHOT_MAGIC) + 8
+        (header_len,) = struct.unpack_from('<Q', self._mm, len(SNAPSHOT_MAGIC))
+        header = json.loads(self._mm[start:start + header_len])
+        data_start = start + header_len
+        self.version = header['version']
+        self.files = [SourceFile(**entry) for entry in header['files']]
+        self._entries = {entry.name: entry for entry in self.files}
+        self._arrays = {
+            name: np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+            for name, (offset, dtype, count) in header['arrays'].items()
+        }
+        self._keys = {kind: {key: i for i, key in enumerate(keys)} for kind, keys in header['indexes'].items()}
+
+    def __len__(self):
+        return len(self._arrays['fact_file'])
+
+    @property
+    def error_files(self):
+        """抓取失败 (只有 error_details) 或无法解析的源文件"""
+        return [entry for entry in self.files if entry.status in ('error', 'invalid')]
+
+    def keys(self, kind):
+        return list(self._keys[kind])
+
+    def ids(self, kind, key):
+        """某个索引键对应的事实记录ID数组 (按ID升序)"""
+        pos = self._keys[kind].get(key)
+        if pos is None:
+            return np.empty(0, dtype=np.int32)
+        offsets = self._arrays[f'{kind}_offsets']
+        return self._arrays[f'{kind}_ids'][offsets[pos]:offsets[pos + 1]]
+
+    def _string(self, prefix, i):
+        offsets = self._arrays[f'{prefix}_offsets']
+        return self._arrays[f'{prefix}_blob'][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def fact(self, i):
+        return Fact(
+            file=self.files[self._arrays['fact_file'][i]].name,
+            path=self._string('path', i).replace(_PATH_SEP, '/'),
+            text=self._string('text', i),
+            number=float(self._arrays['fact_number'][i]),
+            unit=UNITS[self._arrays['fact_unit'][i]],
+        )
+
+    def lookup(self, kind, key, **more):
+        """
+        按一个或多个索引键查询，多个条件取交集
+
+        例：lookup('company', 'OpenAI', metric='total_compensation')
+        """
+        ids = self.ids(kind, key)
+        for other_kind, other_key in more.items():
+            ids = np.intersect1d(ids, self.ids(other_kind, other_key), assume_unique=True)
+        return [self.fact(int(i)) for i in ids]
+
+    def numbers(self, kind, key, unit=None):
+        """某个索引键下全部可解析数值 (向量化，不解码字符串)"""
+        ids = self.ids(kind, key)
+        values = self._arrays['fact_number'][ids]
+        keep = ~np.isnan(values)
+        if unit is not None:
+            keep &= self._arrays['fact_unit'][ids] == UNITS.index(unit)
+        return values[keep]
+
+    def file_facts(self, name):
+        entry = self._entries[name]
+        return [self.fact(i) for i in range(entry.fact_start, entry.fact_end)]
+
+    def document(self, name):
+        """
+        由事实记录还原源文件的JSON对象，不再读取和解析源文件
+
+        编译时丢弃的空字符串、null与空容器不会出现，列表中被丢弃的元素不占位；
+        源文件不在快照中或被标记为 error/invalid 时返回 None
+        """
+        entry = self._entries.get(name)
+        if entry is None or entry.status in ('error', 'invalid'):
+            return None
+        kinds, numbers = self._arrays['fact_kind'], self._arrays['fact_number']
+        document = {}
+        for i in range(entry.fact_start, entry.fact_end):
+            parts = self._string('path', i).split(_PATH_SEP)
+            kind = VALUE_KINDS[kinds[i]]
+            if kind == 'str':
+                value = self._string('text', i)
+            elif kind == 'bool':
+                value = self._string('text', i) == 'true'
+            else:
+                value = int(numbers[i]) if kind == 'int' else float(numbers[i])
+            node = document
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = value
+        return {key: _restore(child) for key, child in document.items()}
+
+    def close(self):
+        # 调用方仍持有 ids() 返回的视图时mmap无法立即关闭，留给垃圾回收释放
+        self._arrays = {}
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stale_reason(snapshot, extract_dir=EXTRACT_DIR):
+    """
+    检查快照是否与源文件一致，一致时返回 None，否则返回原因
+
+    大小和修改时间都未变的文件视为未修改；修改时间变化时再比较内容哈希，
+    只是被touch过的文件不会触发重新编译
+    """
+    if snapshot.version != SNAPSHOT_VERSION:
+        return f'快照版本 {snapshot.version} 已过期'
+    names = list_sources(extract_dir)
+    if names != [entry.name for entry in snapshot.files]:
+        return '源文件列表已变化'
+    for entry in snapshot.files:
+        current = _source_entry(extract_dir, entry.name, with_hash=False)
+        if current.size == entry.size and current.mtime_ns == entry.mtime_ns:
+            continue
+        if _file_digest(os.path.join(extract_dir, entry.name)) != entry.sha256:
+            return f'{entry.name} 已修改'
+    return None
+
+
+def load_snapshot(extract_dir=EXTRACT_DIR, snapshot_path=None, rebuild=True):
+    """
+    打开快照；快照缺失或过期时重新编译 (rebuild=False 时改为抛出异常)
+
+    Returns:
+        ExtractSnapshot
+    """
+    snapshot_path = snapshot_path or os.path.join(extract_dir, SNAPSHOT_NAME)
+    reason = '快照不存在'
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = ExtractSnapshot(snapshot_path)
+        except (ValueError, KeyError, json.JSONDecodeError, struct.error) as exc:
+            reason = f'快照损坏: {exc}'
+        else:
+            reason = stale_reason(snapshot, extract_dir)
+            if reason is None:
+                return snapshot
+            snapshot.close()
+    if not rebuild:
+        raise RuntimeError(f"extract快照需要重新编译: {reason}")
+    compile_snapshot(extract_dir, snapshot_path)
+    return ExtractSnapshot(snapshot_path)
+
+
+# extract目录 -> 进程内已打开的快照
+_opened = {}
+
+
+def default_snapshot(extract_dir=EXTRACT_DIR):
+    """
+    进程内共享的快照；每次调用都用 stale_reason 检查源文件 (通常只有stat的开销)，
+    过期时重新编译，常驻进程也能读到更新后的调研数据
+    """
+    extract_dir = os.path.abspath(extract_dir)
+    snapshot = _opened.get(extract_dir)
+    if snapshot is None or stale_reason(snapshot, extract_dir) is not None:
+        # 旧快照不主动关闭：调用方可能仍持有其数组视图
+        snapshot = _opened[extract_dir] = load_snapshot(extract_dir)
+    return snapshot
+
+
+def read_document(name, extract_dir=EXTRACT_DIR):
+    """读取单个源文件还原后的JSON对象；目录或文件缺失、抓取失败、无法解析时返回 None"""
+    if not os.path.isdir(extract_dir):
+        return None
+    return default_snapshot(extract_dir).document(name)
+
+
+def source_digests(names, extract_dir=EXTRACT_DIR):
+    """源文件的内容哈希 (取自快照清单)，缺失的文件为空字符串"""
+    if not os.path.isdir(extract_dir):
+        return {name: '' for name in names}
+    entries = default_snapshot(extract_dir)._entries
+    return {name: entries[name].sha256 if name in entries else '' for name in names}
+
+
+def print_snapshot_report(snapshot):
+    print(f"📦 快照: {snapshot.path}")
+    print(f"   源文件 {len(snapshot.files)} 个，事实记录 {len(snapshot)} 条")
+    for kind in INDEX_KINDS:
+        print(f"   {kind} 索引: {len(snapshot.keys(kind))} 个键")
+    for entry in snapshot.error_files:
+        print(f"⚠️ {entry.name} [{entry.status}]: {entry.message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='编译/查询 extract/ 调研数据快照')
+    parser.add_argument('--extract-dir', default=EXTRACT_DIR, help='调研JSON目录')
+    parser.add_argument('--snapshot', default=None, help=f'快照路径，默认 <extract-dir>/{SNAPSHOT_NAME}')
+    parser.add_argument('--force', action='store_true', help='忽略已有快照，强制重新编译')
+    parser.add_argument('--query', nargs=2, metavar=('KIND', 'KEY'), help=f"按索引查询，KIND为 {'/'.join(INDEX_KINDS)}")
+    args = parser.parse_args(argv)
+
+    if args.force:
+        compile_snapshot(args.extract_dir, args.snapshot)
+    with load_snapshot(args.extract_dir, args.snapshot) as snapshot:
+        if args.query:
+            kind, key = args.query
+            if kind not in INDEX_KINDS:
+                parser.error(f"未知索引: {kind}")
+            facts = snapshot.lookup(kind, key)
+            print(f"🔍 {kind}={key}: {len(facts)} 条记录")
+            for fact in facts:
+                number = f"  [{fact.number:g}{' ' + fact.unit if fact.unit else ''}]" if fact.number == fact.number else ''
+                print(f"   {fact.file}:{fact.path} = {fact.text[:80]}{number}")
+        else:
+            print_snapshot_report(snapshot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+可扩展热力图 - 供公司 × 岗位、学习类型 × 月份等矩阵热力图共用
+大矩阵按像素预算合并相邻行，数值标签合并为一个PathCollection一次绘制，
+单元格太小放不下标签时直接跳过；行可按均值排序或按相似度聚类排列，
+矩阵变大时artist数量与渲染时间基本不变
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# 每行至少占用的高度 (磅)，超过预算的行合并为组
+MIN_ROW_POINTS = 2.0
+# 标签所需的单元格高度与字号之比；字符宽度按字号的0.6估算
+LABEL_HEIGHT_RATIO = 1.3
+CHAR_WIDTH_RATIO = 0.6
+
+ROW_ORDERS = (None, 'value', 'cluster')
+
+
+@dataclass
+class HeatmapResult:
+    """draw_heatmap 的绘制结果"""
+    image: object          # AxesImage
+    rows: list             # 每个显示行包含的原始行下标
+    row_labels: list       # 显示行的标签
+    labels: object = None  # 数值标签的 PathCollection，跳过时为 None
+
+    @property
+    def aggregated(self):
+        return any(len(group) > 1 for group in self.rows)
+
+
+def row_order(data, method):
+    """
+    行排列顺序
+
+    'value' 按行均值从高到低；'cluster' 按第一主成分投影排序，
+    取值模式相近的行排在一起 (计算量为 O(行数 × 列数²)，适合数百上千行)
+    """
+    n_rows = len(data)
+    if method is None:
+        return np.arange(n_rows)
+    filled = np.where(np.isnan(data), np.nanmean(data, axis=0, keepdims=True), data)
+    filled = np.nan_to_num(filled)
+    if method == 'value':
+        return np.argsort(-filled.mean(axis=1), kind='stable')
+    if method == 'cluster':
+        centered = filled - filled.mean(axis=0)
+        if n_rows < 2 or not centered.any():
+            return np.arange(n_rows)
+        _, _, vt = np.linalg.svd(centered, full_matrices=False)
+        return np.argsort(centered @ vt[0], kind='stable')
+    raise ValueError(f"未知行排序方式: {method} (可选 value / cluster)")
+
+
+def aggregate_rows(data, max_rows):
+    """
+    把行数压缩到 max_rows 以内：相邻行按均值合并 (忽略NaN)
+
+    Returns:
+        (合并后的矩阵, 每个显示行包含的行下标列表)
+    """
+    n_rows = len(data)
+    if n_rows <= max_rows:
+        return data, [[i] for i in range(n_rows)]
+    bounds = np.linspace(0, n_rows, max_rows + 1).astype(int)
+    finite = ~np.isnan(data)
+    sums = np.add.reduceat(np.where(finite, data, 0.0), bounds[:-1], axis=0)
+    counts = np.add.reduceat(finite.astype(np.int64), bounds[:-1], axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        merged = np.where(counts > 0, sums / counts, np.nan)
+    return merged, [list(range(a, b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _axes_points(ax):
+    """坐标轴在figure中的尺寸 (磅)，与保存时的dpi无关"""
+    fig = ax.figure
+    pos = ax.get_position()
+    width, height = fig.get_size_inches()
+    return pos.width * width * 72, pos.height * height * 72
+
+
+_TEXT_PATHS = {}
+
+
+def _text_path(text, fontsize, fontweight):
+    """居中到原点的文字路径 (单位为磅)，相同文字只排版一次"""
+    key = (text, fontsize, fontweight)
+    path = _TEXT_PATHS.get(key)
+    if path is None:
+        from matplotlib.font_manager import FontProperties
+        from matplotlib.path import Path
+        from matplotlib.textpath import TextPath
+        raw = TextPath((0, 0), text, size=fontsize, prop=FontProperties(weight=fontweight))
+        # 按顶点 (含贝塞尔控制点) 的范围居中：Path.get_extents 逐段求曲线极值，
+        # 中文字形的曲线段很多，逐段计算比排版本身还慢
+        points = raw.vertices[raw.codes != Path.CLOSEPOLY] if raw.codes is not None else raw.vertices
+        center = (points.min(axis=0) + points.max(axis=0)) / 2 if len(points) else np.zeros(2)
+        path = _TEXT_PATHS[key] = Path(raw.vertices - center, raw.codes)
+    return path
+
+
+def draw_value_labels(ax, xs, ys, texts, colors, fontsize=10, fontweight='normal'):
+    """
+    把所有数值标签合并为一个 PathCollection：位置用数据坐标，字形大小固定为磅，
+    绘制时只产生一次集合绘制调用，而不是每个单元格一个Text artist
+    """
+    from matplotlib.collections import PathCollection
+    from matplotlib.transforms import Affine2D
+    fig = ax.figure
+    paths = [_text_path(text, fontsize, fontweight) for text in texts]
+    labels = PathCollection(
+        paths, offsets=np.column_stack([xs, ys]), offset_transform=ax.transData,
+        # 路径单位为磅，经 dpi_scale_trans 换算为像素，savefig 改变dpi时字号不变
+        transform=Affine2D().scale(1 / 72) + fig.dpi_scale_trans,
+        facecolors=colors, edgecolors='none', linewidths=0, zorder=3,
+    )
+    ax.add_collection(labels, autolim=False)
+    return labels
+
+
+def draw_heatmap(ax, data, row_labels, col_labels, cmap='YlOrRd', value_format='{}',
+                 text_color='white', dark_threshold=None, fontsize=10, fontweight='normal',
+                 tick_fontsize=None, order=None, max_rows=None, show_values='auto'):
+    """
+    绘制热力图
+
+    Args:
+        data: (行, 列) 数值矩阵，可含NaN
+        row_labels, col_labels: 行/列标签
+        value_format: 数值标签格式，如 '${}K'
+        text_color: 标签颜色；指定 dark_threshold 时，大于阈值的单元格用 text_color，其余用黑色
+        fontsize, fontweight: 数值标签字号与字重；tick_fontsize 为行列标签字号，默认沿用样式设置
+        order: 行顺序，None 保持原顺序，'value' 按均值排序，'cluster' 按相似度聚类
+        max_rows: 最多显示的行数，默认按坐标轴高度 / MIN_ROW_POINTS 计算
+        show_values: True 始终标注，False 不标注，'auto' 单元格放得下时标注
+
+    Returns:
+        HeatmapResult
+    """
+    data = np.asarray(data, dtype=np.float64)
+    order_idx = row_order(data, order)
+    width_pt, height_pt = _axes_points(ax)
+    if max_rows is None:
+        max_rows = max(1, int(height_pt / MIN_ROW_POINTS))
+    shown, groups = aggregate_rows(data[order_idx], max_rows)
+    groups = [order_idx[group].tolist() for group in groups]
+    labels = [row_labels[g[0]] if len(g) == 1 else f'{row_labels[g[0]]} (+{len(g) - 1})' for g in groups]
+
+    image = ax.imshow(shown, cmap=cmap, aspect='auto', interpolation='nearest')
+    n_rows, n_cols = shown.shape
+
+    # 列标签全部显示；行标签按可容纳的数量等间隔抽取
+    ax.set_xticks(np.arange(n_cols))
+    ax.set_xticklabels(col_labels, fontsize=tick_fontsize)
+    step = max(1, int(np.ceil(n_rows * (tick_fontsize or fontsize) * 1.2 / height_pt)))
+    ticks = np.arange(0, n_rows, step)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels([labels[i] for i in ticks], fontsize=tick_fontsize)
+
+    cell_w, cell_h = width_pt / n_cols, height_pt / n_rows
+    texts = [[value_format.format(_display(v)) for v in row] for row in shown]
+    longest = max((len(t) for row in texts for t in row), default=0)
+    fits = cell_h >= fontsize * LABEL_HEIGHT_RATIO and cell_w >= longest * fontsize * CHAR_WIDTH_RATIO
+    collection = None
+    if show_values is True or (show_values == 'auto' and fits):
+        rows, cols = np.nonzero(~np.isnan(shown))
+        if dark_threshold is None:
+            colors = [text_color] * len(rows)
+        else:
+            colors = [text_color if shown[i, j] > dark_threshold else 'black' for i, j in zip(rows, cols)]
+        collection = draw_value_labels(ax, cols, rows, [texts[i][j] for i, j in zip(rows, cols)],
+                                       colors, fontsize, fontweight)
+    return HeatmapResult(image, groups, labels, collection)
+
+
+def _display(value):
+    """整数值去掉小数点，合并行的均值保留整数"""
+    if np.isnan(value):
+        return ''
+    return int(round(value)) if abs(value - round(value)) < 1e-9 or abs(value) >= 10 else round(value, 1)
+
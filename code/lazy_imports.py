@@ -0,0 +1,136 @@
+"""
+延迟导入工具 - 重量级绘图依赖在首次使用时才加载
+并提供导入耗时报告，用于控制短生命周期工作进程的启动开销
+
+用法:
+    python lazy_imports.py progress_visualization aics_mle_analysis --budget-ms 150
+"""
+
+import os
+import re
+import sys
+import types
+import argparse
+import importlib
+import subprocess
+
+
+class LazyModule(types.ModuleType):
+    """模块代理：首次访问属性时才真正导入目标模块"""
+
+    def __init__(self, name, on_load=None):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_on_load'] = on_load
+
+    def __getattr__(self, attr):
+        return getattr(ensure_loaded(self), attr)
+
+    def __repr__(self):
+        state = 'loaded' if is_loaded(self) else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name, on_load=None):
+    """
+    返回模块 name 的延迟代理
+
+    Args:
+        name: 完整模块名，如 'matplotlib.pyplot'
+        on_load: 可选回调，模块首次导入后以真实模块为参数调用一次
+    """
+    return LazyModule(name, on_load)
+
+
+def is_loaded(module):
+    """判断延迟代理是否已完成导入 (普通模块始终视为已导入)"""
+    if not isinstance(module, LazyModule):
+        return True
+    return module.__dict__['_lazy_module'] is not None
+
+
+def ensure_loaded(module):
+    """强制导入延迟代理对应的模块并返回真实模块"""
+    if not isinstance(module, LazyModule):
+        return module
+    real = module.__dict__['_lazy_module']
+    if real is None:
+        real = importlib.import_module(module.__name__)
+        # 先记录真实模块再执行回调，回调中访问代理属性不会重复导入
+        module.__dict__['_lazy_module'] = real
+        on_load = module.__dict__['_lazy_on_load']
+        if on_load is not None:
+            on_load(real)
+    return real
+
+
+# ========== 导入耗时报告 ==========
+
+_IMPORTTIME_LINE = re.compile(r'import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)')
+
+
+def measure_import_time(module_name, cwd=None):
+    """
+    在全新的解释器中导入模块，解析 -X importtime 输出
+
+    Returns:
+        (总耗时毫秒, [(模块名, 累计耗时毫秒), ...] 按耗时降序的直接依赖)
+    """
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                          cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入 {module_name} 失败:\n{proc.stderr}")
+
+    total_us = 0
+    children = []
+    pending = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        # importtime 按导入完成顺序输出，子模块的缩进比父模块深两个空格
+        if name == module_name and depth <= 1:
+            total_us = cumulative
+            children = [(child, us) for child, us, child_depth in pending if child_depth == depth + 2]
+            break
+        if depth <= 1:
+            # 另一个顶层导入 (解释器启动阶段的 encodings、site 等) 已结束，之前的行不属于目标模块
+            pending = []
+        else:
+            pending.append((name, cumulative, depth))
+    children.sort(key=lambda item: item[1], reverse=True)
+    return total_us / 1000, [(name, us / 1000) for name, us in children]
+
+
+def print_import_report(module_names, budget_ms=None, top=5):
+    """打印各模块的导入耗时报告，返回超出预算的模块数量"""
+    over_budget = 0
+    for name in module_names:
+        total_ms, children = measure_import_time(name)
+        status = ''
+        if budget_ms is not None:
+            if total_ms > budget_ms:
+                over_budget += 1
+                status = f'  ❌ 超出预算 {budget_ms:.0f}ms'
+            else:
+                status = f'  ✅ 预算 {budget_ms:.0f}ms 内'
+        print(f"📦 {name}: {total_ms:.1f}ms{status}")
+        for child, ms in children[:top]:
+            print(f"     {child:<32} {ms:8.1f}ms")
+    return over_budget
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='报告模块导入耗时并检查启动预算')
+    parser.add_argument('modules', nargs='+', help='要测量的模块名')
+    parser.add_argument('--budget-ms', type=float, default=None, help='单个模块导入耗时预算 (毫秒)')
+    parser.add_argument('--top', type=int, default=5, help='每个模块显示的最慢依赖数量')
+    args = parser.parse_args(argv)
+    over_budget = print_import_report(args.modules, args.budget_ms, args.top)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+学习资源批量推荐 - 离线为全部用户预计算前k个学习资源
+资源目录来自 extract/ai_learning_resources.json，每条学习路径是一个可推荐条目；
+条目与用户都嵌入为同一组定长向量:
+
+    主题    关键词命中的技术主题 (条目) / 置信度加权的技能差距 (用户)，各自L2归一化
+    难度    入门 / 进阶 / 高级 (条目单热) / 按当前水平所在档位的亲和度 (用户)
+    形式    理论 / 实战 / 图解 / 互动 (条目) / learning_preferences 中的内容偏好 (用户)
+
+打分 = 用户矩阵 × 条目矩阵转置，按用户分块计算，每块用 argpartition 取前k个再只对这k个排序；
+结果写成 recommendations 表的行 (CSV/JSONL)，可直接导入
+
+用法 (建议每晚定时运行):
+    python learning_recommender.py --skills skill_assessments.csv --profiles user_profiles.csv \\
+        -k 5 -o recommendations.jsonl
+    python learning_recommender.py --bench 1000000      # 合成用户向量测量打分与写出耗时
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from extract_snapshot import EXTRACT_DIR, read_document
+from skill_gap import load_skill_gaps
+from table_loader import detect_format, iter_rows
+
+RESOURCES_FILE = 'ai_learning_resources.json'
+RECOMMENDATION_TYPE = 'learning_resource'
+# 与 personalized-recommendations 函数写入的推荐保持相同有效期
+EXPIRES_DAYS = 30
+BLOCK_USERS = 8192
+
+# 主题关键词 (小写匹配)；技能名称与学习路径描述共用同一张表
+TOPIC_KEYWORDS = {
+    '编程': ('编程', 'python', '代码', '爬虫', '自动化办公', 'programming'),
+    '数学': ('数学', '线性代数', '概率', '统计'),
+    '机器学习': ('机器学习', '监督学习', '强化学习', '推荐系统', '超参数', 'machine learning'),
+    '深度学习': ('深度学习', '神经网络', 'cnn', 'rnn', 'gan', 'pytorch', 'tensorflow', '反向传播', 'deep learning'),
+    '自然语言处理': ('自然语言', 'nlp', '文本', '机器翻译', '词嵌入', 'transformer', 'cs224n'),
+    '计算机视觉': ('计算机视觉', '图像', '目标检测', '人脸识别', 'opencv', 'yolo', '视频生成', 'sora'),
+    '数据科学': ('数据科学', '数据分析', '数据预处理', '数据集', '可视化', 'pandas', 'numpy'),
+    '大模型': ('大模型', 'llm', 'prompt', '提示词', '智能体', 'rag', 'gpt', '生成式', '微调', '多模态'),
+    '工程部署': ('部署', '云计算', 'cloud', '工程化', '平台', 'mlops', '落地'),
+    'AI素养': ('素养', '百科', '基本概念', '概述', '导论', 'ai工具'),
+    '伦理': ('伦理', '社会影响', '负责任'),
+    '行业应用': ('行业', '产业', '医疗', '金融', '教育', '业务'),
+    '职业发展': ('认证', '证书', '创业', '职业'),
+}
+TOPICS = tuple(TOPIC_KEYWORDS)
+
+LEVELS = ('入门', '进阶', '高级')
+# 分类名称优先于内容描述判断难度，都不命中视为进阶
+LEVEL_KEYWORDS = (
+    (2, ('高级', '前沿', '学术', '大厂', '竞赛')),
+    (0, ('基础', '入门', '零基础', '初学', '素养', '百科', '资讯')),
+)
+# 当前水平 (0-10) 的档位边界，以及各档位对三种难度的亲和度
+LEVEL_BOUNDS = (4, 7)
+LEVEL_AFFINITY = np.array([[1.0, 0.4, 0.0],
+                           [0.3, 1.0, 0.4],
+                           [0.0, 0.5, 1.0]], dtype=np.float32)
+
+# 与 user-profile-analysis 写入的 contentPreferences 同名 (0-10，缺失为5)
+STYLES = ('theoretical', 'practical', 'visual', 'interactive')
+STYLE_KEYWORDS = {
+    'theoretical': ('基础', '数学', '导论', '概念', '原理', '教材', '解读', '百科'),
+    'practical': ('实战', '项目', '案例', '实践', '落地', '动手'),
+    'visual': ('图解', '视频', '图像', '可视化'),
+    'interactive': ('社区', '竞赛', '训练营', '实验', '练习', '挑战赛'),
+}
+DEFAULT_STYLE_SCORE = 5
+# learningStyle 为主导感官时对内容偏好的加成
+LEARNING_STYLE_BOOST = {
+    'visual': {'visual': 3},
+    'kinesthetic': {'practical': 2, 'interactive': 2},
+    'reading': {'theoretical': 3},
+}
+
+WEIGHTS = {'topic': 0.6, 'level': 0.25, 'style': 0.15}
+
+
+@dataclass
+class LearningResource:
+    """一条可推荐的学习路径"""
+    resource: str
+    url: str
+    category: str
+    content: str
+    description: str
+    audience: list
+    topics: list
+    level: str
+
+
+@dataclass
+class ResourceCatalog:
+    """资源目录及其定长向量 (条目 × 维度)"""
+    items: list
+    topics: np.ndarray
+    levels: np.ndarray
+    styles: np.ndarray
+    _payloads: list = field(default=None, repr=False)
+
+    def __len__(self):
+        return len(self.items)
+
+    def matrix(self, weights=WEIGHTS):
+        return np.hstack([self.topics * weights['topic'], self.levels * weights['level'],
+                          self.styles * weights['style']]).astype(np.float32)
+
+    def payloads(self):
+        """各条目 content 字段的JSON (预先序列化，写出时只拼接)"""
+        if self._payloads is None:
+            self._payloads = [json.dumps({
+                'type': RECOMMENDATION_TYPE,
+                'title': f"{item.resource}：{item.category}",
+                'description': item.description,
+                'resource': item.resource,
+                'url': item.url,
+                'category': item.category,
+                'learning_content': item.content,
+                'topics': item.topics,
+                'level': item.level,
+                'target_audience': item.audience,
+            }, ensure_ascii=False) for item in self.items]
+        return self._payloads
+
+
+@dataclass
+class UserVectors:
+    """用户定长向量，行顺序与 user_ids 一致"""
+    user_ids: list
+    need: np.ndarray
+    levels: np.ndarray
+    styles: np.ndarray
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def matrix(self, weights=WEIGHTS):
+        return np.hstack([self.need * weights['topic'], self.levels * weights['level'],
+                          self.styles * weights['style']]).astype(np.float32)
+
+
+def _contains(text, keywords):
+    return any(k in text for k in keywords)
+
+
+def topic_vector(text):
+    """文本命中的主题 (0/1向量)"""
+    text = str(text).lower()
+    return np.array([_contains(text, TOPIC_KEYWORDS[t]) for t in TOPICS], dtype=np.float32)
+
+
+def resource_level(category, content):
+    for text in (category, content):
+        for level, keywords in LEVEL_KEYWORDS:
+            if _contains(text, keywords):
+                return level
+    return 1
+
+
+def _normalize_rows(matrix, norm='l2'):
+    scale = np.linalg.norm(matrix, axis=1) if norm == 'l2' else matrix.sum(axis=1)
+    return np.divide(matrix, scale[:, None], out=np.zeros_like(matrix), where=scale[:, None] > 0)
+
+
+def _salvage_features(raw):
+    """
+    抽取结果的 raw_content 在 features 数组中途被截断，整体无法解析；
+    逐个解码数组元素，保留截断位置之前的完整资源
+    """
+    start = raw.find('"features"')
+    if start < 0:
+        return []
+    i = raw.find('[', start) + 1
+    decoder = json.JSONDecoder()
+    features = []
+    while 0 < i < len(raw):
+        while i < len(raw) and raw[i] in ' \t\r\n,':
+            i += 1
+        try:
+            item, i = decoder.raw_decode(raw, i)
+        except ValueError:
+            break
+        if isinstance(item, dict):
+            features.append(item)
+    return features
+
+
+def load_catalog(extract_dir=EXTRACT_DIR):
+    """读取学习资源抽取结果，每条学习路径展开为一个条目"""
+    data = read_document(RESOURCES_FILE, extract_dir)
+    if data is None:
+        raise ValueError(f"{RESOURCES_FILE} 不存在或抓取失败")
+    raw = data.get('raw_content')
+    if isinstance(raw, str):
+        try:
+            features = json.loads(raw)['data']['features']
+        except (ValueError, KeyError, TypeError):
+            features = _salvage_features(raw)
+    else:
+        features = data.get('data', data).get('features', [])
+
+    items, vectors = [], []
+    for feature in features:
+        for path in feature.get('learning_paths') or []:
+            category, content = path.get('category', ''), path.get('content', '')
+            text = f"{category} {content}"
+            topics = topic_vector(text)
+            vectors.append(topics)
+            items.append(LearningResource(
+                feature.get('name', ''), feature.get('url', ''), category, content,
+                feature.get('brief_description', ''), list(feature.get('target_audience') or []),
+                [t for t, hit in zip(TOPICS, topics) if hit], LEVELS[resource_level(category, content)]))
+    if not items:
+        raise ValueError(f"{RESOURCES_FILE} 中没有可用的学习路径")
+
+    topics = _normalize_rows(np.array(vectors))
+    levels = np.eye(len(LEVELS), dtype=np.float32)[[LEVELS.index(i.level) for i in items]]
+    styles = np.array([[_contains(f"{i.category} {i.content}", STYLE_KEYWORDS[s]) for s in STYLES]
+                       for i in items], dtype=np.float32)
+    return ResourceCatalog(items, topics, levels, _normalize_rows(styles, norm='sum'))
+
+
+def load_preferences(path):
+    """读取 user_profiles 导出中的 learning_preferences (CSV中为JSON字符串)"""
+    preferences = {}
+    for row in iter_rows(path, 'user_profiles', columns=['user_id', 'learning_preferences']):
+        value = row['learning_preferences']
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                value = None
+        if row['user_id'] and isinstance(value, dict):
+            preferences[row['user_id']] = value
+    return preferences
+
+
+def style_scores(preferences):
+    """learning_preferences -> 四种内容形式的偏好 (0-1)"""
+    content = preferences.get('contentPreferences') or {}
+    scores = {}
+    for style in STYLES:
+        try:
+            scores[style] = float(content.get(style, DEFAULT_STYLE_SCORE))
+        except (TypeError, ValueError):
+            scores[style] = DEFAULT_STYLE_SCORE
+    for style, boost in LEARNING_STYLE_BOOST.get(preferences.get('learningStyle'), {}).items():
+        scores[style] += boost
+    return [min(max(scores[s], 0), 10) / 10 for s in STYLES]
+
+
+def user_vectors(index, preferences=None):
+    """
+    由技能差距索引和学习偏好构造用户向量
+
+    主题需求 = 各技能置信度加权差距按主题求和；难度档位取命中主题的技能的置信度加权平均当前水平
+    (没有命中主题的技能时取全部技能)；只有画像没有评估的用户主题需求为0，仍按难度与形式推荐
+    """
+    preferences = preferences or {}
+    user_ids = index.users
+    known = set(user_ids)
+    user_ids += [u for u in preferences if u not in known]
+    n = len(user_ids)
+
+    users, skills, current, confidence, gaps = index.entries()
+    skill_topics = np.array([topic_vector(name) for name in index.skills], dtype=np.float32)
+    skill_topics = skill_topics.reshape(len(index.skills), len(TOPICS))
+    entry_topics = skill_topics[skills]
+    need = np.empty((n, len(TOPICS)), dtype=np.float32)
+    for t in range(len(TOPICS)):
+        need[:, t] = np.bincount(users, weights=gaps * entry_topics[:, t], minlength=n)
+
+    matched = entry_topics.any(axis=1)
+    levels = np.zeros(n)
+    for weights in (confidence, confidence * matched):
+        totals = np.bincount(users, weights=weights, minlength=n)
+        sums = np.bincount(users, weights=weights * current, minlength=n)
+        np.divide(sums, totals, out=levels, where=totals > 0)
+    bands = np.digitize(levels, LEVEL_BOUNDS)
+
+    styles = np.full((n, len(STYLES)), DEFAULT_STYLE_SCORE / 10, dtype=np.float32)
+    rows = {user: i for i, user in enumerate(user_ids)}
+    for user, prefs in preferences.items():
+        styles[rows[user]] = style_scores(prefs)
+    return UserVectors(user_ids, _normalize_rows(need), LEVEL_AFFINITY[bands], styles)
+
+
+def recommend(users, catalog, k=5, block=BLOCK_USERS, weights=WEIGHTS):
+    """
+    分块打分并选出每个用户的前k个条目
+
+    Yields:
+        (起始行, 条目下标 [块大小 × k], 得分 [块大小 × k])，每行按得分降序
+    """
+    items = catalog.matrix(weights).T
+    user_matrix = users.matrix(weights)
+    k = min(k, len(catalog))
+    for start in range(0, len(users), block):
+        scores = user_matrix[start:start + block] @ items
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        yield start, np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def priority_scores(scores):
+    """得分 (0-1) 换算为 recommendations.priority_score 的0-10分制"""
+    return np.clip(np.round(scores * 10, 2), 0, 9.99)
+
+
+def write_recommendations(path, users, catalog, k=5, block=BLOCK_USERS, now=None, fmt=None):
+    """
+    推荐结果写成 recommendations 表的行，逐块写出 (先写临时文件再替换)
+
+    Returns:
+        写出的行数
+    """
+    fmt = fmt or detect_format(path)
+    now = now or datetime.now(timezone.utc)
+    created_at = now.isoformat()
+    expires_at = (now + timedelta(days=EXPIRES_DAYS)).isoformat()
+    payloads = catalog.payloads()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    written = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            if fmt == 'csv':
+                writer = csv.writer(f)
+                writer.writerow(['user_id', 'recommendation_type', 'content', 'priority_score',
+                                 'status', 'expires_at', 'created_at'])
+            tail = json.dumps({'status': 'pending', 'expires_at': expires_at, 'created_at': created_at})[1:]
+            head = json.dumps({'recommendation_type': RECOMMENDATION_TYPE})[1:-1]
+            for start, top, scores in recommend(users, catalog, k, block):
+                priorities = priority_scores(scores).tolist()
+                for row, (items, values) in enumerate(zip(top.tolist(), priorities)):
+                    user = users.user_ids[start + row]
+                    if fmt == 'csv':
+                        writer.writerows([user, RECOMMENDATION_TYPE, payloads[item], f"{value:.2f}",
+                                          'pending', expires_at, created_at]
+                                         for item, value in zip(items, values))
+                    else:
+                        user = json.dumps(user, ensure_ascii=False)
+                        f.writelines(f'{{"user_id": {user}, {head}, "content": {payloads[item]}, '
+                                     f'"priority_score": {value:.2f}, {tail}\n'
+                                     for item, value in zip(items, values))
+                    written += len(items)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return written
+
+
+def synthetic_users(n_users, seed=0):
+    """合成用户向量 (基准测试用)：每人2-4个有差距的主题，随机档位与形式偏好"""
+    rng = np.random.default_rng(seed)
+    need = rng.random((n_users, len(TOPICS)), dtype=np.float32)
+    need *= need > 1 - rng.integers(2, 5, (n_users, 1)) / len(TOPICS)
+    bands = rng.integers(0, len(LEVELS), n_users)
+    styles = rng.integers(2, 11, (n_users, len(STYLES))).astype(np.float32) / 10
+    return UserVectors([f"u{i}" for i in range(n_users)], _normalize_rows(need), LEVEL_AFFINITY[bands], styles)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='学习资源批量推荐')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--skills', help='skill_assessments 导出 (CSV/JSONL)')
+    source.add_argument('--bench', type=int, metavar='N', help='用N个合成用户测量打分与写出耗时')
+    parser.add_argument('--profiles', help='user_profiles 导出，提供 learning_preferences')
+    parser.add_argument('--extract-dir', default=EXTRACT_DIR, help='学习资源抽取结果目录')
+    parser.add_argument('-k', type=int, default=5, help='每个用户推荐条数')
+    parser.add_argument('-o', '--output', help='输出文件 (.csv / .jsonl)')
+    parser.add_argument('--block', type=int, default=BLOCK_USERS, help='每块打分的用户数')
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.extract_dir)
+    print(f"📚 {len(catalog)} 条学习路径，来自 {len({i.resource for i in catalog.items})} 个资源")
+
+    started = time.perf_counter()
+    if args.bench:
+        users = synthetic_users(args.bench)
+    else:
+        preferences = load_preferences(args.profiles) if args.profiles else {}
+        users = user_vectors(load_skill_gaps(args.skills), preferences)
+    print(f"👥 {len(users):,} 个用户向量：{time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    for _ in recommend(users, catalog, args.k, args.block):
+        pass
+    print(f"⏱️ 打分与前{args.k}选择：{time.perf_counter() - started:.2f}s")
+
+    if args.output:
+        started = time.perf_counter()
+        written = write_recommendations(args.output, users, catalog, args.k, args.block)
+        print(f"✅ 写出 {written:,} 条推荐：{args.output} ({time.perf_counter() - started:.2f}s)")
+    elif not args.bench:
+        for start, top, scores in recommend(users, catalog, args.k, block=min(args.block, 5)):
+            for row, (items, values) in enumerate(zip(top, priority_scores(scores))):
+                print(f"\n🎯 {users.user_ids[start + row]}")
+                for item, value in zip(items, values):
+                    entry = catalog.items[item]
+                    print(f"   {value:5.2f}  {entry.resource}：{entry.category} ({entry.level}，{'/'.join(entry.topics)})")
+            break
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
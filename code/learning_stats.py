@@ -0,0 +1,444 @@
+"""
+学习活动流式汇总 - 一次扫描 learning_activities 得到学习成长图所需的全部统计
+按用户和群组 (cohort) 两级同时汇总，每组只保存固定几类累加格子，不保留原始记录:
+
+    活动类型 × 月份 学习时长        学习活动热力图
+    状态 计数 / 完成度之和          各状态数量与平均完成度
+    投资类型 投入成本 / 估算收益     学习投资回报柱状图
+
+表中没有费用字段，投入与收益按估算模型换算为金额：
+投入 = 各类活动的估算费用 (FEE_ESTIMATES) + 学习时长 × 时间价值 (HOURLY_VALUE，单列为"时间投入")；
+收益 = 投入 × 完成度 × 回报倍数 × 评分系数 (评分/3，未评分为1)，已取消的活动没有收益
+
+用法:
+    python learning_stats.py --activities learning_activities.csv --profiles user_profiles.csv \\
+        --cohort 2024-03 --chart /workspace/charts
+    python learning_stats.py --bench 2000000      # 合成活动测量汇总与查询耗时
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+import progress_visualization as pv
+from progress_data import LearningPanels
+from render_profiles import PROFILES, DEFAULT_PROFILE, get_profile
+from table_loader import iter_batches, iter_rows
+
+LEARNING_COLUMNS = ['user_id', 'activity_type', 'duration_hours', 'completion_percentage', 'status',
+                    'start_date', 'completion_date', 'rating']
+
+# 活动类型代码与热力图行标签；中文标签也可作为 activity_type 写入
+ACTIVITY_LABELS = {
+    'course': '在线课程',
+    'certification': '技术认证',
+    'book': '技术书籍',
+    'project': '项目实践',
+    'sharing': '技术分享',
+    'conference': '技术会议',
+    'tool': '工具使用',
+}
+_ACTIVITY_ALIASES = {label: code for code, label in ACTIVITY_LABELS.items()}
+
+# 与 learning_activities.status 的取值约束一致，缺失按默认值 not_started
+STATUSES = ('not_started', 'in_progress', 'completed', 'cancelled')
+STATUS_LABELS = {'not_started': '未开始', 'in_progress': '进行中', 'completed': '已完成', 'cancelled': '已取消'}
+
+# 活动类型对应的投资类型 (未列出的类型只计时间投入)
+INVESTMENT_TYPES = {
+    'course': '课程费用',
+    'certification': '课程费用',
+    'book': '书籍购买',
+    'conference': '会议参加',
+    'tool': '工具订阅',
+}
+TIME_INVESTMENT = '时间投入'
+INVESTMENTS = ('课程费用', '书籍购买', '会议参加', '工具订阅', TIME_INVESTMENT)
+# 估算模型参数 (元)
+FEE_ESTIMATES = {'course': 800, 'certification': 1500, 'book': 100, 'conference': 2000, 'tool': 300}
+HOURLY_VALUE = 100
+RETURN_MULTIPLIER = 2.5
+
+DEFAULT_COHORT = '全部'
+
+# 格子键 = 组编码 << 32 | 统计类别 << 28 | 类别内编码 << 16 | 月份 (自1900年1月起的月数)
+_HOURS, _STATUS, _ROI = 0, 1, 2
+_GROUP_SHIFT = 32
+_KIND_SHIFT = 28
+_CODE_SHIFT = 16
+_CODE_MASK = (1 << (_KIND_SHIFT - _CODE_SHIFT)) - 1
+_MONTH_MASK = (1 << _CODE_SHIFT) - 1
+_MONTH_BASE = np.datetime64('1900-01', 'M')
+
+
+def normalize_activity(value):
+    value = str(value).strip()
+    return _ACTIVITY_ALIASES.get(value, value.lower())
+
+
+class _SparseSums:
+    """有序 int64 键 -> 两列累加值；批内先按键聚合，再与已有格子合并"""
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, 2), dtype=np.float64)
+
+    def add(self, keys, values):
+        if not len(keys):
+            return
+        cells, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        sums = np.column_stack([np.bincount(inverse, weights=values[:, j], minlength=len(cells))
+                                for j in range(values.shape[1])])
+        pos = np.searchsorted(self.keys, cells)
+        found = pos < len(self.keys)
+        found[found] = self.keys[pos[found]] == cells[found]
+        self.values[pos[found]] += sums[found]
+        new = ~found
+        self.keys = np.insert(self.keys, pos[new], cells[new])
+        self.values = np.insert(self.values, pos[new], sums[new], axis=0)
+
+    def select(self, kind, groups=None):
+        """某类统计的格子 (groups 为 None 时取全部组)：(类别内编码, 月份, 两列值)"""
+        if groups is None:
+            mask = ((self.keys >> _KIND_SHIFT) & 0xF) == kind
+            keys, values = self.keys[mask], self.values[mask]
+        else:
+            parts = []
+            for group in groups:
+                base = group << _GROUP_SHIFT
+                lo, hi = np.searchsorted(self.keys, [base | kind << _KIND_SHIFT, base | (kind + 1) << _KIND_SHIFT])
+                parts.append(np.arange(lo, hi))
+            rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+            keys, values = self.keys[rows], self.values[rows]
+        return (keys >> _CODE_SHIFT) & _CODE_MASK, keys & _MONTH_MASK, values
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class LearningAggregator:
+    """
+    learning_activities 流式分组汇总
+
+    每批记录换算为 (类别, 编码, 月份) 格子后，分别以用户和群组为组键累加到两张稀疏表；
+    内存只与 组数 × 有活动的 (类型, 月份) 数 成正比，与记录数无关
+
+    Args:
+        cohorts: {user_id: 群组}，如 load_cohorts() 按注册月份划分；未列出的用户归入 DEFAULT_COHORT
+    """
+
+    def __init__(self, cohorts=None):
+        self.cohorts = dict(cohorts or {})
+        self.records = 0
+        self._users, self._user_codes = [], {}
+        self._cohorts, self._cohort_codes = [], {}
+        self._user_cohort = []
+        self._types, self._type_codes = [], {}
+        self._by_user = _SparseSums()
+        self._by_cohort = _SparseSums()
+
+    @staticmethod
+    def _code(value, table, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def _encode(self, values, table, codes, normalize=str):
+        uniques, inverse = np.unique(values, return_inverse=True)
+        mapped = np.array([self._code(normalize(v), table, codes) for v in uniques.tolist()], dtype=np.int64)
+        return mapped[inverse.reshape(-1)]
+
+    def add_columns(self, user_id, activity_type, duration_hours, completion_percentage=np.nan, status='',
+                    start_date=None, completion_date=None, rating=np.nan):
+        """
+        按列批量写入活动，各参数可为标量或等长数组
+
+        Returns:
+            写入的记录数
+        """
+        hours = np.atleast_1d(np.asarray(duration_hours, dtype=np.float64))
+        n = len(hours)
+        users = np.broadcast_to(np.asarray(user_id, dtype=str), n)
+        keep = users != ''
+        if not keep.any():
+            return 0
+        column = lambda values, dtype: np.broadcast_to(np.asarray(values, dtype=dtype), n)[keep]
+        users = users[keep]
+        hours = np.nan_to_num(hours[keep])
+        types = self._encode(column(activity_type, str), self._types, self._type_codes, normalize_activity)
+        if len(self._types) > _CODE_MASK + 1:
+            raise ValueError(f"活动类型超过 {_CODE_MASK + 1} 种")
+        statuses = column(status, str)
+        status_codes = np.zeros(len(users), dtype=np.int64)
+        for i, name in enumerate(STATUSES):
+            status_codes[statuses == name] = i
+        completed = status_codes == STATUSES.index('completed')
+        completion = column(completion_percentage, np.float64) / 100
+        completion = np.where(completed, 1.0, np.clip(np.nan_to_num(completion), 0, 1))
+        rating = column(rating, np.float64)
+        rating_factor = np.where(np.isnan(rating), 1.0, rating / 3)
+
+        # 月份取开始日期，缺失时取完成日期；两者都缺失的活动不进入热力图
+        dates = np.full(len(users), np.datetime64('NaT'), dtype='datetime64[D]')
+        for values in (completion_date, start_date):
+            if values is not None:
+                values = column(values, 'datetime64[D]')
+                dates = np.where(np.isnat(values), dates, values)
+        dated = ~np.isnat(dates)
+        months = np.zeros(len(users), dtype=np.int64)
+        months[dated] = (dates[dated].astype('datetime64[M]') - _MONTH_BASE).astype(np.int64)
+        if dated.any() and (months[dated].min() < 0 or months[dated].max() > _MONTH_MASK):
+            raise ValueError("活动日期超出可表示范围 (1900-01 起约5400年)")
+
+        # 投资回报：有估算费用的类型计入对应投资类型，学习时长另计时间投入
+        type_codes = [normalize_activity(t) for t in self._types]
+        fees = np.array([FEE_ESTIMATES.get(t, 0) for t in type_codes], dtype=np.float64)[types]
+        investment_of = np.array([INVESTMENTS.index(INVESTMENT_TYPES[t]) if t in INVESTMENT_TYPES else -1
+                                  for t in type_codes], dtype=np.int64)[types]
+        returns = np.where(status_codes == STATUSES.index('cancelled'), 0.0,
+                           completion * RETURN_MULTIPLIER * rating_factor)
+        has_fee = (investment_of >= 0) & (fees > 0)
+        time_cost = hours * HOURLY_VALUE
+
+        cells = [
+            (_HOURS, types[dated], months[dated], np.column_stack([hours[dated], np.ones(dated.sum())]), dated),
+            (_STATUS, status_codes, 0, np.column_stack([np.ones(len(users)), completion]), slice(None)),
+            (_ROI, investment_of[has_fee], 0, np.column_stack([fees[has_fee], fees[has_fee] * returns[has_fee]]),
+             has_fee),
+            (_ROI, INVESTMENTS.index(TIME_INVESTMENT), 0,
+             np.column_stack([time_cost[hours > 0], (time_cost * returns)[hours > 0]]), hours > 0),
+        ]
+        user_codes = self._encode(users, self._users, self._user_codes)
+        # 新用户首次出现时确定所属群组，之后按用户编码直接查表
+        for user in self._users[len(self._user_cohort):]:
+            self._user_cohort.append(self._code(self.cohorts.get(user, DEFAULT_COHORT), self._cohorts, self._cohort_codes))
+        cohort_codes = np.array(self._user_cohort, dtype=np.int64)[user_codes]
+        for table, groups in ((self._by_user, user_codes), (self._by_cohort, cohort_codes)):
+            keys, values = [], []
+            for kind, codes, month, cell_values, rows in cells:
+                group = groups[rows]
+                keys.append((group << _GROUP_SHIFT) | (kind << _KIND_SHIFT) | (np.asarray(codes) << _CODE_SHIFT)
+                            | np.asarray(month))
+                values.append(cell_values)
+            table.add(np.concatenate([np.broadcast_to(k, len(v)) for k, v in zip(keys, values)]),
+                      np.concatenate(values))
+        self.records += len(users)
+        return len(users)
+
+    def add_batch(self, batch):
+        """写入 table_loader.iter_batches 产出的列字典"""
+        n = len(batch['user_id'])
+        return self.add_columns(
+            batch['user_id'], batch['activity_type'], batch['duration_hours'],
+            batch.get('completion_percentage', np.full(n, np.nan)), batch.get('status', ''),
+            batch.get('start_date'), batch.get('completion_date'), batch.get('rating', np.full(n, np.nan)))
+
+    def merge(self, other):
+        """合并另一份汇总 (如按文件分片并行汇总后合并)，群组沿用各自汇总时的划分"""
+        types = np.array([self._code(t, self._types, self._type_codes) for t in other._types], dtype=np.int64)
+        users = np.array([self._code(u, self._users, self._user_codes) for u in other._users], dtype=np.int64)
+        cohorts = np.array([self._code(c, self._cohorts, self._cohort_codes) for c in other._cohorts], dtype=np.int64)
+        for user, cohort in zip(users.tolist(), other._user_cohort):
+            if user == len(self._user_cohort):
+                self._user_cohort.append(int(cohorts[cohort]))
+        for table, source, groups in ((self._by_user, other._by_user, users),
+                                      (self._by_cohort, other._by_cohort, cohorts)):
+            if not len(source):
+                continue
+            kind = (source.keys >> _KIND_SHIFT) & 0xF
+            code = (source.keys >> _CODE_SHIFT) & _CODE_MASK
+            code = np.where(kind == _HOURS, types[np.where(kind == _HOURS, code, 0)], code)
+            keys = ((groups[source.keys >> _GROUP_SHIFT] << _GROUP_SHIFT) | (kind << _KIND_SHIFT)
+                    | (code << _CODE_SHIFT) | (source.keys & _MONTH_MASK))
+            table.add(keys, source.values)
+        self.records += other.records
+        return self
+
+    # ---- 查询 ----
+
+    @property
+    def users(self):
+        return list(self._users)
+
+    @property
+    def cohort_names(self):
+        return list(self._cohorts)
+
+    def _select(self, kind, user_id=None, cohort=None):
+        if user_id is not None:
+            code = self._user_codes.get(str(user_id))
+            return self._by_user.select(kind, [] if code is None else [code])
+        if cohort is not None:
+            code = self._cohort_codes.get(str(cohort))
+            return self._by_cohort.select(kind, [] if code is None else [code])
+        return self._by_cohort.select(kind)
+
+    def heatmap(self, user_id=None, cohort=None, months=6):
+        """
+        活动类型 × 月份 学习时长 (截至最近有活动月份的连续 months 个月)
+
+        Returns:
+            (活动类型标签, 月份标签, 时长矩阵)；user_id / cohort 都为 None 时汇总全部用户
+        """
+        codes, month_index, values = self._select(_HOURS, user_id, cohort)
+        if not len(codes):
+            return [], [], np.zeros((0, 0))
+        end = int(month_index.max())
+        month_keys = np.arange(end - months + 1, end + 1) if months else np.arange(month_index.min(), end + 1)
+        in_range = month_index >= month_keys[0]
+        type_codes = np.unique(codes)
+        # 已知类型按 ACTIVITY_LABELS 顺序排在前面，其余按首次出现顺序
+        order = sorted(type_codes.tolist(), key=lambda c: (list(ACTIVITY_LABELS).index(self._types[c])
+                                                           if self._types[c] in ACTIVITY_LABELS else len(ACTIVITY_LABELS), c))
+        row_of = np.full(len(self._types), -1, dtype=np.int64)
+        row_of[order] = np.arange(len(order))
+        matrix = np.zeros((len(order), len(month_keys)))
+        np.add.at(matrix, (row_of[codes[in_range]], month_index[in_range] - month_keys[0]), values[in_range, 0])
+        labels = [ACTIVITY_LABELS.get(self._types[c], self._types[c]) for c in order]
+        month_labels = [f'{int(str(_MONTH_BASE + int(m))[5:7])}月' for m in month_keys]
+        return labels, month_labels, matrix
+
+    def status_summary(self, user_id=None, cohort=None):
+        """
+        各状态的活动数与平均完成度 (%)
+
+        Returns:
+            {状态: (活动数, 平均完成度)}，按 STATUSES 顺序
+        """
+        codes, _, values = self._select(_STATUS, user_id, cohort)
+        counts = np.bincount(codes, weights=values[:, 0], minlength=len(STATUSES))
+        completion = np.bincount(codes, weights=values[:, 1], minlength=len(STATUSES))
+        return {name: (int(counts[i]), float(completion[i] / counts[i] * 100) if counts[i] else 0.0)
+                for i, name in enumerate(STATUSES)}
+
+    def completion_rate(self, user_id=None, cohort=None):
+        """已完成活动占全部未取消活动的比例 (%)"""
+        summary = self.status_summary(user_id, cohort)
+        active = sum(count for name, (count, _) in summary.items() if name != 'cancelled')
+        return summary['completed'][0] / active * 100 if active else 0.0
+
+    def roi(self, user_id=None, cohort=None):
+        """
+        各投资类型的估算投入与收益
+
+        Returns:
+            (投资类型, 投入列表, 收益列表)，按 INVESTMENTS 顺序
+        """
+        codes, _, values = self._select(_ROI, user_id, cohort)
+        costs = np.bincount(codes, weights=values[:, 0], minlength=len(INVESTMENTS))
+        benefits = np.bincount(codes, weights=values[:, 1], minlength=len(INVESTMENTS))
+        return list(INVESTMENTS), costs.round().tolist(), benefits.round().tolist()
+
+    def panels(self, user_id=None, cohort=None, months=6):
+        """学习成长图的热力图与投资回报面板数据"""
+        learning_types, month_labels, matrix = self.heatmap(user_id, cohort, months)
+        investments, costs, benefits = self.roi(user_id, cohort)
+        return LearningPanels(month_labels, learning_types, matrix.round(1).tolist(), investments, costs, benefits)
+
+
+def load_cohorts(path):
+    """user_profiles 导出 -> {user_id: 注册月份 YYYY-MM}"""
+    cohorts = {}
+    for row in iter_rows(path, 'user_profiles', columns=['user_id', 'created_at']):
+        if row['user_id'] and row['created_at']:
+            cohorts[row['user_id']] = row['created_at'][:7]
+    return cohorts
+
+
+def aggregate_learning(path, cohorts=None, aggregator=None, **filters):
+    """流式读取 learning_activities 导出并汇总 (filters 传给 iter_batches，如 user_ids / date_range)"""
+    aggregator = LearningAggregator(cohorts) if aggregator is None else aggregator
+    for batch in iter_batches(path, 'learning_activities', columns=LEARNING_COLUMNS, **filters):
+        aggregator.add_batch(batch)
+    return aggregator
+
+
+def synthetic_activities(n_rows, n_users=None, seed=0):
+    """合成学习活动列 (基准测试用)"""
+    rng = np.random.default_rng(seed)
+    n_users = n_users or max(1, n_rows // 50)
+    types = np.array(list(ACTIVITY_LABELS) + ['conference', 'tool'])
+    statuses = np.array(STATUSES)
+    start = np.datetime64('2024-01-01') + rng.integers(0, 540, n_rows)
+    status = statuses[rng.choice(len(statuses), n_rows, p=[0.1, 0.3, 0.5, 0.1])]
+    return {
+        'user_id': np.char.add('u', rng.integers(0, n_users, n_rows).astype(str)),
+        'activity_type': types[rng.integers(0, len(types), n_rows)],
+        'duration_hours': rng.integers(1, 40, n_rows).astype(np.float64),
+        'completion_percentage': np.where(status == 'completed', 100, rng.integers(0, 100, n_rows)).astype(np.float64),
+        'status': status,
+        'start_date': start,
+        'completion_date': np.where(status == 'completed', start + rng.integers(7, 90, n_rows), np.datetime64('NaT')),
+        'rating': np.where(rng.random(n_rows) < 0.6, rng.integers(1, 6, n_rows), np.nan),
+    }
+
+
+def print_summary(title, aggregator, user_id=None, cohort=None, months=6):
+    labels, month_labels, matrix = aggregator.heatmap(user_id, cohort, months)
+    print(f"\n📚 {title}")
+    print(f"   {'':<10}" + ''.join(f'{m:>8}' for m in month_labels))
+    for label, row in zip(labels, matrix):
+        print(f"   {label:<10}" + ''.join(f'{v:8.1f}' for v in row))
+    summary = aggregator.status_summary(user_id, cohort)
+    print('   状态: ' + '，'.join(f"{STATUS_LABELS[s]} {count} 项 (平均完成 {comp:.0f}%)"
+                                for s, (count, comp) in summary.items()))
+    print(f"   完成率: {aggregator.completion_rate(user_id, cohort):.1f}%")
+    for name, cost, benefit in zip(*aggregator.roi(user_id, cohort)):
+        print(f"   {name:<8} 投入 {cost:>12,.0f} 元  估算收益 {benefit:>12,.0f} 元")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='学习活动流式汇总')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--activities', help='learning_activities 导出 (CSV/JSONL)')
+    source.add_argument('--bench', type=int, metavar='N', help='用N条合成活动测量汇总与查询耗时')
+    parser.add_argument('--profiles', help='user_profiles 导出，按注册月份划分群组')
+    parser.add_argument('--user', help='只看该用户')
+    parser.add_argument('--cohort', help='只看该群组 (如 2024-03)')
+    parser.add_argument('--months', type=int, default=6, help='热力图月份数')
+    parser.add_argument('--chart', metavar='DIR', help='用汇总结果渲染学习成长图到该目录')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE, help='渲染配置')
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        columns = synthetic_activities(args.bench)
+        cohorts = {u: f"2024-{int(u[1:]) % 12 + 1:02d}" for u in np.unique(columns['user_id']).tolist()}
+        aggregator = LearningAggregator(cohorts)
+        started = time.perf_counter()
+        for start in range(0, args.bench, 100_000):
+            aggregator.add_columns(**{name: v[start:start + 100_000] for name, v in columns.items()})
+        print(f"🧪 汇总 {args.bench:,} 条活动：{time.perf_counter() - started:.2f}s，"
+              f"{len(aggregator._by_user):,} + {len(aggregator._by_cohort):,} 个格子")
+        user, cohort = aggregator.users[0], aggregator.cohort_names[0]
+        for label, query in (('用户面板', lambda: aggregator.panels(user_id=user)),
+                             ('群组面板', lambda: aggregator.panels(cohort=cohort)),
+                             ('全体面板', lambda: aggregator.panels())):
+            started = time.perf_counter()
+            for _ in range(20):
+                query()
+            print(f"⏱️ {label:<10}{(time.perf_counter() - started) / 20 * 1000:8.2f}ms")
+        return 0
+
+    cohorts = load_cohorts(args.profiles) if args.profiles else None
+    started = time.perf_counter()
+    aggregator = aggregate_learning(args.activities, cohorts)
+    print(f"📊 {aggregator.records:,} 条活动，{len(aggregator.users):,} 个用户，"
+          f"{len(aggregator.cohort_names)} 个群组 ({time.perf_counter() - started:.2f}s)")
+    title = f"用户 {args.user}" if args.user else f"群组 {args.cohort}" if args.cohort else '全部用户'
+    print_summary(title, aggregator, args.user, args.cohort, args.months)
+    if args.chart:
+        os.makedirs(args.chart, exist_ok=True)
+        profile = get_profile(args.profile)
+        pv.create_learning_growth_chart(args.chart, profile, aggregator.panels(args.user, args.cohort, args.months))
+        print(f"\n✅ 学习成长图已保存到 {args.chart}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
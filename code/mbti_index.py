@@ -0,0 +1,355 @@
+"""
+MBTI职业索引 - 把 extract/ 中按性格类型列出的职业文本编译为倒排索引
+来源：
+
+    mbti_careers_match.json       16种类型各自的职业匹配列表
+    mbti_career_development.json  各类型适合的职能方向 (如 "战略规划、系统设计")
+    mbti_16personalities.json     类型所属的四大角色 (分析家/外交家/守护者/探险家)
+
+职业名称统一规范化 (全角转半角、去括号注释、"A/B" 拆为别名、同义词归并)，编译后包含：
+
+    职业 -> 类型     career_types[职业]，按匹配得分降序
+    类型 -> 职业     type_careers[类型]，按得分降序 (只出现在少数类型中的职业得分更高)
+    类型相似度       16×16 矩阵：四个维度字母的一致程度与职业分布的余弦相似度各占一半
+
+所有查询都是字典 / 数组下标访问；编译结果缓存在进程内 (default_index)，也可导出为JSON
+
+用法:
+    python mbti_index.py --type INTJ -k 10
+    python mbti_index.py --career 程序员
+    python mbti_index.py --output mbti_index.json
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+
+from extract_snapshot import EXTRACT_DIR, read_document
+
+# 16种类型，顺序与 16personalities 的四大角色一致
+MBTI_TYPES = (
+    'INTJ', 'INTP', 'ENTJ', 'ENTP',
+    'INFJ', 'INFP', 'ENFJ', 'ENFP',
+    'ISTJ', 'ISFJ', 'ESTJ', 'ESFJ',
+    'ISTP', 'ISFP', 'ESTP', 'ESFP',
+)
+TYPE_INDEX = {t: i for i, t in enumerate(MBTI_TYPES)}
+
+MBTI_FILES = ('mbti_careers_match.json', 'mbti_career_development.json', 'mbti_16personalities.json')
+
+# 职业匹配列表按列出顺序轻微衰减 (列表靠前的职业更典型)，职能方向为人工整理的结论，权重更高
+RANK_DECAY = 0.02
+MATCH_WEIGHT = 1.0
+ROLE_AREA_WEIGHT = 1.5
+# 相似度中字母一致程度所占的比例
+LETTER_SIMILARITY_WEIGHT = 0.5
+
+# 同义职业名称归并到规范名称
+CAREER_SYNONYMS = {
+    '育儿工作者': '儿童保育',
+    '幼儿发展': '儿童发展',
+    '计算机程序员': '程序员',
+    '军事官员': '军官',
+    '军人': '军事人员',
+    '人力资源专家': '人力资源',
+    '企业管理人员': '企业管理者',
+    '高管': '企业高管',
+    '急救护理人员': '急救人员',
+    'emt': '急救人员',
+    '新闻播音员': '播音员',
+    '口译员': '翻译',
+}
+
+_PAREN_RE = re.compile(r'[（(][^）)]*[）)]')
+_TYPE_RE = re.compile(r'\b([EI][NS][TF][JP])\b')
+
+
+def _clean(name):
+    """全角转半角、小写、去括号注释与空白"""
+    text = unicodedata.normalize('NFKC', str(name)).lower()
+    return re.sub(r'\s+', '', _PAREN_RE.sub('', text))
+
+
+def normalize_career(name):
+    """职业名称规范化：清理写法后按同义词表归并"""
+    text = _clean(name)
+    return CAREER_SYNONYMS.get(text, text)
+
+
+def career_aliases(name):
+    """
+    一个职业文本的各种写法：'A/B' 形式拆成两个名称
+
+    Returns:
+        [(清理后的写法, 规范名称), ...]，第一个为主名称
+    """
+    seen, out = set(), []
+    for part in re.split(r'[/／]', str(name)):
+        text = _clean(part)
+        if text and text not in seen:
+            seen.add(text)
+            out.append((text, CAREER_SYNONYMS.get(text, text)))
+    return out
+
+
+@dataclass
+class MbtiIndex:
+    """
+    编译后的MBTI职业索引
+
+    careers: 规范职业名称列表；matrix[i, j] 为类型i与职业j的匹配得分
+    type_careers / career_types: 按得分降序的 ((名称, 得分), ...)
+    aliases: 各种写法 -> 规范职业名称
+    similarity: 16×16 类型相似度
+    """
+    careers: list
+    matrix: np.ndarray
+    labels: dict
+    groups: dict
+    type_careers: dict
+    career_types: dict
+    aliases: dict
+    similarity: np.ndarray
+
+    def resolve(self, career):
+        """任意写法的职业名称 -> 规范名称，未收录时返回 None"""
+        name = self.aliases.get(career)
+        if name is not None:
+            return name
+        for text, canonical in career_aliases(career):
+            name = self.aliases.get(text) or self.aliases.get(canonical)
+            if name is not None:
+                return name
+        return None
+
+    def careers_for(self, mbti_type, k=None):
+        """类型最匹配的职业"""
+        ranked = self.type_careers.get(str(mbti_type).upper()[:4], ())
+        return ranked if k is None else ranked[:k]
+
+    def types_for(self, career):
+        """适合某职业的类型"""
+        name = self.resolve(career)
+        return self.career_types.get(name, ()) if name else ()
+
+    def score(self, mbti_type, career):
+        """类型与职业的匹配得分 (未匹配为0)"""
+        name = self.resolve(career)
+        row = TYPE_INDEX.get(str(mbti_type).upper()[:4])
+        if name is None or row is None:
+            return 0.0
+        return float(self.matrix[row, self._career_index[name]])
+
+    def similar_types(self, mbti_type, k=3):
+        """最相似的k个其他类型"""
+        row = TYPE_INDEX.get(str(mbti_type).upper()[:4])
+        if row is None:
+            return ()
+        return self._similar[row][:k]
+
+    def __post_init__(self):
+        self._career_index = {name: j for j, name in enumerate(self.careers)}
+        order = np.argsort(-self.similarity, axis=1, kind='stable')
+        self._similar = [tuple((MBTI_TYPES[j], float(self.similarity[i, j])) for j in order[i] if j != i)
+                         for i in range(len(MBTI_TYPES))]
+
+    def to_json(self):
+        return {
+            'types': list(MBTI_TYPES),
+            'labels': self.labels,
+            'groups': self.groups,
+            'type_careers': {t: [[name, round(s, 4)] for name, s in ranked]
+                             for t, ranked in self.type_careers.items()},
+            'career_types': {c: [[t, round(s, 4)] for t, s in ranked]
+                             for c, ranked in self.career_types.items()},
+            'aliases': self.aliases,
+            'similarity': np.round(self.similarity, 4).tolist(),
+        }
+
+
+def _load(extract_dir, name):
+    return read_document(name, extract_dir) or {}
+
+
+def _type_of(text):
+    match = _TYPE_RE.search(str(text).upper())
+    return match.group(1) if match else None
+
+
+def _collect(extract_dir):
+    """
+    从三个源文件收集 (类型, 职业原文, 权重)，以及类型的中文称呼和所属角色
+    """
+    entries, labels, groups = [], {}, {}
+    for feature in _load(extract_dir, 'mbti_careers_match.json').get('features', []):
+        mbti = _type_of(feature.get('name', ''))
+        if mbti is None:
+            continue
+        if feature.get('nickname'):
+            labels[mbti] = feature['nickname']
+        for rank, career in enumerate(feature.get('career_matches') or []):
+            entries.append((mbti, career, MATCH_WEIGHT / (1 + RANK_DECAY * rank)))
+
+    development = _load(extract_dir, 'mbti_career_development.json').get('development_suggestions_by_type', {})
+    for items in development.values():
+        for item in items:
+            mbti = _type_of(item.get('type', ''))
+            if mbti is None:
+                continue
+            for area in re.split(r'[、，,;；]', item.get('suitable_roles') or ''):
+                if area.strip():
+                    entries.append((mbti, area, ROLE_AREA_WEIGHT))
+
+    for feature in _load(extract_dir, 'mbti_16personalities.json').get('features', []):
+        for item in feature.get('types', []):
+            mbti = _type_of(item.get('code', ''))
+            if mbti is not None:
+                groups[mbti] = feature.get('role', '')
+    return entries, labels, groups
+
+
+def letter_similarity():
+    """四个维度字母一致的比例"""
+    letters = np.array([list(t) for t in MBTI_TYPES])
+    return (letters[:, None, :] == letters[None, :, :]).mean(axis=2)
+
+
+def compile_index(extract_dir=EXTRACT_DIR):
+    """编译索引 (三个源文件合计只有几十KB，编译耗时为毫秒级)"""
+    entries, labels, groups = _collect(extract_dir)
+    aliases, columns = {}, {}
+    triples = []
+    for mbti, career, weight in entries:
+        names = career_aliases(career)
+        if not names:
+            continue
+        canonical = names[0][1]
+        for text, name in names:
+            aliases.setdefault(text, canonical)
+            aliases.setdefault(name, canonical)
+        j = columns.setdefault(canonical, len(columns))
+        triples.append((TYPE_INDEX[mbti], j, weight))
+
+    careers = list(columns)
+    raw = np.zeros((len(MBTI_TYPES), len(careers)))
+    for i, j, weight in triples:
+        # 同一类型重复列出同一职业时取较高的权重
+        raw[i, j] = max(raw[i, j], weight)
+
+    # 逆文档频率：被越多类型列出的职业区分度越低
+    df = (raw > 0).sum(axis=0)
+    idf = np.log((1 + len(MBTI_TYPES)) / (1 + df)) + 1
+    matrix = raw * idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    unit = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    cosine = unit @ unit.T
+    similarity = LETTER_SIMILARITY_WEIGHT * letter_similarity() + (1 - LETTER_SIMILARITY_WEIGHT) * cosine
+    np.fill_diagonal(similarity, 1.0)
+
+    type_careers = {}
+    for i, mbti in enumerate(MBTI_TYPES):
+        nz = np.flatnonzero(matrix[i])
+        order = nz[np.lexsort((nz, -matrix[i, nz]))]
+        type_careers[mbti] = tuple((careers[j], float(matrix[i, j])) for j in order)
+    career_types = {}
+    for j, name in enumerate(careers):
+        nz = np.flatnonzero(matrix[:, j])
+        order = nz[np.lexsort((nz, -matrix[nz, j]))]
+        career_types[name] = tuple((MBTI_TYPES[i], float(matrix[i, j])) for i in order)
+    # 规范名称本身也作为别名，resolve 只需一次字典查找
+    for name in careers:
+        aliases.setdefault(name, name)
+    return MbtiIndex(careers, matrix, labels, groups, type_careers, career_types, aliases, similarity)
+
+
+def _sources_key(extract_dir):
+    """源文件的 (名称, 大小, 修改时间)"""
+    key = []
+    for name in MBTI_FILES:
+        path = os.path.join(extract_dir, name)
+        st = os.stat(path) if os.path.exists(path) else None
+        key.append((name, st.st_size if st else -1, st.st_mtime_ns if st else -1))
+    return tuple(key)
+
+
+# extract目录 -> (源文件状态, 索引)
+_compiled = {}
+
+
+def default_index(extract_dir=EXTRACT_DIR, check=False):
+    """
+    进程内编译一次的索引
+
+    Args:
+        check: 重新检查源文件的大小与修改时间，变化时重新编译。
+               每次查询都调用时保持默认 False，查询只有字典访问的开销
+    """
+    extract_dir = os.path.abspath(extract_dir)
+    cached = _compiled.get(extract_dir)
+    if cached is not None and not check:
+        return cached[1]
+    key = _sources_key(extract_dir)
+    if cached is None or cached[0] != key:
+        cached = _compiled[extract_dir] = (key, compile_index(extract_dir))
+    return cached[1]
+
+
+def export_index(index, path):
+    """导出为JSON (先写临时文件再替换)，供其他服务直接加载"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index.to_json(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='MBTI职业索引查询')
+    parser.add_argument('--type', action='append', default=[], help='查询该类型最匹配的职业与相似类型')
+    parser.add_argument('--career', action='append', default=[], help='查询适合该职业的类型')
+    parser.add_argument('-k', type=int, default=10, help='返回条数')
+    parser.add_argument('--output', help='导出编译后的索引 (JSON)')
+    args = parser.parse_args(argv)
+
+    index = default_index()
+    print(f"🧭 MBTI职业索引：{len(index.careers)} 个规范职业，{len(index.aliases)} 个名称写法，"
+          f"{sum(len(v) for v in index.type_careers.values())} 条类型-职业匹配")
+    for mbti in args.type:
+        mbti = mbti.upper()
+        if mbti not in TYPE_INDEX:
+            print(f"⚠️ 未知MBTI类型: {mbti}")
+            continue
+        label = index.labels.get(mbti, '')
+        print(f"\n👤 {mbti} {label} ({index.groups.get(mbti, '')})")
+        for name, score in index.careers_for(mbti, args.k):
+            print(f"   {name:<16} {score:5.2f}")
+        similar = ', '.join(f'{t} {s:.2f}' for t, s in index.similar_types(mbti, 3))
+        print(f"   相似类型：{similar}")
+    for career in args.career:
+        name = index.resolve(career)
+        if name is None:
+            print(f"\n⚠️ 未收录职业: {career}")
+            continue
+        types = ', '.join(f'{t} {s:.2f}' for t, s in index.types_for(name)[:args.k])
+        print(f"\n💼 {career} → {name}：{types}")
+    if args.output:
+        export_index(index, args.output)
+        print(f"\n✅ 索引已导出至 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+图表并行渲染 - 进程池调度
+每个图表在独立的工作进程中渲染，各进程拥有独立的matplotlib状态
+"""
+
+import os
+import sys
+import time
+import importlib
+import traceback
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from lazy_imports import ensure_loaded
+from render_cache import RenderCache, chart_key
+from render_memory import plan_memory
+from render_metrics import RenderMetrics, instrument
+from render_profiles import chart_path, get_profile
+
+
+@dataclass
+class ChartResult:
+    """单个图表的渲染结果"""
+    module: str
+    chart: str
+    output_path: str
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    cache_hit: bool = False
+    metrics: Optional[RenderMetrics] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def available_cpus():
+    """返回当前进程可用的CPU核心数 (兼容容器CPU亲和性限制)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_workers(workers, n_charts):
+    """确定工作进程数：未指定时按可用核心数，且不超过图表数量"""
+    if workers is None or workers <= 0:
+        workers = available_cpus()
+    return max(1, min(workers, n_charts))
+
+
+def memory_plan(module_name, chart_names, workers, profile, memory_budget):
+    """按内存预算 (字节) 安排工作进程数与每个进程的栅格额度，见 render_memory.plan_memory"""
+    module = importlib.import_module(module_name)
+    chart_names = list(module.CHARTS) if chart_names is None else chart_names
+    return plan_memory(module, chart_names, get_profile(profile), memory_budget,
+                       resolve_workers(workers, len(chart_names)))
+
+
+def _init_worker(module_name):
+    """工作进程初始化：预先导入matplotlib并配置该进程独立的绘图状态"""
+    module = importlib.import_module(module_name)
+    ensure_loaded(module.plt)
+
+
+def _draw(module, chart_name, output_dir, profile, metrics):
+    """调用图表函数；metrics=True 时采集分阶段计时"""
+    if not metrics:
+        module.CHARTS[chart_name](output_dir=output_dir, profile=profile)
+        return None
+    with instrument(module.__name__, chart_name) as recorded:
+        module.CHARTS[chart_name](output_dir=output_dir, profile=profile)
+    return recorded
+
+
+def _render_one(module_name, chart_name, output_dir, cache_dir=None, profile=None, metrics=False):
+    """在当前进程中渲染单个图表，异常转换为结果中的错误信息"""
+    module = importlib.import_module(module_name)
+    output_path = chart_path(output_dir, chart_name, profile)
+    start = time.perf_counter()
+    cache_hit = False
+    recorded = None
+    try:
+        if cache_dir is None:
+            recorded = _draw(module, chart_name, output_dir, profile, metrics)
+        else:
+            # 增量构建：输入与样式未变化的图表直接复用缓存产物
+            cache = RenderCache(cache_dir)
+            key = chart_key(module, chart_name, {'profile': profile})
+            cache_hit = cache.fetch(key, output_path)
+            if not cache_hit:
+                recorded = _draw(module, chart_name, output_dir, profile, metrics)
+                cache.store(key, output_path)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        # 释放本次渲染残留的figure，避免影响同一进程中的下一个图表
+        pyplot = sys.modules.get('matplotlib.pyplot')
+        if pyplot is not None:
+            pyplot.close('all')
+    return ChartResult(module_name, chart_name, output_path,
+                       time.perf_counter() - start, error, cache_hit, recorded)
+
+
+def render_charts(module_name, output_dir, chart_names=None, workers=None, cache_dir=None, profile=None,
+                  metrics=False, memory_budget=None):
+    """
+    并行渲染模块中注册的图表
+
+    Args:
+        module_name: 图表模块名 (需提供 CHARTS 注册表和延迟导入的 plt)
+        output_dir: 输出目录，图表路径固定为 <output_dir>/<chart_name>.<格式扩展名>
+        chart_names: 需要渲染的图表名称列表，默认渲染全部
+        workers: 工作进程数，None或0表示使用全部可用核心，1表示在当前进程串行渲染
+        cache_dir: 渲染缓存目录，指定后跳过输入未变化的图表 (缓存淘汰由调用方执行)
+        profile: 渲染配置名称或 RenderProfile，默认出版质量
+        metrics: 是否采集分阶段计时 (见 render_metrics)，结果放在 ChartResult.metrics
+        memory_budget: 渲染总内存预算 (字节)，指定后据此减少工作进程数，超出栅格额度的PNG图表分块渲染
+
+    Returns:
+        按 chart_names 顺序排列的 ChartResult 列表
+    """
+    module = importlib.import_module(module_name)
+    if chart_names is None:
+        chart_names = list(module.CHARTS)
+    unknown = [name for name in chart_names if name not in module.CHARTS]
+    if unknown:
+        raise ValueError(f"未知图表: {', '.join(unknown)}")
+
+    profile = get_profile(profile)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = resolve_workers(workers, len(chart_names))
+    if memory_budget:
+        plan = memory_plan(module_name, chart_names, workers, profile, memory_budget)
+        workers = plan.workers
+        profile = replace(profile, max_raster_bytes=plan.max_raster_bytes)
+
+    if workers == 1:
+        # 与工作进程初始化一致：先完成绘图库导入与样式设置，不计入第一个图表的 data_prep
+        _init_worker(module_name)
+        return [_render_one(module_name, name, output_dir, cache_dir, profile, metrics) for name in chart_names]
+
+    # 使用spawn启动方式，保证每个工作进程从干净的解释器开始，不继承父进程的matplotlib状态
+    results = {}
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(module_name,)) as pool:
+        futures = {pool.submit(_render_one, module_name, name, output_dir, cache_dir, profile, metrics): name
+                   for name in chart_names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception:
+                # 工作进程异常退出 (如被OOM终止) 时同样按图表报告失败
+                results[name] = ChartResult(module_name, name, chart_path(output_dir, name, profile),
+                                            error=traceback.format_exc())
+    return [results[name] for name in chart_names]
+
+
+def print_report(results):
+    """打印每个图表的渲染结果，返回失败数量"""
+    failed = 0
+    for result in results:
+        if result.ok:
+            source = ' [缓存]' if result.cache_hit else ''
+            print(f"✅ {result.chart} ({result.elapsed:.2f}s){source} -> {result.output_path}")
+        else:
+            failed += 1
+            print(f"❌ {result.chart} 渲染失败:\n{result.error}")
+    print(f"\n共 {len(results)} 个图表，成功 {len(results) - failed} 个，失败 {failed} 个")
+    return failed
@@ -0,0 +1,251 @@
+"""
+职业发展进度数据 - 从 progress_records / career_goals / skill_assessments 表数据
+汇总出Dashboard所需的单用户指标
+"""
+
+import math
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+# 五大核心维度 (代码, 中文名称)，顺序与Dashboard雷达图一致
+DIMENSIONS = [
+    ('skill_development', '技能提升'),
+    ('career_milestones', '职业里程碑'),
+    ('learning_growth', '学习成长'),
+    ('network_building', '网络建设'),
+    ('innovation_output', '创新成果'),
+]
+DIMENSION_CODES = [code for code, _ in DIMENSIONS]
+DIMENSION_LABELS = [label for _, label in DIMENSIONS]
+
+# progress_records.dimension 可能存中文名称，统一映射为维度代码
+_DIMENSION_ALIASES = {label: code for code, label in DIMENSIONS}
+_DIMENSION_ALIASES.update({code: code for code in DIMENSION_CODES})
+
+# 趋势面板展示的维度
+TREND_DIMENSIONS = ['skill_development', 'career_milestones', 'network_building']
+
+# career_goals.goal_type 对应的目标名称
+GOAL_LABELS = {
+    'salary': '薪资目标',
+    'skills': '技能目标',
+    'position': '职位目标',
+    'business': '业务目标',
+    'project': '项目目标',
+    'learning': '学习目标',
+    'network': '网络目标',
+}
+
+DEFAULT_TARGET_SCORE = 8.5
+LAGGING_SCORE = 6.5
+
+
+def normalize_dimension(value):
+    """把维度名称统一为维度代码，未知维度返回 None"""
+    return _DIMENSION_ALIASES.get(value)
+
+
+@dataclass
+class DashboardData:
+    """单个用户综合Dashboard的全部展示数据"""
+    user_id: str
+    total_score: float
+    target_score: float
+    dimension_scores: list  # 按 DIMENSIONS 顺序的维度平均分，没有记录的维度为 None
+    trend_months: list = field(default_factory=list)
+    trends: dict = field(default_factory=dict)
+    goals: list = field(default_factory=list)
+    goal_completion: list = field(default_factory=list)
+    warnings_text: str = ''
+
+
+def radar_scores(dimension_scores):
+    """雷达图上的维度得分：没有记录的维度画在0处"""
+    return [0.0 if score is None else score for score in dimension_scores]
+
+
+@dataclass
+class LearningPanels:
+    """学习成长图的展示数据：活动 × 月份学习时长热力图与学习投资回报柱状图"""
+    months: list
+    learning_types: list
+    learning_data: list
+    investments: list
+    costs: list
+    benefits: list
+
+
+@dataclass
+class NetworkPanels:
+    """人脉网络分布图的展示数据：各类联系人数量与互动质量评分 (0-10)，influence 为影响力百分位"""
+    network_types: list
+    contact_counts: list
+    interaction_scores: list
+    influence: float = None
+
+
+def _latest_by_indicator(progress_records):
+    """每个 (维度, 指标) 只保留最近一次记录"""
+    latest = {}
+    for record in progress_records:
+        dimension = normalize_dimension(record.get('dimension'))
+        if dimension is None or record.get('score') is None:
+            continue
+        key = (dimension, record.get('indicator'))
+        date = str(record.get('record_date') or '')
+        if key not in latest or date >= str(latest[key].get('record_date') or ''):
+            latest[key] = record
+    return latest
+
+
+def _monthly_trends(progress_records, months=6):
+    """最近 months 个月各趋势维度的月平均分"""
+    sums = defaultdict(lambda: [0.0, 0])
+    for record in progress_records:
+        dimension = normalize_dimension(record.get('dimension'))
+        date = str(record.get('record_date') or '')
+        if dimension not in TREND_DIMENSIONS or len(date) < 7 or record.get('score') is None:
+            continue
+        cell = sums[(date[:7], dimension)]
+        cell[0] += float(record['score'])
+        cell[1] += 1
+    month_keys = sorted({month for month, _ in sums})[-months:]
+    labels = [f'{int(month[5:7])}月' for month in month_keys]
+    trends = {}
+    for dimension in TREND_DIMENSIONS:
+        series = []
+        for month in month_keys:
+            total, count = sums.get((month, dimension), (0.0, 0))
+            # 缺失月份沿用上月数值，保持折线连续
+            series.append(total / count if count else (series[-1] if series else float('nan')))
+        trends[dimension] = series
+    return labels, trends
+
+
+def _goal_completion(career_goals):
+    """按目标类型汇总平均完成度 (%)"""
+    by_type = defaultdict(list)
+    for goal in career_goals:
+        if goal.get('status') == 'cancelled':
+            continue
+        target = float(goal.get('target_value') or 0)
+        if target > 0:
+            completion = float(goal.get('current_value') or 0) / target * 100
+        else:
+            completion = float(goal.get('progress_percentage') or 0)
+        if goal.get('status') == 'completed':
+            completion = 100.0
+        by_type[goal.get('goal_type') or 'other'].append(min(completion, 100.0))
+    goals, completion = [], []
+    for goal_type, values in sorted(by_type.items()):
+        goals.append(GOAL_LABELS.get(goal_type, f'{goal_type}目标'))
+        completion.append(round(sum(values) / len(values)))
+    return goals, completion
+
+
+def _warnings_text(dimension_scores, goals, completion, skill_assessments):
+    """根据评分、目标和技能差距生成预警提醒与改进建议"""
+    warnings = []
+    for label, score in zip(DIMENSION_LABELS, dimension_scores):
+        if score is not None and score < LAGGING_SCORE:
+            warnings.append(f'{label}进度落后 ({score:.1f}/10)，建议重点投入')
+    for goal, comp in zip(goals, completion):
+        if comp < 60:
+            warnings.append(f'{goal}完成度仅 {comp}%，建议拆解目标并调整时间表')
+    # 没有记录的维度不计入总分，也不算作落后，只提示补充记录
+    warnings += [f'{label}暂无数据，建议补充进度记录'
+                 for label, score in zip(DIMENSION_LABELS, dimension_scores) if score is None]
+
+    gaps = sorted(
+        ((s.get('target_level') or 0) - (s.get('current_level') or 0), s.get('skill_name'))
+        for s in skill_assessments
+        if s.get('skill_name') and (s.get('target_level') or 0) > (s.get('current_level') or 0)
+    )
+    suggestions = [f'制定{name}提升计划 (差距 {gap} 级)' for gap, name in reversed(gaps[-3:])]
+
+    lines = ['⚠️ 预警提醒：']
+    lines += [f'• {w}' for w in warnings[:3]] or ['• 各项指标进展正常']
+    lines += ['', '📈 改进建议：']
+    lines += [f'• {s}' for s in suggestions] or ['• 保持当前节奏，持续积累项目成果']
+    return '\n'.join(f'    {line}' if line else '' for line in lines)
+
+
+def build_dashboard_data(user_id, progress_records, career_goals=(), skill_assessments=(), stage='mid',
+                         rollup=None):
+    """
+    汇总单个用户的Dashboard数据
+
+    Args:
+        user_id: 用户ID
+        progress_records: progress_records 表中该用户的记录 (dict)
+        career_goals: career_goals 表中该用户的记录
+        skill_assessments: skill_assessments 表中该用户的记录
+        stage: 职业阶段，决定维度权重 (见 career_scoring.STAGE_WEIGHTS)
+        rollup: progress_rollup.MonthlyRollup，提供时趋势从月度汇总读取，
+                progress_records 只需包含计算当前评分所需的记录
+    """
+    # career_scoring 依赖本模块的维度定义，在调用时导入以避免循环导入
+    from career_scoring import stage_weighted_total
+    latest = _latest_by_indicator(progress_records)
+    by_dimension = defaultdict(list)
+    targets = []
+    for (dimension, _), record in latest.items():
+        by_dimension[dimension].append(float(record['score']))
+        if record.get('target_score') is not None:
+            targets.append(float(record['target_score']))
+    dimension_scores = [
+        sum(by_dimension[code]) / len(by_dimension[code]) if by_dimension[code] else None
+        for code in DIMENSION_CODES
+    ]
+    # 与评分引擎一致：没有记录的维度不参与加权，其余维度的权重重新归一化
+    total = float(stage_weighted_total([float('nan') if s is None else s for s in dimension_scores], stage))
+    months, trends = rollup.trends(user_id) if rollup is not None else _monthly_trends(progress_records)
+    goals, completion = _goal_completion(career_goals)
+    return DashboardData(
+        user_id=str(user_id),
+        total_score=0.0 if math.isnan(total) else total,
+        target_score=sum(targets) / len(targets) if targets else DEFAULT_TARGET_SCORE,
+        dimension_scores=dimension_scores,
+        trend_months=months,
+        trends=trends,
+        goals=goals,
+        goal_completion=completion,
+        warnings_text=_warnings_text(dimension_scores, goals, completion, skill_assessments),
+    )
+
+
+def _sorted_groups(rows, table):
+    """按 user_id 分组，发现 user_id 不是严格递增 (按字符串比较) 时抛出 ValueError"""
+    previous = None
+    for user_id, group in itertools.groupby(rows, key=lambda row: str(row['user_id'])):
+        if previous is not None and user_id <= previous:
+            raise ValueError(f"{table} 未按 user_id 的字符串顺序排序：{user_id!r} 出现在 {previous!r} 之后")
+        previous = user_id
+        yield user_id, group
+
+
+def iter_user_bundles(progress_records, career_goals=(), skill_assessments=()):
+    """
+    按 user_id 合并三张表的记录流
+
+    三个输入都必须按 user_id 的字符串顺序排序 (如 ORDER BY user_id::text 导出，
+    UUID 主键的默认排序与此一致；整数ID需按文本排序)，顺序不符时抛出 ValueError，
+    避免同一用户的记录被拆成多份或与其他表错开。
+    每次产出 (user_id, progress_records, career_goals, skill_assessments)，
+    任意时刻只在内存中保留一个用户的数据
+    """
+    streams = [_sorted_groups(rows, table) for rows, table in
+               ((progress_records, 'progress_records'), (career_goals, 'career_goals'),
+                (skill_assessments, 'skill_assessments'))]
+    heads = [next(stream, None) for stream in streams]
+    while any(head is not None for head in heads):
+        user_id = min(head[0] for head in heads if head is not None)
+        bundle = []
+        for i, head in enumerate(heads):
+            if head is not None and head[0] == user_id:
+                bundle.append(list(head[1]))
+                heads[i] = next(streams[i], None)
+            else:
+                bundle.append([])
+        yield (user_id, *bundle)
@@ -0,0 +1,393 @@
+"""
+进度月度汇总 - progress_records 按 (用户, 维度, 指标, 月份) 增量维护的汇总
+每个格子保存 记录数 / 总分 / 最低分 / 最高分，可任意合并 (分片、按日增量、历史重算的结果
+直接相加)；月平均分 = 总分 / 记录数，维度级趋势由该维度下各指标的格子合并得到
+
+趋势面板读取一个用户最近几个月的格子，开销与月份数成正比，不再重扫全部历史记录；
+新记录按批写入，已有格子原地累加，新格子按有序位置插入。每条记录只应写入一次
+
+用法:
+    python progress_rollup.py --progress progress_records.csv --store rollup.npz   # 写入新记录并保存
+    python progress_rollup.py --store rollup.npz --user <user_id>                  # 查看趋势
+    python progress_rollup.py --bench 2000000                                      # 合成记录测量写入与查询耗时
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from dataclasses import dataclass
+
+import numpy as np
+
+from progress_data import TREND_DIMENSIONS, normalize_dimension, _monthly_trends
+from table_loader import iter_batches
+
+ROLLUP_COLUMNS = ['user_id', 'dimension', 'indicator', 'score', 'record_date']
+
+# 键 = 用户编码 << 32 | 序列编码 << 16 | 月份 (自1900年1月起的月数)
+_USER_SHIFT = 32
+_SERIES_SHIFT = 16
+_MONTH_MASK = (1 << _SERIES_SHIFT) - 1
+_SERIES_MASK = (1 << (_USER_SHIFT - _SERIES_SHIFT)) - 1
+_MONTH_BASE = np.datetime64('1900-01', 'M')
+
+_AGGREGATES = ('count', 'sum', 'min', 'max')
+
+
+@dataclass
+class MonthlyStats:
+    """一条序列的逐月汇总"""
+    months: list
+    count: np.ndarray
+    sum: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    @property
+    def mean(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sum / self.count
+
+
+def _month_label(month):
+    return f'{int(month[5:7])}月'
+
+
+def _forward_fill(counts, sums):
+    # 缺失月份沿用上月数值，保持折线连续 (与 progress_data._monthly_trends 一致)
+    series = []
+    for count, total in zip(counts.tolist(), sums.tolist()):
+        series.append(total / count if count else (series[-1] if series else float('nan')))
+    return series
+
+
+class MonthlyRollup:
+    """
+    稀疏月度汇总存储
+
+    键有序，同一用户的格子在数组中连续；按用户查询直接二分出行切片
+    """
+
+    def __init__(self):
+        self._users, self._user_codes = [], {}
+        self._series, self._series_codes = [], {}
+        self._keys = np.empty(0, dtype=np.int64)
+        self._data = {
+            'count': np.empty(0, dtype=np.int64),
+            'sum': np.empty(0, dtype=np.float64),
+            'min': np.empty(0, dtype=np.float64),
+            'max': np.empty(0, dtype=np.float64),
+        }
+
+    # ---- 写入 ----
+
+    @staticmethod
+    def _code(value, table, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def _encode(self, values, table, codes):
+        """字典编码，新取值追加到取值表末尾"""
+        uniques, inverse = np.unique(values, return_inverse=True)
+        mapped = np.array([self._code(v, table, codes) for v in uniques.tolist()], dtype=np.int64)
+        return mapped[inverse.reshape(-1)]
+
+    def add_columns(self, user_id, dimension, indicator, score, record_date):
+        """
+        按列批量写入记录，各参数可为标量或等长数组
+
+        维度统一为维度代码 (未知维度保留原值)；缺少用户、分数或日期的记录被丢弃
+
+        Returns:
+            写入的记录数
+        """
+        score = np.atleast_1d(np.asarray(score, dtype=np.float64))
+        n = len(score)
+        users = np.broadcast_to(np.asarray(user_id, dtype=str), n)
+        dates = np.broadcast_to(np.asarray(record_date, dtype='datetime64[D]'), n)
+        keep = ~np.isnan(score) & ~np.isnat(dates) & (users != '')
+        if not keep.any():
+            return 0
+        score, users, dates = score[keep], users[keep], dates[keep]
+        dimensions = np.broadcast_to(np.asarray(dimension, dtype=str), n)[keep]
+        indicators = np.broadcast_to(np.asarray(indicator, dtype=str), n)[keep]
+
+        # 维度与指标各自去重后再组合，只对出现过的组合做字典编码
+        dim_values, dim_inverse = np.unique(dimensions, return_inverse=True)
+        ind_values, ind_inverse = np.unique(indicators, return_inverse=True)
+        pairs, pair_inverse = np.unique(dim_inverse.reshape(-1) * len(ind_values) + ind_inverse.reshape(-1),
+                                        return_inverse=True)
+        dim_values = [normalize_dimension(d) or d for d in dim_values.tolist()]
+        ind_values = ind_values.tolist()
+        pair_codes = np.array([self._code(f"{dim_values[p // len(ind_values)]}\t{ind_values[p % len(ind_values)]}",
+                                          self._series, self._series_codes) for p in pairs.tolist()], dtype=np.int64)
+        series = pair_codes[pair_inverse.reshape(-1)]
+        if len(self._series) > _SERIES_MASK + 1:
+            raise ValueError(f"(维度, 指标) 组合超过 {_SERIES_MASK + 1} 个")
+        months = (dates.astype('datetime64[M]') - _MONTH_BASE).astype(np.int64)
+        if months.min() < 0 or months.max() > _MONTH_MASK:
+            raise ValueError("记录日期超出可表示范围 (1900-01 起约5400年)")
+        keys = (self._encode(users, self._users, self._user_codes) << _USER_SHIFT) \
+            | (series << _SERIES_SHIFT) | months
+
+        # 批内先聚合到格子，再与已有格子合并
+        cells, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind='stable')
+        starts = np.searchsorted(inverse[order], np.arange(len(cells)))
+        values = {
+            'count': np.bincount(inverse, minlength=len(cells)),
+            'sum': np.bincount(inverse, weights=score, minlength=len(cells)),
+            'min': np.minimum.reduceat(score[order], starts),
+            'max': np.maximum.reduceat(score[order], starts),
+        }
+        self._merge(cells, values)
+        return len(score)
+
+    def _merge(self, keys, values):
+        """合并一组互不相同的格子：已有格子累加，新格子按有序位置插入"""
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        values = {name: np.asarray(v)[order] for name, v in values.items()}
+        pos = np.searchsorted(self._keys, keys)
+        found = pos < len(self._keys)
+        found[found] = self._keys[pos[found]] == keys[found]
+        at = pos[found]
+        self._data['count'][at] += values['count'][found]
+        self._data['sum'][at] += values['sum'][found]
+        self._data['min'][at] = np.minimum(self._data['min'][at], values['min'][found])
+        self._data['max'][at] = np.maximum(self._data['max'][at], values['max'][found])
+
+        new = ~found
+        self._keys = np.insert(self._keys, pos[new], keys[new])
+        for name in _AGGREGATES:
+            self._data[name] = np.insert(self._data[name], pos[new],
+                                         values[name][new].astype(self._data[name].dtype))
+
+    def add_records(self, records):
+        """逐条写入 progress_records 字典记录"""
+        records = list(records)
+        if not records:
+            return 0
+        column = lambda name, default: [default if r.get(name) is None else r[name] for r in records]
+        return self.add_columns(column('user_id', ''), column('dimension', ''), column('indicator', ''),
+                                column('score', np.nan),
+                                [None if d is None else str(d)[:10] for d in column('record_date', None)])
+
+    def add_batch(self, batch):
+        """写入 table_loader.iter_batches 产出的列字典"""
+        return self.add_columns(batch['user_id'], batch['dimension'], batch.get('indicator', ''),
+                                batch['score'], batch['record_date'])
+
+    def merge(self, other):
+        """合并另一个汇总 (如另一分片或另一天的增量)"""
+        if not len(other):
+            return self
+        user_map = np.array([self._code(u, self._users, self._user_codes) for u in other._users], dtype=np.int64)
+        series_map = np.array([self._code(s, self._series, self._series_codes) for s in other._series],
+                              dtype=np.int64)
+        keys = other._keys
+        keys = (user_map[keys >> _USER_SHIFT] << _USER_SHIFT) \
+            | (series_map[(keys >> _SERIES_SHIFT) & _SERIES_MASK] << _SERIES_SHIFT) | (keys & _MONTH_MASK)
+        self._merge(keys, {name: other._data[name] for name in _AGGREGATES})
+        return self
+
+    # ---- 查询 ----
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def users(self):
+        return list(self._users)
+
+    @property
+    def records(self):
+        """已写入的记录总数"""
+        return int(self._data['count'].sum())
+
+    def _user_cells(self, user_id):
+        """用户的格子：(序列编码, 月份, 行下标)"""
+        user = self._user_codes.get(str(user_id))
+        if user is None:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        lo, hi = np.searchsorted(self._keys, [user << _USER_SHIFT, (user + 1) << _USER_SHIFT])
+        keys = self._keys[lo:hi]
+        return (keys >> _SERIES_SHIFT) & _SERIES_MASK, keys & _MONTH_MASK, np.arange(lo, hi)
+
+    def _series_for(self, dimension, indicator=None):
+        dimension = normalize_dimension(dimension) or dimension
+        codes = [i for i, pair in enumerate(self._series)
+                 if pair.partition('\t')[0] == dimension and (indicator is None or pair.partition('\t')[2] == indicator)]
+        return np.array(codes, dtype=np.int64)
+
+    def _aggregate(self, rows, months, month_keys):
+        """把格子按月份合并到 month_keys 上"""
+        idx = np.searchsorted(month_keys, months)
+        n = len(month_keys)
+        count = np.bincount(idx, weights=self._data['count'][rows], minlength=n).astype(np.int64)
+        total = np.bincount(idx, weights=self._data['sum'][rows], minlength=n)
+        low, high = np.full(n, np.inf), np.full(n, -np.inf)
+        np.minimum.at(low, idx, self._data['min'][rows])
+        np.maximum.at(high, idx, self._data['max'][rows])
+        return count, total, np.where(count > 0, low, np.nan), np.where(count > 0, high, np.nan)
+
+    @staticmethod
+    def _month_strings(months):
+        return [str(_MONTH_BASE + int(m)) for m in months]
+
+    def monthly(self, user_id, dimension, indicator=None):
+        """用户某维度 (或某指标) 有记录的各月汇总，indicator 为 None 时合并该维度下全部指标"""
+        series, months, rows = self._user_cells(user_id)
+        mask = np.isin(series, self._series_for(dimension, indicator))
+        month_keys = np.unique(months[mask])
+        count, total, low, high = self._aggregate(rows[mask], months[mask], month_keys)
+        return MonthlyStats(self._month_strings(month_keys), count, total, low, high)
+
+    def _trend_table(self, user_id, groups, months):
+        """各组序列在最近 months 个有记录月份上的月平均分，一次 bincount 完成全部组"""
+        names = list(groups)
+        lookup = np.full(len(self._series) + 1, -1, dtype=np.int64)
+        for g, codes in enumerate(groups.values()):
+            lookup[codes] = g
+        series, month_index, rows = self._user_cells(user_id)
+        group = lookup[series]
+        valid = group >= 0
+        month_keys = np.unique(month_index[valid])
+        if months:
+            month_keys = month_keys[-months:]
+        labels = [_month_label(m) for m in self._month_strings(month_keys)]
+        if not len(month_keys):
+            return labels, {name: [] for name in names}
+        valid &= month_index >= month_keys[0]
+        n = len(month_keys)
+        cell = group[valid] * n + np.searchsorted(month_keys, month_index[valid])
+        counts = np.bincount(cell, weights=self._data['count'][rows[valid]], minlength=len(names) * n)
+        sums = np.bincount(cell, weights=self._data['sum'][rows[valid]], minlength=len(names) * n)
+        counts, sums = counts.reshape(len(names), n), sums.reshape(len(names), n)
+        return labels, {name: _forward_fill(counts[g], sums[g]) for g, name in enumerate(names)}
+
+    def trends(self, user_id, dimensions=TREND_DIMENSIONS, months=6):
+        """
+        Dashboard 趋势面板数据，与 progress_data._monthly_trends 的输出相同
+
+        Returns:
+            (月份标签, {维度: 月平均分列表})
+        """
+        return self._trend_table(user_id, {d: self._series_for(d) for d in dimensions}, months)
+
+    def indicator_trends(self, user_id, dimension, indicators, months=6):
+        """同一维度下若干指标的月平均分 (如技能发展趋势中的编程能力 / 机器学习 / 深度学习)"""
+        return self._trend_table(user_id, {i: self._series_for(dimension, i) for i in indicators}, months)
+
+    # ---- 持久化 ----
+
+    def save(self, path):
+        """保存为 .npz (先写临时文件再替换)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, keys=self._keys, users=np.array(self._users, dtype=str),
+                         series=np.array(self._series, dtype=str), **self._data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        rollup = cls()
+        with np.load(path) as data:
+            rollup._users = data['users'].tolist()
+            rollup._series = data['series'].tolist()
+            rollup._keys = data['keys']
+            rollup._data = {name: data[name] for name in _AGGREGATES}
+        rollup._user_codes = {u: i for i, u in enumerate(rollup._users)}
+        rollup._series_codes = {s: i for i, s in enumerate(rollup._series)}
+        return rollup
+
+
+def load_rollup(path, rollup=None, **filters):
+    """流式读取 progress_records 导出并写入汇总 (filters 传给 iter_batches，如 date_range)"""
+    rollup = MonthlyRollup() if rollup is None else rollup
+    for batch in iter_batches(path, 'progress_records', columns=ROLLUP_COLUMNS, **filters):
+        rollup.add_batch(batch)
+    return rollup
+
+
+def synthetic_records(n_rows, n_users=None, seed=0):
+    """合成进度记录列 (基准测试用)"""
+    rng = np.random.default_rng(seed)
+    n_users = n_users or max(1, n_rows // 2000)
+    dimensions = np.array(['skill_development', 'career_milestones', 'learning_growth',
+                           'network_building', 'innovation_output'])
+    return {
+        'user_id': np.char.add('u', rng.integers(0, n_users, n_rows).astype(str)),
+        'dimension': dimensions[rng.integers(0, len(dimensions), n_rows)],
+        'indicator': np.char.add('指标', rng.integers(0, 4, n_rows).astype(str)),
+        'score': rng.uniform(4, 10, n_rows).round(1),
+        'record_date': np.datetime64('2023-01-01') + rng.integers(0, 900, n_rows),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='progress_records 月度汇总')
+    parser.add_argument('--progress', help='progress_records 导出 (CSV/JSONL)，写入汇总')
+    parser.add_argument('--store', help='汇总文件 (.npz)；存在时先加载，写入后保存')
+    parser.add_argument('--user', action='append', default=[], help='打印该用户的趋势')
+    parser.add_argument('--months', type=int, default=6, help='趋势月份数')
+    parser.add_argument('--bench', type=int, metavar='N', help='用N条合成记录测量写入与查询耗时')
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        columns = synthetic_records(args.bench)
+        half = args.bench // 2
+        rollup = MonthlyRollup()
+        for label, part in (('写入', slice(0, half)), ('增量写入', slice(half, None))):
+            started = time.perf_counter()
+            rollup.add_columns(**{name: v[part] for name, v in columns.items()})
+            print(f"🧪 {label} {len(columns['score'][part]):,} 条：{time.perf_counter() - started:.2f}s，"
+                  f"{len(rollup):,} 个格子")
+        user = rollup.users[0]
+        records = [dict(zip(columns, row)) for row in zip(*(columns[name].tolist() for name in columns))
+                   if row[0] == user]
+        for record in records:
+            record['record_date'] = str(record['record_date'])
+        for label, query in (('汇总趋势查询', lambda: rollup.trends(user, months=args.months)),
+                             (f'重扫 {len(records)} 条记录', lambda: _monthly_trends(records, args.months))):
+            started = time.perf_counter()
+            for _ in range(100):
+                query()
+            print(f"⏱️ {label:<20}{(time.perf_counter() - started) * 10:8.3f}ms/次")
+        return 0
+
+    if not args.store and not args.progress:
+        parser.error('需要 --progress 或 --store')
+    rollup = MonthlyRollup.load(args.store) if args.store and os.path.exists(args.store) else MonthlyRollup()
+    if args.progress:
+        before = rollup.records
+        started = time.perf_counter()
+        load_rollup(args.progress, rollup)
+        print(f"📥 写入 {rollup.records - before:,} 条记录：{time.perf_counter() - started:.2f}s")
+        if args.store:
+            rollup.save(args.store)
+            print(f"💾 已保存：{args.store}")
+    print(f"📊 {len(rollup.users):,} 个用户，{len(rollup):,} 个月度格子，共 {rollup.records:,} 条记录")
+    for user in args.user:
+        labels, trends = rollup.trends(user, months=args.months)
+        print(f"\n📈 {user}: {' '.join(f'{m:>5}' for m in labels)}")
+        for dimension, series in trends.items():
+            print(f"   {dimension:<18} {' '.join(f'{v:5.2f}' for v in series)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,18 +3,26 @@
 生成各种Dashboard图表，展示指标体系的可视化实现
 """
 
+import sys
+import argparse
 import warnings
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-import pandas as pd
-from matplotlib.patches import Circle
-import matplotlib.patches as mpatches
+
+from heatmap import draw_heatmap
+from lazy_imports import lazy_import
+from progress_data import DashboardData, LearningPanels, NetworkPanels, DIMENSIONS, DIMENSION_LABELS, radar_scores
+from career_scoring import stage_weighted_total
+from render_profiles import PROFILES, DEFAULT_PROFILE, FORMATS, get_profile, save_chart
+
+# matplotlib/seaborn 在首次渲染图表时才导入，导入本模块不做任何绘图初始化
+plt = lazy_import('matplotlib.pyplot', on_load=lambda _: setup_matplotlib_for_plotting())
+sns = lazy_import('seaborn')
 
 def setup_matplotlib_for_plotting():
     """
     Setup matplotlib and seaborn for plotting with proper configuration.
-    Call this function before creating any plots to ensure proper rendering.
+    Called automatically the first time pyplot is used, so chart functions
+    render correctly without an explicit setup call.
     """
     # Ensure warnings are printed
     warnings.filterwarnings('default')  # Show all warnings
@@ -31,8 +39,18 @@ def setup_matplotlib_for_plotting():
     plt.rcParams["font.sans-serif"] = ["Noto Sans CJK SC", "WenQuanYi Zen Hei", "PingFang SC", "Arial Unicode MS", "Hiragino Sans GB"]
     plt.rcParams["axes.unicode_minus"] = False
 
-# 初始化matplotlib设置
-setup_matplotlib_for_plotting()
+# 图表默认保存目录
+CHARTS_DIR = '/workspace/charts'
+
+# 各图表的 figure 尺寸 (英寸)，render_memory 据此估算渲染内存
+FIGURE_SIZES = {
+    'overall_progress_radar': (10, 8),
+    'skill_progress_analysis': (16, 12),
+    'career_milestone_progress': (16, 12),
+    'learning_growth_analysis': (16, 12),
+    'network_innovation_analysis': (16, 12),
+    'comprehensive_dashboard': (20, 16),
+}
 
 # 定义颜色主题
 COLORS = {
@@ -44,25 +62,13 @@ COLORS = {
     'secondary': '#6c757d'
 }
 
-def create_overall_progress_chart():
-    """创建总体进度环形图"""
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # 示例数据
-    dimensions = ['技能提升', '职业里程碑', '学习成长', '网络建设', '创新成果']
-    scores = [7.5, 6.8, 8.2, 5.9, 6.3]
-    weights = [30, 30, 15, 15, 10]  # 中级阶段权重
-    
-    # 计算加权总分
-    total_score = sum(s * w for s, w in zip(scores, weights)) / sum(weights)
-    
-    # 创建环形图
+def draw_overall_progress(ax, dimensions, scores, total_score):
+    """在极坐标ax上绘制五维度雷达图与综合评分 (供模板模式复用)"""
     angles = np.linspace(0, 2*np.pi, len(dimensions), endpoint=False).tolist()
     angles += angles[:1]  # 闭合图形
-    scores_plot = scores + scores[:1]
+    scores_plot = list(scores) + list(scores[:1])
     
     # 绘制雷达图背景
-    ax = plt.subplot(111, projection='polar')
     ax.plot(angles, [10]*len(angles), 'grey', linewidth=0.5, alpha=0.3)
     ax.plot(angles, [8]*len(angles), 'grey', linewidth=0.5, alpha=0.3)
     ax.plot(angles, [6]*len(angles), 'grey', linewidth=0.5, alpha=0.3)
@@ -82,17 +88,41 @@ def create_overall_progress_chart():
     ax.grid(True)
     
     # 添加总分显示
-    plt.figtext(0.5, 0.02, f'综合评分: {total_score:.1f}/10.0', 
-                ha='center', fontsize=16, weight='bold', color=COLORS['primary'])
+    ax.figure.text(0.5, 0.02, f'综合评分: {total_score:.1f}/10.0', 
+                   ha='center', fontsize=16, weight='bold', color=COLORS['primary'])
     
-    plt.title('职业发展五维度评估雷达图', size=16, weight='bold', pad=20)
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/overall_progress_radar.png', dpi=300, bbox_inches='tight')
+    ax.set_title('职业发展五维度评估雷达图', size=16, weight='bold', pad=20)
+
+def create_overall_progress_chart(output_dir=CHARTS_DIR, profile=None):
+    """创建总体进度环形图"""
+    fig = plt.figure(figsize=FIGURE_SIZES['overall_progress_radar'])
+    ax = fig.add_subplot(111, projection='polar')
+    
+    # 示例数据
+    dimensions = ['技能提升', '职业里程碑', '学习成长', '网络建设', '创新成果']
+    scores = [7.5, 6.8, 8.2, 5.9, 6.3]
+    
+    # 按中级阶段权重计算加权总分
+    total_score = float(stage_weighted_total(scores, 'mid'))
+    
+    draw_overall_progress(ax, dimensions, scores, total_score)
+    save_chart(plt.gcf(), output_dir, 'overall_progress_radar', profile)
     plt.close()
 
-def create_skill_progress_chart():
+# 技能发展趋势示例数据：(月份标签, {技能: 月平均分})，
+# 实际数据可由 progress_rollup.MonthlyRollup.indicator_trends 读取
+SAMPLE_SKILL_TRENDS = (
+    ['1月', '2月', '3月', '4月', '5月', '6月'],
+    {
+        '编程能力': [7.2, 7.4, 7.7, 7.9, 8.0, 8.2],
+        '机器学习': [6.8, 7.0, 7.1, 7.3, 7.4, 7.5],
+        '深度学习': [6.5, 6.9, 7.2, 7.4, 7.6, 7.8],
+    },
+)
+
+def create_skill_progress_chart(output_dir=CHARTS_DIR, profile=None, skill_trends=SAMPLE_SKILL_TRENDS):
     """创建技能进度详细分析图"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=FIGURE_SIZES['skill_progress_analysis'])
     
     # 技术深度评分
     skills = ['编程能力', '机器学习', '深度学习', '工程化', '专业领域']
@@ -114,14 +144,9 @@ def create_skill_progress_chart():
     ax1.grid(True, alpha=0.3)
     
     # 技能发展趋势
-    months = ['1月', '2月', '3月', '4月', '5月', '6月']
-    programming_trend = [7.2, 7.4, 7.7, 7.9, 8.0, 8.2]
-    ml_trend = [6.8, 7.0, 7.1, 7.3, 7.4, 7.5]
-    dl_trend = [6.5, 6.9, 7.2, 7.4, 7.6, 7.8]
-    
-    ax2.plot(months, programming_trend, marker='o', label='编程能力', linewidth=2)
-    ax2.plot(months, ml_trend, marker='s', label='机器学习', linewidth=2)  
-    ax2.plot(months, dl_trend, marker='^', label='深度学习', linewidth=2)
+    months, trends = skill_trends
+    for (skill, trend), marker in zip(trends.items(), ['o', 's', '^', 'D', 'v']):
+        ax2.plot(months, trend, marker=marker, label=skill, linewidth=2)
     
     ax2.set_xlabel('时间')
     ax2.set_ylabel('评分 (1-10)')
@@ -167,17 +192,19 @@ def create_skill_progress_chart():
     ax4.pie(normalized_sizes, labels=labels, colors=colors_pie, autopct='%1.1f%%', startangle=90)
     ax4.set_title('开源贡献分布')
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/skill_progress_analysis.png', dpi=300, bbox_inches='tight')
+    save_chart(plt.gcf(), output_dir, 'skill_progress_analysis', profile)
     plt.close()
 
-def create_career_milestone_chart():
+def create_career_milestone_chart(output_dir=CHARTS_DIR, profile=None):
     """创建职业里程碑进度图"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    # 薪资数据集要加载抽取快照，只在画图时导入，避免拖慢模块导入
+    from salary_store import SALARY_UNIT, normalize_amounts
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=FIGURE_SIZES['career_milestone_progress'])
     
-    # 薪资增长趋势
+    # 薪资增长趋势：个人年薪记录为万元人民币，按薪资数据集的汇率换算为与其他薪资图表一致的千美元
     years = ['2020', '2021', '2022', '2023', '2024', '2025(预期)']
-    salary_data = [35, 52, 68, 89, 125, 158]  # 单位：万元
+    salary_data = normalize_amounts([35, 52, 68, 89, 125, 158], currency='CNY', unit='万')
     
     ax1.plot(years, salary_data, marker='o', linewidth=3, color=COLORS['success'], markersize=8)
     ax1.fill_between(years, salary_data, alpha=0.3, color=COLORS['success'])
@@ -192,7 +219,7 @@ def create_career_milestone_chart():
                     fontsize=9, color=COLORS['primary'])
     
     ax1.set_xlabel('年份')
-    ax1.set_ylabel('年薪 (万元)')
+    ax1.set_ylabel(f'年薪 ({SALARY_UNIT})')
     ax1.set_title('薪资增长轨迹')
     ax1.grid(True, alpha=0.3)
     
@@ -255,41 +282,40 @@ def create_career_milestone_chart():
         ax4.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
                 str(count), ha='center', va='bottom', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/career_milestone_progress.png', dpi=300, bbox_inches='tight')
+    save_chart(plt.gcf(), output_dir, 'career_milestone_progress', profile)
     plt.close()
 
-def create_learning_growth_chart():
-    """创建学习成长进度图"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-    
-    # 学习完成情况热力图
-    months = ['1月', '2月', '3月', '4月', '5月', '6月']
-    learning_types = ['在线课程', '技术认证', '技术书籍', '项目实践', '技术分享']
-    
+def draw_learning_heatmap(ax, learning_types, months, learning_data, order=None):
+    """绘制学习活动 × 月份的学习时长热力图；活动类型或月份很多时按 heatmap 模块合并行、省略标签"""
+    result = draw_heatmap(ax, learning_data, learning_types, months, text_color='white',
+                          dark_threshold=25, order=order)
+    ax.set_title('学习活动热力图 (小时/月)')
+    ax.figure.colorbar(result.image, ax=ax)
+    return result
+
+# 学习成长图示例数据，实际数据可由 learning_stats.LearningAggregator.panels 流式汇总得到
+SAMPLE_LEARNING = LearningPanels(
+    months=['1月', '2月', '3月', '4月', '5月', '6月'],
+    learning_types=['在线课程', '技术认证', '技术书籍', '项目实践', '技术分享'],
     # 学习时间数据 (小时)
-    learning_data = np.array([
+    learning_data=[
         [20, 25, 30, 28, 32, 35],  # 在线课程
         [8, 0, 15, 0, 12, 0],      # 技术认证
         [15, 18, 12, 20, 16, 22],  # 技术书籍
         [40, 45, 50, 38, 42, 48],  # 项目实践
         [5, 8, 6, 10, 12, 15]      # 技术分享
-    ])
-    
-    im = ax1.imshow(learning_data, cmap='YlOrRd', aspect='auto')
-    ax1.set_xticks(range(len(months)))
-    ax1.set_yticks(range(len(learning_types)))
-    ax1.set_xticklabels(months)
-    ax1.set_yticklabels(learning_types)
-    ax1.set_title('学习活动热力图 (小时/月)')
-    
-    # 添加数值标签
-    for i in range(len(learning_types)):
-        for j in range(len(months)):
-            ax1.text(j, i, learning_data[i, j], ha='center', va='center', 
-                    color='white' if learning_data[i, j] > 25 else 'black')
+    ],
+    investments=['课程费用', '书籍购买', '会议参加', '工具订阅', '时间投入'],
+    costs=[5000, 1200, 8000, 2400, 15000],  # 转换为金额等价
+    benefits=[12000, 3000, 20000, 6000, 45000],  # 估算收益
+)
+
+def create_learning_growth_chart(output_dir=CHARTS_DIR, profile=None, learning=SAMPLE_LEARNING):
+    """创建学习成长进度图"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=FIGURE_SIZES['learning_growth_analysis'])
     
-    plt.colorbar(im, ax=ax1)
+    # 学习完成情况热力图
+    draw_learning_heatmap(ax1, learning.learning_types, learning.months, np.asarray(learning.learning_data))
     
     # 认证获得进度
     cert_categories = ['云平台认证', '技术框架', '项目管理', '行业认证']
@@ -329,46 +355,48 @@ def create_learning_growth_chart():
     ax3.grid(True)
     
     # 学习ROI分析
-    learning_investments = ['课程费用', '书籍购买', '会议参加', '工具订阅', '时间投入']
-    costs = [5000, 1200, 8000, 2400, 15000]  # 转换为金额等价
-    benefits = [12000, 3000, 20000, 6000, 45000]  # 估算收益
-    
-    x = np.arange(len(learning_investments))
+    x = np.arange(len(learning.investments))
     width = 0.35
     
-    ax4.bar(x - width/2, costs, width, label='投入成本', color=COLORS['danger'], alpha=0.8)
-    ax4.bar(x + width/2, benefits, width, label='估算收益', color=COLORS['success'], alpha=0.8)
+    ax4.bar(x - width/2, learning.costs, width, label='投入成本', color=COLORS['danger'], alpha=0.8)
+    ax4.bar(x + width/2, learning.benefits, width, label='估算收益', color=COLORS['success'], alpha=0.8)
     
     ax4.set_xlabel('学习投资类型')
     ax4.set_ylabel('金额 (元)')
     ax4.set_title('学习投资回报分析')
     ax4.set_xticks(x)
-    ax4.set_xticklabels(learning_investments, rotation=45)
+    ax4.set_xticklabels(learning.investments, rotation=45)
     ax4.legend()
     ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/learning_growth_analysis.png', dpi=300, bbox_inches='tight')
+    save_chart(plt.gcf(), output_dir, 'learning_growth_analysis', profile)
     plt.close()
 
-def create_network_innovation_chart():
+# 人脉网络分布示例数据，实际数据可由 network_graph.NetworkGraph.panels 从联系人与关注关系计算
+SAMPLE_NETWORK = NetworkPanels(
+    network_types=['同行专家', '行业领导', '跨领域人士', '创业投资圈', '学术研究者'],
+    contact_counts=[25, 8, 15, 6, 12],
+    interaction_scores=[7.8, 6.5, 7.2, 8.9, 7.6],
+)
+
+def create_network_innovation_chart(output_dir=CHARTS_DIR, profile=None, network=SAMPLE_NETWORK):
     """创建网络建设和创新成果图"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=FIGURE_SIZES['network_innovation_analysis'])
     
     # 人脉网络分布
-    network_types = ['同行专家', '行业领导', '跨领域人士', '创业投资圈', '学术研究者']
-    contact_counts = [25, 8, 15, 6, 12]
-    interaction_scores = [7.8, 6.5, 7.2, 8.9, 7.6]
-    
-    # 创建气泡图
     colors = [COLORS['primary'], COLORS['success'], COLORS['info'], COLORS['warning'], COLORS['secondary']]
     
-    for i, (count, score, color, net_type) in enumerate(zip(contact_counts, interaction_scores, colors, network_types)):
-        ax1.scatter(count, score, s=count*20, c=color, alpha=0.7, label=net_type)
+    # 创建气泡图
+    for i, (count, score, net_type) in enumerate(zip(network.contact_counts, network.interaction_scores,
+                                                      network.network_types)):
+        ax1.scatter(count, score, s=count*20, c=colors[i % len(colors)], alpha=0.7, label=net_type)
     
     ax1.set_xlabel('联系人数量')
     ax1.set_ylabel('互动质量评分')
-    ax1.set_title('人脉网络分布图')
+    title = '人脉网络分布图'
+    if network.influence is not None:
+        title += f' (影响力超过 {network.influence:.0f}% 的节点)'
+    ax1.set_title(title)
     ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     ax1.grid(True, alpha=0.3)
     
@@ -431,21 +459,98 @@ def create_network_innovation_chart():
     ax4.legend()
     ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('/workspace/charts/network_innovation_analysis.png', dpi=300, bbox_inches='tight')
+    save_chart(plt.gcf(), output_dir, 'network_innovation_analysis', profile)
     plt.close()
 
-def create_comprehensive_dashboard():
-    """创建综合Dashboard概览"""
-    fig = plt.figure(figsize=(20, 16))
+# 综合Dashboard示例数据
+SAMPLE_DASHBOARD = DashboardData(
+    user_id='sample',
+    total_score=7.3,
+    target_score=8.5,
+    dimension_scores=[7.5, 6.8, 8.2, 5.9, 6.3],
+    trend_months=['1月', '2月', '3月', '4月', '5月', '6月'],
+    trends={
+        'skill_development': [6.8, 7.0, 7.2, 7.3, 7.4, 7.5],
+        'career_milestones': [6.2, 6.3, 6.4, 6.6, 6.7, 6.8],
+        'network_building': [5.1, 5.3, 5.5, 5.6, 5.8, 5.9],
+    },
+    goals=['薪资目标', '技能目标', '项目目标', '学习目标', '网络目标'],
+    goal_completion=[85, 75, 90, 88, 65],
+    warnings_text="""
+    ⚠️ 预警提醒：
+    • 网络建设进度落后，建议加强行业交流活动参与
+    • 创新成果产出偏低，建议启动专利申请或论文写作计划
+    • 距离年度薪资目标还有15%差距，建议准备晋升材料
+    
+    📈 改进建议：
+    • 参加下月AI技术大会，拓展人脉网络
+    • 启动深度学习框架优化项目，争取技术突破
+    • 准备技术分享，提升个人影响力
+    """,
+)
+
+def build_dashboard_layout():
+    """创建综合Dashboard的figure与网格布局，返回 (fig, axes)，可在多次渲染间复用"""
+    fig = plt.figure(figsize=FIGURE_SIZES['comprehensive_dashboard'])
     gs = fig.add_gridspec(4, 4, hspace=0.3, wspace=0.3)
+    axes = (
+        fig.add_subplot(gs[0:2, 0:2]),                      # 总体进度环形图
+        fig.add_subplot(gs[0:2, 2:4], projection='polar'),  # 五维度雷达图
+        fig.add_subplot(gs[2, :2]),                         # 关键指标趋势
+        fig.add_subplot(gs[2, 2:]),                         # 目标达成情况
+        fig.add_subplot(gs[3, :]),                          # 预警提醒面板
+    )
+    fig.suptitle('职业发展进度追踪Dashboard', fontsize=20, fontweight='bold')
+    return fig, axes
+
+TREND_MARKERS = ['o', 's', '^']
+
+def draw_key_trends(ax, months, trends):
+    """绘制关键指标趋势折线，每个序列一条线，图例为维度名称 (非维度键按原样显示)"""
+    labels = dict(DIMENSIONS)
+    positions = np.arange(len(months))
+    for i, (dimension, trend) in enumerate(trends.items()):
+        ax.plot(positions, trend, marker=TREND_MARKERS[i % len(TREND_MARKERS)],
+                label=labels.get(dimension, dimension), linewidth=2)
+    
+    ax.set_xticks(positions)
+    ax.set_xticklabels(months)
+    ax.set_xlabel('时间')
+    ax.set_ylabel('评分')
+    ax.set_title('关键指标发展趋势')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+def completion_color(completion):
+    """目标完成度对应的颜色"""
+    return COLORS['success'] if completion >= 80 else COLORS['warning'] if completion >= 60 else COLORS['danger']
+
+def draw_goal_completion(ax, goals, completion):
+    """绘制年度目标达成情况横向柱状图"""
     
-    # 总体进度环形图
-    ax1 = fig.add_subplot(gs[0:2, 0:2])
+    colors_bar = [completion_color(c) for c in completion]
+    bars = ax.barh(np.arange(len(goals)), completion, color=colors_bar, alpha=0.8)
     
-    # 示例数据
-    total_score = 7.3
-    target_score = 8.5
+    ax.set_yticks(np.arange(len(goals)))
+    ax.set_yticklabels(goals)
+    ax.set_xlabel('完成度 (%)')
+    ax.set_title('年度目标达成情况')
+    ax.set_xlim(0, 100)
+    ax.grid(True, alpha=0.3)
+    
+    # 添加完成度标签
+    for bar, comp in zip(bars, completion):
+        ax.text(comp + 1, bar.get_y() + bar.get_height()/2,
+                f'{comp}%', va='center', fontweight='bold')
+
+def draw_dashboard(axes, data):
+    """在已有布局上绘制一个用户的Dashboard内容 (先清空各子图)"""
+    ax1, ax2, ax3, ax4, ax5 = axes
+    for ax in axes:
+        ax.cla()
+    
+    # 总体进度环形图
+    total_score = data.total_score
     
     # 创建环形图
     sizes = [total_score, 10 - total_score]
@@ -463,114 +568,102 @@ def create_comprehensive_dashboard():
     ax1.set_title('职业发展总体进度', fontsize=16, fontweight='bold', pad=20)
     
     # 五维度雷达图
-    ax2 = fig.add_subplot(gs[0:2, 2:4], projection='polar')
+    scores = radar_scores(data.dimension_scores)
     
-    dimensions = ['技能提升', '职业里程碑', '学习成长', '网络建设', '创新成果']
-    scores = [7.5, 6.8, 8.2, 5.9, 6.3]
-    
-    angles = np.linspace(0, 2*np.pi, len(dimensions), endpoint=False).tolist()
+    angles = np.linspace(0, 2*np.pi, len(DIMENSION_LABELS), endpoint=False).tolist()
     angles += angles[:1]
     scores_plot = scores + scores[:1]
     
     ax2.plot(angles, scores_plot, COLORS['primary'], linewidth=3)
     ax2.fill(angles, scores_plot, COLORS['primary'], alpha=0.25)
     ax2.set_xticks(angles[:-1])
-    ax2.set_xticklabels(dimensions, fontsize=11)
+    ax2.set_xticklabels(DIMENSION_LABELS, fontsize=11)
     ax2.set_ylim(0, 10)
     ax2.set_title('五维度能力评估', fontsize=14, fontweight='bold', pad=20)
     ax2.grid(True)
     
     # 关键指标趋势
-    ax3 = fig.add_subplot(gs[2, :2])
-    
-    months = ['1月', '2月', '3月', '4月', '5月', '6月']
-    skill_trend = [6.8, 7.0, 7.2, 7.3, 7.4, 7.5]
-    career_trend = [6.2, 6.3, 6.4, 6.6, 6.7, 6.8]
-    network_trend = [5.1, 5.3, 5.5, 5.6, 5.8, 5.9]
-    
-    ax3.plot(months, skill_trend, marker='o', label='技能提升', linewidth=2)
-    ax3.plot(months, career_trend, marker='s', label='职业里程碑', linewidth=2)
-    ax3.plot(months, network_trend, marker='^', label='网络建设', linewidth=2)
-    
-    ax3.set_xlabel('时间')
-    ax3.set_ylabel('评分')
-    ax3.set_title('关键指标发展趋势')
-    ax3.legend()
-    ax3.grid(True, alpha=0.3)
+    draw_key_trends(ax3, data.trend_months, data.trends)
     
     # 目标达成情况
-    ax4 = fig.add_subplot(gs[2, 2:])
-    
-    goals = ['薪资目标', '技能目标', '项目目标', '学习目标', '网络目标']
-    completion = [85, 75, 90, 88, 65]
-    
-    colors_bar = [COLORS['success'] if c >= 80 else COLORS['warning'] if c >= 60 else COLORS['danger'] for c in completion]
-    bars = ax4.barh(goals, completion, color=colors_bar, alpha=0.8)
-    
-    ax4.set_xlabel('完成度 (%)')
-    ax4.set_title('年度目标达成情况')
-    ax4.set_xlim(0, 100)
-    ax4.grid(True, alpha=0.3)
-    
-    # 添加完成度标签
-    for bar, comp in zip(bars, completion):
-        ax4.text(comp + 1, bar.get_y() + bar.get_height()/2,
-                f'{comp}%', va='center', fontweight='bold')
+    draw_goal_completion(ax4, data.goals, data.goal_completion)
     
     # 预警提醒面板
-    ax5 = fig.add_subplot(gs[3, :])
     ax5.axis('off')
-    
-    # 创建预警信息
-    warnings_text = """
-    ⚠️ 预警提醒：
-    • 网络建设进度落后，建议加强行业交流活动参与
-    • 创新成果产出偏低，建议启动专利申请或论文写作计划
-    • 距离年度薪资目标还有15%差距，建议准备晋升材料
-    
-    📈 改进建议：
-    • 参加下月AI技术大会，拓展人脉网络
-    • 启动深度学习框架优化项目，争取技术突破
-    • 准备技术分享，提升个人影响力
-    """
-    
-    ax5.text(0.02, 0.5, warnings_text, transform=ax5.transAxes, fontsize=12,
+    ax5.text(0.02, 0.5, data.warnings_text, transform=ax5.transAxes, fontsize=12,
              verticalalignment='center', bbox=dict(boxstyle="round,pad=0.5", 
              facecolor=COLORS['warning'], alpha=0.1))
-    
-    plt.suptitle('职业发展进度追踪Dashboard', fontsize=20, fontweight='bold')
-    plt.savefig('/workspace/charts/comprehensive_dashboard.png', dpi=300, bbox_inches='tight')
-    plt.close()
 
-def main():
+def create_comprehensive_dashboard(output_dir=CHARTS_DIR, data=SAMPLE_DASHBOARD, profile=None):
+    """创建综合Dashboard概览"""
+    fig, axes = build_dashboard_layout()
+    draw_dashboard(axes, data)
+    save_chart(fig, output_dir, 'comprehensive_dashboard', profile, layout=False)
+    plt.close(fig)
+
+# 图表注册表：名称即输出文件名，保证并行渲染时输出路径确定
+CHARTS = {
+    'overall_progress_radar': create_overall_progress_chart,
+    'skill_progress_analysis': create_skill_progress_chart,
+    'career_milestone_progress': create_career_milestone_chart,
+    'learning_growth_analysis': create_learning_growth_chart,
+    'network_innovation_analysis': create_network_innovation_chart,
+    'comprehensive_dashboard': create_comprehensive_dashboard,
+}
+
+def main(argv=None):
     """生成所有可视化图表"""
+    # 渲染调度、缓存与计时只有命令行入口用到，推迟导入以保持模块导入开销
+    from parallel_render import memory_plan, render_charts, print_report
+    from render_cache import RenderCache, DEFAULT_CACHE_MAX_BYTES, print_cache_report
+    from render_memory import print_memory_plan
+    from render_metrics import export_metrics, print_metrics_report
+
+    parser = argparse.ArgumentParser(description='生成职业发展进度追踪系统的可视化图表')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='并行渲染的工作进程数 (默认使用全部可用核心，1为串行)')
+    parser.add_argument('-o', '--output-dir', default=CHARTS_DIR, help='图表保存目录')
+    parser.add_argument('--charts', nargs='+', choices=list(CHARTS), default=None,
+                        help='只渲染指定的图表 (默认全部)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='增量构建缓存目录，输入和样式未变化的图表直接复用')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_BYTES / 1024 / 1024,
+                        help='缓存容量上限 (MB)，超出时淘汰最久未使用的图表')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='渲染配置：draft 快速预览，web 网页缩略图，publication 出版质量')
+    parser.add_argument('--format', choices=FORMATS, default=None, help='输出格式 (默认PNG)')
+    parser.add_argument('--dpi', type=int, default=None, help='覆盖渲染配置的分辨率')
+    parser.add_argument('--metrics-dir', default=None,
+                        help='采集分阶段渲染耗时，累计写入该目录下的JSON与Prometheus文件')
+    parser.add_argument('--memory-budget-mb', type=float, default=None,
+                        help='渲染总内存预算 (MB)，据此限制并发，超出额度的大图分块渲染')
+    args = parser.parse_args(argv)
+    profile = get_profile(args.profile, args.format, args.dpi)
+
     print("正在生成职业发展进度追踪系统的可视化图表...")
     
-    # 创建图表保存目录
-    import os
-    os.makedirs('/workspace/charts', exist_ok=True)
-    
-    # 生成各类图表
-    create_overall_progress_chart()
-    print("✅ 总体进度雷达图已生成")
-    
-    create_skill_progress_chart()
-    print("✅ 技能进度分析图已生成")
-    
-    create_career_milestone_chart()
-    print("✅ 职业里程碑图已生成")
-    
-    create_learning_growth_chart()
-    print("✅ 学习成长分析图已生成")
-    
-    create_network_innovation_chart()
-    print("✅ 网络建设和创新成果图已生成")
-    
-    create_comprehensive_dashboard()
-    print("✅ 综合Dashboard已生成")
-    
-    print("\n所有可视化图表生成完成！")
-    print("图表保存位置：/workspace/charts/")
+    memory_budget = int(args.memory_budget_mb * 1024 * 1024) if args.memory_budget_mb else None
+    if memory_budget:
+        try:
+            print_memory_plan(memory_plan('progress_visualization', args.charts, args.workers, profile, memory_budget))
+        except ValueError as exc:
+            parser.error(str(exc))
+    results = render_charts('progress_visualization', args.output_dir, args.charts,
+                            workers=args.workers, cache_dir=args.cache_dir, profile=profile,
+                            metrics=args.metrics_dir is not None, memory_budget=memory_budget)
+    failed = print_report(results)
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+        print_cache_report(results, cache, cache.evict())
+    if args.metrics_dir:
+        recorded = [result.metrics for result in results if result.metrics is not None]
+        print_metrics_report(recorded)
+        export_metrics(recorded, args.metrics_dir)
+        print(f"📈 渲染计时已累计写入 {args.metrics_dir}")
+    
+    print("\n所有可视化图表生成完成！" if not failed else "\n部分图表生成失败，请查看上方错误信息")
+    print(f"图表保存位置：{args.output_dir}")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
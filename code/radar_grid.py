@@ -0,0 +1,337 @@
+"""
+雷达图小多图 - 在一张图中并排比较几十上百个岗位/用户的技能雷达
+每个雷达是一个"虚拟极坐标"单元格：所有单元格画在同一个坐标轴里，
+角度、环线、辐条与标签位置只计算一次 (RadarLayout)，各单元格只做平移；
+填充、轮廓、网格与文字分别合并为一个集合绘制，每页的绘制调用次数与雷达数量无关。
+数量超过每页上限时自动分页
+
+(每个雷达单独建一个polar坐标轴时，30个坐标轴的一页约需2.5秒，主要耗在坐标轴与刻度的绘制上)
+
+用法:
+    python radar_grid.py --skills skill_assessments.csv -o /workspace/charts/team
+    python radar_grid.py --synthetic 200                  # 合成团队数据
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+
+import progress_visualization as pv
+from heatmap import draw_value_labels
+from lazy_imports import ensure_loaded
+from render_profiles import PROFILES, DEFAULT_PROFILE, FORMATS, get_profile, save_chart
+from table_loader import iter_rows
+
+DEFAULT_PER_PAGE = 30
+DEFAULT_NCOLS = 6
+# 单元格边长 (英寸) 与单元格间距 (以雷达半径为单位，留出维度标签与标题的位置)
+CELL_INCHES = 2.8
+CELL_PITCH = 3.2
+POINTS_PER_UNIT = CELL_INCHES * 72 / CELL_PITCH
+LABEL_RADIUS = 1.15
+TITLE_OFFSET = 1.45
+# 环线的折线分段数
+RING_SEGMENTS = 72
+
+DIMENSION_LABELS = ('first', 'all', 'none')
+
+
+@dataclass(frozen=True)
+class RadarLayout:
+    """
+    所有单元格共用的雷达几何：以半径1的单位圆表示，绘制时按单元格中心平移
+
+    unit: (维度, 2) 各维度方向的单位向量，角度与polar坐标轴一致 (0度在正右方，逆时针)
+    grid: (线段数, 点数, 2) 环线与辐条
+    """
+    dimensions: tuple
+    rmax: float
+    rticks: tuple
+    unit: np.ndarray
+    grid: np.ndarray
+
+    @property
+    def n_dims(self):
+        return len(self.dimensions)
+
+    def polygons(self, values, centers):
+        """(雷达数, 维度) 数值 -> (雷达数, 维度, 2) 多边形顶点"""
+        radius = np.clip(np.asarray(values, dtype=np.float64), 0, self.rmax) / self.rmax
+        return centers[:, None, :] + radius[:, :, None] * self.unit[None, :, :]
+
+
+def radar_layout(dimensions, rmax=10, rticks=(2, 4, 6, 8, 10)):
+    """计算雷达几何 (每个维度集合只需一次，可在所有页之间复用)"""
+    n = len(dimensions)
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    unit = np.column_stack([np.cos(angles), np.sin(angles)])
+    circle = np.linspace(0, 2 * np.pi, RING_SEGMENTS + 1)
+    circle = np.column_stack([np.cos(circle), np.sin(circle)])
+    rings = [circle * (tick / rmax) for tick in rticks]
+    # 辐条按环线的点数插值，所有线段点数一致，可以整体放进一个数组
+    t = np.linspace(0, 1, RING_SEGMENTS + 1)[:, None]
+    spokes = [t * u for u in unit]
+    return RadarLayout(tuple(dimensions), float(rmax), tuple(rticks), unit, np.stack(rings + spokes))
+
+
+def page_slices(n_items, per_page=DEFAULT_PER_PAGE):
+    """分页：每页的 slice"""
+    per_page = max(1, per_page)
+    return [slice(start, min(start + per_page, n_items)) for start in range(0, n_items, per_page)]
+
+
+def cell_centers(n_cells, ncols):
+    """单元格中心：从左上角开始按行排列"""
+    idx = np.arange(n_cells)
+    return np.column_stack([(idx % ncols) * CELL_PITCH, -(idx // ncols) * CELL_PITCH]).astype(np.float64)
+
+
+@dataclass
+class RadarGridResult:
+    """draw_radar_grid 的绘制结果"""
+    fills: object
+    outlines: object
+    grid: object
+    reference: object = None
+    labels: object = None
+
+
+def draw_radar_grid(ax, layout, values, names, colors='#3498db', ncols=DEFAULT_NCOLS, reference=None,
+                    reference_color='#e74c3c', dimension_labels='first', fontsize=8, title_fontsize=10,
+                    alpha=0.25):
+    """
+    在一个坐标轴中绘制一组雷达图
+
+    Args:
+        layout: radar_layout() 的结果
+        values: (雷达数, 维度) 数值矩阵
+        names: 各雷达的标题
+        colors: 单个颜色或每个雷达一个颜色
+        reference: 可选的参考轮廓，(维度,) 所有雷达共用或 (雷达数, 维度) 各自一条，画为虚线
+        dimension_labels: 'first' 只在第一个雷达旁标注维度名称，'all' 每个都标注，'none' 不标注
+
+    Returns:
+        RadarGridResult
+    """
+    from matplotlib.collections import LineCollection, PolyCollection
+
+    if dimension_labels not in DIMENSION_LABELS:
+        raise ValueError(f"未知维度标签方式: {dimension_labels} (可选 {', '.join(DIMENSION_LABELS)})")
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n, n_dims = values.shape
+    if n_dims != layout.n_dims:
+        raise ValueError(f"数值有 {n_dims} 个维度，雷达布局为 {layout.n_dims} 个维度")
+    ncols = max(1, min(ncols, n))
+    centers = cell_centers(n, ncols)
+    colors = [colors] * n if isinstance(colors, str) else list(colors)
+
+    grid = (centers[:, None, None, :] + layout.grid[None]).reshape(-1, *layout.grid.shape[1:])
+    grid = LineCollection(grid, colors='grey', linewidths=0.5, alpha=0.3, zorder=1)
+    ax.add_collection(grid, autolim=False)
+
+    polygons = layout.polygons(values, centers)
+    fills = PolyCollection(polygons, facecolors=colors, edgecolors='none', alpha=alpha, zorder=2)
+    outlines = LineCollection(np.concatenate([polygons, polygons[:, :1]], axis=1),
+                              colors=colors, linewidths=1.5, zorder=3)
+    ax.add_collection(fills, autolim=False)
+    ax.add_collection(outlines, autolim=False)
+
+    ref = None
+    if reference is not None:
+        reference = np.broadcast_to(np.asarray(reference, dtype=np.float64), values.shape)
+        ref_polygons = layout.polygons(reference, centers)
+        ref = LineCollection(np.concatenate([ref_polygons, ref_polygons[:, :1]], axis=1),
+                             colors=reference_color, linewidths=1.0, linestyles='--', zorder=3)
+        ax.add_collection(ref, autolim=False)
+
+    # 标题与维度名称合并为一个文字路径集合
+    xs = list(centers[:, 0])
+    ys = list(centers[:, 1] + TITLE_OFFSET)
+    texts = [str(name) for name in names]
+    sizes = [title_fontsize] * n
+    if dimension_labels != 'none':
+        labelled = centers[:1] if dimension_labels == 'first' else centers
+        # 标签按文字中心定位：左右两侧的标签再向外移半个字宽，避免压住外环 (中文字宽按1个字号估算)
+        half_width = np.array([len(d) * fontsize / 2 for d in layout.dimensions]) / POINTS_PER_UNIT
+        offsets = LABEL_RADIUS * layout.unit + np.column_stack([layout.unit[:, 0] * half_width,
+                                                                np.zeros(n_dims)])
+        points = (labelled[:, None, :] + offsets[None]).reshape(-1, 2)
+        xs += list(points[:, 0])
+        ys += list(points[:, 1])
+        texts += list(layout.dimensions) * len(labelled)
+        sizes += [fontsize] * (len(labelled) * n_dims)
+    labels = _draw_texts(ax, xs, ys, texts, sizes)
+
+    nrows = -(-n // ncols)
+    margin = CELL_PITCH / 2
+    # 左右两侧留出最外侧维度标签的宽度
+    side = margin if dimension_labels == 'none' else max(margin, LABEL_RADIUS + 2 * half_width.max())
+    ax.set_xlim(-side, (ncols - 1) * CELL_PITCH + side)
+    ax.set_ylim(-(nrows - 1) * CELL_PITCH - margin, margin)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    return RadarGridResult(fills, outlines, grid, ref, labels)
+
+
+def _draw_texts(ax, xs, ys, texts, sizes):
+    """draw_value_labels 一次只接受一种字号：按字号分组，每种字号一个集合"""
+    by_size = defaultdict(list)
+    for i, size in enumerate(sizes):
+        by_size[size].append(i)
+    collections = []
+    for size, idx in by_size.items():
+        weight = 'bold' if size == max(by_size) and len(by_size) > 1 else 'normal'
+        collection = draw_value_labels(ax, [xs[i] for i in idx], [ys[i] for i in idx],
+                                       [texts[i] for i in idx], ['black'] * len(idx), size, weight)
+        # 字宽只是估算，边缘的标签允许画出坐标轴范围
+        collection.set_clip_on(False)
+        collections.append(collection)
+    return collections
+
+
+def radar_figure(n_cells, ncols=DEFAULT_NCOLS, title=None):
+    """
+    一页的figure：按单元格数决定尺寸
+
+    直接创建 Figure 而不经过pyplot，分页渲染时不需要逐页 close
+    """
+    from matplotlib.figure import Figure
+    ncols = max(1, min(ncols, n_cells))
+    nrows = -(-n_cells // ncols)
+    title_inches = 0.6 if title else 0.0
+    fig = Figure(figsize=(ncols * CELL_INCHES, nrows * CELL_INCHES + title_inches))
+    top = 1 - title_inches / fig.get_figheight()
+    ax = fig.add_axes([0, 0, 1, top])
+    if title:
+        fig.suptitle(title, fontsize=16, fontweight='bold', y=1 - title_inches / 2 / fig.get_figheight(),
+                     va='center')
+    return fig, ax
+
+
+def render_radar_pages(values, names, dimensions, output_dir, chart_name, per_page=DEFAULT_PER_PAGE,
+                       ncols=DEFAULT_NCOLS, rmax=10, rticks=(2, 4, 6, 8, 10), reference=None,
+                       colors='#3498db', title=None, profile=None, **kwargs):
+    """
+    把一组雷达按页渲染为多张图
+
+    Args:
+        values: (雷达数, 维度) 数值矩阵
+        names: 各雷达的标题
+        chart_name: 输出文件名前缀，只有一页时不加页码，否则为 <chart_name>_p01 ...
+        reference: 参考轮廓，(维度,) 或 (雷达数, 维度)
+        colors: 单个颜色或每个雷达一个颜色
+        kwargs: 传给 draw_radar_grid 的其余参数
+
+    Returns:
+        输出文件路径列表
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    layout = radar_layout(dimensions, rmax, rticks)
+    if reference is not None:
+        reference = np.broadcast_to(np.asarray(reference, dtype=np.float64), values.shape)
+    colors = [colors] * len(values) if isinstance(colors, str) else list(colors)
+    os.makedirs(output_dir, exist_ok=True)
+    pages = page_slices(len(values), per_page)
+    paths = []
+    for page, rows in enumerate(pages, start=1):
+        page_title = title if title is None or len(pages) == 1 else f'{title} ({page}/{len(pages)})'
+        fig, ax = radar_figure(rows.stop - rows.start, ncols, page_title)
+        draw_radar_grid(ax, layout, values[rows], names[rows], colors[rows], ncols,
+                        None if reference is None else reference[rows], **kwargs)
+        name = chart_name if len(pages) == 1 else f'{chart_name}_p{page:02d}'
+        paths.append(save_chart(fig, output_dir, name, profile, layout=False))
+    return paths
+
+
+# ---- skill_assessments 导出 ----
+
+SKILL_COLUMNS = ['user_id', 'skill_name', 'current_level', 'target_level']
+
+
+def skill_matrix(rows, max_skills=8):
+    """
+    skill_assessments 记录 -> (用户列表, 技能列表, 当前水平矩阵, 目标水平矩阵)
+
+    技能取出现次数最多的 max_skills 个；同一用户同一技能有多条记录时取最后一条，缺失记为0
+    """
+    latest = {}
+    counts = defaultdict(int)
+    for row in rows:
+        user, skill = row.get('user_id'), row.get('skill_name')
+        if not user or not skill:
+            continue
+        if (user, skill) not in latest:
+            counts[skill] += 1
+        latest[user, skill] = (float(row.get('current_level') or 0), float(row.get('target_level') or 0))
+    skills = sorted(counts, key=lambda s: (-counts[s], s))[:max_skills]
+    users = sorted({user for user, _ in latest})
+    user_idx = {u: i for i, u in enumerate(users)}
+    skill_idx = {s: j for j, s in enumerate(skills)}
+    current = np.zeros((len(users), len(skills)))
+    target = np.zeros((len(users), len(skills)))
+    for (user, skill), (cur, tgt) in latest.items():
+        j = skill_idx.get(skill)
+        if j is not None:
+            current[user_idx[user], j] = cur
+            target[user_idx[user], j] = tgt
+    return users, skills, current, target
+
+
+def synthetic_team(n_users, seed=0):
+    """合成团队技能数据 (基准测试与演示用)"""
+    skills = ['编程能力', '数学统计', '硬件知识', '系统设计', '机器学习', '云平台', '团队协作', '领导力']
+    rng = np.random.default_rng(seed)
+    current = np.clip(rng.normal(6, 1.8, (n_users, len(skills))), 1, 10).round(1)
+    target = np.clip(current + rng.uniform(0, 3, current.shape), 1, 10).round(1)
+    users = [f'工程师{i + 1:03d}' for i in range(n_users)]
+    return users, skills, current, target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='团队技能雷达小多图')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--skills', help='skill_assessments 导出 (CSV/JSONL)')
+    source.add_argument('--synthetic', type=int, metavar='N', help='使用N个合成用户')
+    parser.add_argument('-o', '--output-dir', default=os.path.join(pv.CHARTS_DIR, 'team'), help='输出目录')
+    parser.add_argument('--per-page', type=int, default=DEFAULT_PER_PAGE, help='每页雷达数')
+    parser.add_argument('--ncols', type=int, default=DEFAULT_NCOLS, help='每行雷达数')
+    parser.add_argument('--max-skills', type=int, default=8, help='最多显示的技能维度数')
+    parser.add_argument('--labels', choices=DIMENSION_LABELS, default='first', help='维度名称标注方式')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='渲染配置：draft 快速预览，web 网页缩略图，publication 出版质量')
+    parser.add_argument('--format', choices=FORMATS, default=None, help='输出格式 (默认PNG)')
+    parser.add_argument('--dpi', type=int, default=None, help='覆盖渲染配置的分辨率')
+    args = parser.parse_args(argv)
+    profile = get_profile(args.profile, args.format, args.dpi)
+
+    if args.synthetic:
+        users, skills, current, target = synthetic_team(args.synthetic)
+    else:
+        users, skills, current, target = skill_matrix(
+            iter_rows(args.skills, 'skill_assessments', columns=SKILL_COLUMNS), args.max_skills)
+    if not users or len(skills) < 3:
+        print("⚠️ 技能数据不足 (至少需要3个技能维度)")
+        return 1
+
+    # 中文字体等绘图样式由图表模块的matplotlib初始化统一设置
+    ensure_loaded(pv.plt)
+
+    print(f"📊 {len(users)} 个用户 × {len(skills)} 个技能，每页 {args.per_page} 个")
+    start = time.perf_counter()
+    paths = render_radar_pages(current, users, skills, args.output_dir, 'team_skills_radar',
+                               per_page=args.per_page, ncols=args.ncols, reference=target,
+                               title='团队技能雷达 (实线: 当前水平，虚线: 目标水平)', profile=profile,
+                               dimension_labels=args.labels)
+    elapsed = time.perf_counter() - start
+    print(f"✅ 共 {len(paths)} 页，耗时 {elapsed:.2f}s ({elapsed / len(paths):.2f}s/页)")
+    print(f"📁 保存位置：{args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
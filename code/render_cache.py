@@ -0,0 +1,387 @@
+"""
+图表渲染缓存 - 按内容寻址的增量构建
+缓存键由图表输入数据、样式配置 (rcParams、COLORS、调色板) 和输出选项共同决定，
+键相同的图表直接复用已有产物，不再重新渲染。
+图表在运行时读取的 extract/ 文件由所在模块的 EXTRACT_FILES 声明，键包含这些文件的内容哈希
+
+用法:
+    python render_cache.py --check-keys    # 校验修改薪资数据或调研文件后相关图表的缓存键随之变化
+"""
+
+import os
+import re
+import dis
+import sys
+import types
+import shutil
+import hashlib
+import argparse
+import tempfile
+import contextlib
+import importlib
+import importlib.util
+import dataclasses
+
+from extract_snapshot import EXTRACT_DIR, source_digests
+from lazy_imports import ensure_loaded
+
+# 默认缓存容量上限 (字节)
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# 缓存条目的扩展名 (见 render_profiles.FORMATS)，写入中的临时文件不计入
+CACHE_EXTENSIONS = ('.png', '.svg', '.pdf')
+
+_ADDRESS_RE = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def _hash_value(value, h):
+    """
+    哈希数据常量；集合的repr顺序受字符串哈希随机化影响，排序后保证跨进程稳定，
+    容器中函数等对象的repr带有内存地址，去掉地址部分
+    """
+    if isinstance(value, (set, frozenset)):
+        value = sorted(value, key=repr)
+    h.update(_ADDRESS_RE.sub('', repr(value)).encode())
+
+
+def _is_data(value):
+    return dataclasses.is_dataclass(value) or isinstance(
+        value, (bool, int, float, str, bytes, list, tuple, dict, set, frozenset, type(None)))
+
+
+_CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _is_local(module):
+    path = getattr(module, '__file__', None)
+    return bool(path) and os.path.dirname(os.path.abspath(path)) == _CODE_DIR
+
+
+def _local_namespace(func):
+    """函数定义在本目录的模块中 (如 heatmap、salary_store) 时返回该模块的命名空间"""
+    module = sys.modules.get(func.__module__)
+    return vars(module) if _is_local(module) else None
+
+
+def _local_module(name):
+    """本目录下的模块 (尚未导入时导入)；第三方与标准库模块返回 None，也不会因此被导入"""
+    module = sys.modules.get(name)
+    if module is None:
+        if '.' in name:
+            return None
+        spec = importlib.util.find_spec(name)
+        if spec is None or not spec.origin or os.path.dirname(os.path.abspath(spec.origin)) != _CODE_DIR:
+            return None
+        module = importlib.import_module(name)
+    return module if _is_local(module) else None
+
+
+def _local_imports(code):
+    """
+    函数体内导入的本目录模块：[(模块, 导入的名称)]
+
+    from m import a, b 对应 IMPORT_NAME m 后接若干 IMPORT_FROM；
+    import m 没有 IMPORT_FROM，名称为 None，之后按属性名在模块中查找
+    """
+    imports = []
+    for instruction in dis.get_instructions(code):
+        if instruction.opname == 'IMPORT_NAME':
+            imports.append([instruction.argval, []])
+        elif instruction.opname == 'IMPORT_FROM' and imports:
+            imports[-1][1].append(instruction.argval)
+    resolved = []
+    for name, names in imports:
+        module = _local_module(name)
+        if module is not None:
+            resolved.extend((module, n) for n in (names or [None]))
+    return resolved
+
+
+def _hash_name(name, h, namespace, seen):
+    """哈希名称在命名空间中引用的本目录函数或模块级数据"""
+    key = (namespace.get('__name__'), name)
+    if key in seen or name not in namespace:
+        return
+    seen.add(key)
+    value = namespace[name]
+    # functools.lru_cache 等包装器按被包装的函数哈希
+    value = getattr(value, '__wrapped__', value)
+    if isinstance(value, types.FunctionType):
+        func_namespace = _local_namespace(value)
+        if func_namespace is not None:
+            _hash_function(value, h, func_namespace, seen)
+    elif _is_data(value) and name.lstrip('_').isupper():
+        # 模块级数据按常量命名识别；小写的模块级字典等是进程内缓存或运行状态
+        # (如 extract_snapshot._opened)，内容随运行过程变化，计入会让键在渲染前后不一致
+        _hash_value(value, h)
+
+
+def _hash_code(code, h, namespace, seen):
+    """
+    递归哈希函数字节码与常量，图表内联的数据列表都在常量中；
+    同时跟随引用的本目录模块中的函数 (如绘制辅助函数、薪资数据查询) 和模块级数据 (如示例数据)。
+    函数体内的局部导入 (为保持模块导入开销推迟到绘图时) 不在模块命名空间中，按字节码中的导入目标解析
+    """
+    # (模块名, None) 标记哈希过其中函数的模块，chart_key 据此收集要读取的调研文件
+    seen.add((namespace.get('__name__'), None))
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, h, namespace, seen)
+        else:
+            _hash_value(const, h)
+    for name in code.co_names:
+        _hash_name(name, h, namespace, seen)
+    for module, name in _local_imports(code):
+        if name is not None:
+            _hash_name(name, h, vars(module), seen)
+        else:
+            for attribute in code.co_names:
+                _hash_name(attribute, h, vars(module), seen)
+
+
+def _hash_function(func, h, namespace, seen):
+    _hash_code(func.__code__, h, namespace, seen)
+    _hash_value(func.__defaults__, h)
+    _hash_value(func.__kwdefaults__, h)
+
+
+def style_fingerprint(module):
+    """当前进程的样式指纹：rcParams、seaborn调色板和模块颜色主题"""
+    ensure_loaded(module.plt)
+    import matplotlib
+    h = hashlib.sha256()
+    h.update(matplotlib.__version__.encode())
+    for key in sorted(matplotlib.rcParams):
+        h.update(f'{key}={matplotlib.rcParams[key]!r};'.encode())
+    h.update(repr(module.sns.color_palette().as_hex()).encode())
+    h.update(repr(sorted(getattr(module, 'COLORS', {}).items())).encode())
+    return h.hexdigest()
+
+
+def _extract_files(seen):
+    """哈希过程中经过的模块所声明的调研文件"""
+    files = set()
+    for module_name, name in seen:
+        if name is None:
+            files.update(getattr(sys.modules.get(module_name), 'EXTRACT_FILES', ()))
+    return sorted(files)
+
+
+def chart_key(module, chart_name, options=None, extract_dir=EXTRACT_DIR):
+    """
+    计算图表的内容地址
+
+    Args:
+        module: 图表模块 (提供 CHARTS 注册表)
+        chart_name: 图表名称
+        options: 影响输出的额外参数 (如数据覆盖、渲染配置)，不含输出目录
+        extract_dir: 调研数据目录，图表读取的文件按内容哈希计入键
+    """
+    h = hashlib.sha256()
+    h.update(f'{sys.version_info[:2]}:{chart_name}'.encode())
+    func = module.CHARTS[chart_name]
+    seen = {(module.__name__, func.__name__)}
+    _hash_function(func, h, vars(module), seen)
+    files = _extract_files(seen)
+    if files:
+        h.update(repr(sorted(source_digests(files, extract_dir).items())).encode())
+    h.update(repr(sorted((options or {}).items())).encode())
+    h.update(style_fingerprint(module).encode())
+    return h.hexdigest()
+
+
+class RenderCache:
+    """
+    基于文件的图表产物缓存，按最近使用时间淘汰
+
+    每个缓存条目是 <cache_dir>/<key>.<扩展名>，命中时复制到目标路径并刷新修改时间，
+    淘汰时优先删除最久未使用的条目，直到总大小不超过上限
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key, output_path):
+        # 扩展名与产物一致 (PNG/SVG/PDF)，不同格式的键本身也不同
+        return os.path.join(self.cache_dir, key + os.path.splitext(output_path)[1])
+
+    def fetch(self, key, output_path):
+        """命中时把缓存产物写到 output_path 并返回 True"""
+        entry = self._entry_path(key, output_path)
+        try:
+            # 复制而非硬链接：savefig会原地截断目标文件，硬链接会破坏缓存条目
+            shutil.copyfile(entry, output_path)
+            os.utime(entry)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key, output_path):
+        """把刚渲染的产物原子地写入缓存"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(output_path, tmp_path)
+            os.replace(tmp_path, self._entry_path(key, output_path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def entries(self):
+        """返回 [(修改时间, 大小, 路径), ...]，并发删除的条目会被跳过"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_EXTENSIONS):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """淘汰最久未使用的条目直到不超过容量上限，返回淘汰数量"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        return evicted
+
+
+def print_cache_report(results, cache, evicted):
+    """打印缓存命中情况"""
+    hits = sum(1 for result in results if result.cache_hit)
+    misses = sum(1 for result in results if result.ok and not result.cache_hit)
+    total = hits + misses
+    rate = hits / total * 100 if total else 0.0
+    print(f"🗂️ 渲染缓存：命中 {hits} 个，未命中 {misses} 个 (命中率 {rate:.0f}%)，"
+          f"淘汰 {evicted} 个，占用 {cache.total_bytes() / 1024 / 1024:.1f}MB"
+          f" / {cache.max_bytes / 1024 / 1024:.0f}MB")
+
+
+# --check-keys 的校验项：(模块, 数据名, {图表模块: 该数据变化后缓存键必须随之变化的图表})
+_SALARY_CHARTS = {'aics_mle_analysis': ('salary_comparison', 'top_companies_salary_heatmap', 'career_path_timeline')}
+KEY_CHECKS = [
+    ('salary_store', 'CURATED_MARKET', _SALARY_CHARTS),
+    ('salary_store', 'CURATED_COMPANIES', _SALARY_CHARTS),
+]
+# 调研文件的校验项：(文件名, {图表模块: 该文件变化后缓存键必须随之变化的图表})
+FILE_CHECKS = [
+    ('openai_salary_data.json', _SALARY_CHARTS),
+    ('nvidia_salary_data.json', _SALARY_CHARTS),
+    ('ai_expert_salary_report.json', _SALARY_CHARTS),
+    ('ai_chip_market_analysis.json', {'aics_mle_analysis': ('investment_trends',)}),
+]
+
+
+def _bumped(value):
+    """数据的副本，其中第一个数值加1；找不到数值时返回 None"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value + 1
+    if isinstance(value, dict):
+        items = list(value.items())
+        for i, (key, child) in enumerate(items):
+            changed = _bumped(child)
+            if changed is not None:
+                items[i] = (key, changed)
+                return dict(items)
+    elif isinstance(value, (list, tuple)):
+        for i, child in enumerate(value):
+            changed = _bumped(child)
+            if changed is not None:
+                return type(value)([*value[:i], changed, *value[i + 1:]])
+    return None
+
+
+@contextlib.contextmanager
+def _patched(module, name, value):
+    original = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+def chart_keys(module_names, extract_dir=EXTRACT_DIR):
+    """{(模块, 图表): 缓存键}"""
+    keys = {}
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for chart_name in module.CHARTS:
+            keys[module_name, chart_name] = chart_key(module, chart_name, extract_dir=extract_dir)
+    return keys
+
+
+def _compare(label, baseline, keys, expected):
+    changed = sorted(chart for chart, key in keys.items() if key != baseline[chart])
+    print(f"🔑 修改 {label}：{len(changed)} 个图表的键变化 "
+          f"({', '.join(chart for _, chart in changed) or '无'})")
+    return [(label, name, chart) for name, charts in expected.items()
+            for chart in charts if (name, chart) not in changed]
+
+
+def check_keys(checks=KEY_CHECKS, file_checks=FILE_CHECKS):
+    """
+    逐项修改数据后重新计算缓存键，确认依赖该数据的图表全部失效；
+    调研文件在 extract/ 的临时副本中修改，不改动原文件
+
+    Returns:
+        未失效的 (数据, 模块, 图表) 列表，全部通过时为空
+    """
+    module_names = sorted({name for _, _, expected in checks for name in expected} |
+                          {name for _, expected in file_checks for name in expected})
+    baseline = chart_keys(module_names)
+    failures = []
+    for data_module, data_name, expected in checks:
+        module = importlib.import_module(data_module)
+        with _patched(module, data_name, _bumped(getattr(module, data_name))):
+            keys = chart_keys(module_names)
+        failures.extend(_compare(f'{data_module}.{data_name}', baseline, keys, expected))
+    for name, expected in file_checks:
+        with tempfile.TemporaryDirectory() as extract_dir:
+            for source in os.listdir(EXTRACT_DIR):
+                if source.endswith('.json'):
+                    shutil.copy2(os.path.join(EXTRACT_DIR, source), extract_dir)
+            with open(os.path.join(extract_dir, name), 'a', encoding='utf-8') as f:
+                f.write('\n')
+            keys = chart_keys(module_names, extract_dir)
+        failures.extend(_compare(f'extract/{name}', baseline, keys, expected))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='图表渲染缓存工具')
+    parser.add_argument('--check-keys', action='store_true', help='校验修改图表数据后缓存键随之变化')
+    args = parser.parse_args(argv)
+
+    if not args.check_keys:
+        parser.print_help()
+        return 0
+    failures = check_keys()
+    for label, module_name, chart_name in failures:
+        print(f"❌ 修改 {label} 后 {module_name}.{chart_name} 的缓存键未变化，缓存会返回过期图表")
+    if not failures:
+        print("✅ 缓存键覆盖了全部校验的数据")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
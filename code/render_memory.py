@@ -0,0 +1,384 @@
+"""
+内存受限渲染 - 按图表尺寸与分辨率估算渲染峰值内存，在给定预算内安排并发与分块
+出版质量 (300dpi) 的 20×16 英寸综合Dashboard仅RGBA缓冲区就约115MB，紧凑布局还会再按输出分辨率
+完整绘制一次，峰值约为缓冲区的两倍；多个工作进程同时渲染大图时容易被OOM终止。
+
+    估算   峰值 ≈ 每个工作进程的基础占用 + 栅格像素数 × 4字节 × 峰值倍数 (PNG_PEAK_FACTOR)
+    并发   按预算确定工作进程数，每个进程分到相同的栅格内存额度；预算连一个工作进程都容纳不下时报错
+    分块   估算超出额度的PNG图表按水平条带逐条栅格化，每条立即滤波压缩写入输出文件，
+           峰值只与条带高度有关，与整图大小无关；输出尺寸与整图渲染相同，
+           跨越多个条带的大面积填充在抗锯齿边缘上可能有细微差异
+
+用法:
+    python progress_visualization.py --memory-budget-mb 1024 -j 4
+    python render_memory.py --bench --max-raster-mb 32   # 对比整图与分块渲染的峰值RSS与像素差异
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+import resource
+import tempfile
+import importlib
+import subprocess
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from render_metrics import recorded_save
+
+mpl = lazy_import('matplotlib')
+mtransforms = lazy_import('matplotlib.transforms')
+backend_agg = lazy_import('matplotlib.backends.backend_agg')
+
+# 图表模块未在 FIGURE_SIZES 中登记尺寸时按此估算 (英寸)
+DEFAULT_FIGSIZE = (16, 12)
+# 工作进程导入 matplotlib/seaborn 并完成样式初始化后的常驻内存 (实测约105MB，留出余量)
+BASE_WORKER_BYTES = 128 * 1024 * 1024
+# 整图渲染峰值 / 整幅画布栅格大小：紧凑布局的预绘制缓冲区与正式绘制的缓冲区同时存在 (实测2.0~2.2)
+PNG_PEAK_FACTOR = 2.2
+# 分块渲染每条带的峰值 / 条带栅格大小：Agg缓冲区、raw输出副本、滤波后的行数据
+STRIP_PEAK_FACTOR = 3.5
+# SVG/PDF 输出与紧凑布局计算时 figure 自身分辨率下的栅格
+PROBE_DPI = 100
+MIN_STRIP_ROWS = 16
+# 条带上下额外渲染的重叠行数
+STRIP_OVERLAP = 8
+# 低于该额度的分块条带过窄，重绘次数过多，改为减少并发
+MIN_RASTER_BYTES = 16 * 1024 * 1024
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_IDAT_BYTES = 1 << 20
+
+
+def raster_size(figsize, dpi):
+    """figure 在该分辨率下的栅格像素尺寸 (宽, 高)"""
+    return int(figsize[0] * dpi), int(figsize[1] * dpi)
+
+
+def output_dpi(figsize, profile):
+    """与 render_profiles.savefig_kwargs 一致：max_width 限制宽度时按比例降低分辨率"""
+    dpi = profile.dpi
+    if profile.max_width:
+        dpi = min(dpi, profile.max_width / figsize[0])
+    return dpi
+
+
+def probe_bytes(figsize):
+    """紧凑布局计算时 figure 自身分辨率下的探测栅格大小"""
+    width, height = raster_size(figsize, PROBE_DPI)
+    return width * height * 4
+
+
+def estimate_raster_bytes(figsize, profile):
+    """
+    单个图表渲染时栅格相关的峰值内存估算 (不含工作进程基础占用)
+
+    SVG/PDF 输出不生成整图栅格，只计紧凑布局时的探测栅格；
+    设置了 max_raster_bytes 的PNG配置以分块额度 (另加探测栅格) 为上限
+    """
+    probe = probe_bytes(figsize)
+    if profile.fmt != 'png':
+        return probe
+    width, height = raster_size(figsize, output_dpi(figsize, profile))
+    full = width * height * 4 * PNG_PEAK_FACTOR
+    if profile.max_raster_bytes and full > profile.max_raster_bytes:
+        return profile.max_raster_bytes + probe
+    return full
+
+
+def needs_tiling(figsize, profile):
+    """该配置是否要求分块渲染：PNG输出且整图渲染的估算峰值超出 max_raster_bytes"""
+    if profile.fmt != 'png' or not profile.max_raster_bytes:
+        return False
+    return estimate_raster_bytes(figsize, replace(profile, max_raster_bytes=None)) > profile.max_raster_bytes
+
+
+def chart_figsize(module, chart_name):
+    """图表模块在 FIGURE_SIZES 中登记的 figure 尺寸 (英寸)"""
+    return getattr(module, 'FIGURE_SIZES', {}).get(chart_name, DEFAULT_FIGSIZE)
+
+
+@dataclass
+class MemoryPlan:
+    """内存预算下的渲染安排"""
+    budget: int
+    workers: int
+    max_raster_bytes: int
+    estimates: dict = field(default_factory=dict)     # 图表 -> 整图渲染栅格峰值估算
+    planned: dict = field(default_factory=dict)       # 图表 -> 按此安排 (含分块) 的栅格峰值估算
+
+    @property
+    def tiled(self):
+        """需要分块渲染的图表"""
+        return [name for name, estimate in self.estimates.items() if estimate > self.max_raster_bytes]
+
+    @property
+    def peak_bytes(self):
+        """按此安排的峰值内存估算：各进程同时渲染栅格峰值最大的几个图表"""
+        largest = sorted(self.planned.values(), reverse=True)
+        return self.workers * BASE_WORKER_BYTES + sum(largest[:self.workers])
+
+
+def plan_memory(module, chart_names, profile, budget, workers):
+    """
+    在 budget 字节内安排并发：取不超过期望值、且每个进程的栅格额度都够用的最大工作进程数，
+    剩余内存平分给各进程；放不下最大图表时该图表分块渲染，额度扣除探测栅格后不得低于 MIN_RASTER_BYTES
+
+    Args:
+        workers: 期望的工作进程数 (已按CPU与图表数确定)
+
+    Raises:
+        ValueError: 预算连一个工作进程 (基础占用 + 最小栅格额度) 都容纳不下
+    """
+    figsizes = {name: chart_figsize(module, name) for name in chart_names}
+    estimates = {name: estimate_raster_bytes(figsize, profile) for name, figsize in figsizes.items()}
+    largest = max(estimates.values(), default=0)
+    probe = max((probe_bytes(figsize) for figsize in figsizes.values()), default=0)
+    for n in range(max(1, workers), 0, -1):
+        share = (budget - n * BASE_WORKER_BYTES) // n
+        if largest <= share:
+            max_raster = share
+            break
+        if profile.fmt == 'png' and share - probe >= MIN_RASTER_BYTES:
+            max_raster = share - probe
+            break
+    else:
+        mb = 1024 * 1024
+        required = BASE_WORKER_BYTES + min(largest, MIN_RASTER_BYTES + probe)
+        raise ValueError(f"内存预算 {budget / mb:.0f}MB 不足以运行一个工作进程，至少需要 {required / mb:.0f}MB "
+                         f"(基础占用 {BASE_WORKER_BYTES / mb:.0f}MB + 栅格 {(required - BASE_WORKER_BYTES) / mb:.0f}MB)")
+    planned = {name: estimate_raster_bytes(figsizes[name], replace(profile, max_raster_bytes=max_raster))
+               for name in chart_names}
+    return MemoryPlan(budget, n, max_raster, estimates, planned)
+
+
+def print_memory_plan(plan):
+    mb = 1024 * 1024
+    tiled = plan.tiled
+    print(f"🧮 内存预算 {plan.budget / mb:.0f}MB：{plan.workers} 个工作进程，每个栅格额度 "
+          f"{plan.max_raster_bytes / mb:.0f}MB，预计峰值 {plan.peak_bytes / mb:.0f}MB"
+          + (f"，分块渲染 {', '.join(tiled)}" if tiled else ''))
+
+
+# ---- 分块PNG输出 ----
+
+def _chunk(f, tag, data):
+    f.write(struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+
+def strip_rows(width, max_raster_bytes):
+    """在额度内每条带的像素行数"""
+    return max(MIN_STRIP_ROWS, int(max_raster_bytes / (width * 4 * STRIP_PEAK_FACTOR)))
+
+
+def save_png_tiled(fig, output_path, dpi, max_raster_bytes, tight=True, compress_level=6):
+    """
+    按水平条带栅格化 figure 并流式编码为PNG
+
+    每条带用 savefig(bbox_inches=条带区域) 只分配条带大小的缓冲区，逐行做Up滤波后送入同一个
+    zlib 压缩流写成 IDAT 块；紧凑边界用 1×1 像素的渲染器计算，不按输出分辨率预绘制整图。
+    布局引擎 (tight_layout 留下的占位引擎) 在首条带前执行一次后移除，避免 savefig 再做整图预绘制
+
+    开启渲染计时 (render_metrics) 时整个过程记为一次 savefig：artist 只计一次，
+    条带栅格化计入 rasterize，其余 (含逐行滤波与 zlib 压缩) 计入 encode，写出字节数取最终文件大小
+
+    Returns:
+        条带数
+    """
+    with recorded_save(fig, output_path):
+        return _write_strips(fig, output_path, dpi, max_raster_bytes, tight, compress_level)
+
+
+def _write_strips(fig, output_path, dpi, max_raster_bytes, tight, compress_level):
+    engine = fig.get_layout_engine()
+    if engine is not None:
+        engine.execute(fig)
+        fig.set_layout_engine(None)
+    if tight:
+        # 在输出分辨率下计算紧凑边界 (文字尺寸随分辨率取整)，渲染器只分配 1×1 像素
+        original_dpi = fig.dpi
+        fig.dpi = dpi
+        try:
+            renderer = backend_agg.RendererAgg(1, 1, dpi)
+            fig.draw(renderer)
+            bbox = fig.get_tightbbox(renderer).padded(mpl.rcParams['savefig.pad_inches'])
+        finally:
+            fig.dpi = original_dpi
+    else:
+        bbox = mtransforms.Bbox.from_bounds(0, 0, fig.get_figwidth(), fig.get_figheight())
+    # 宽高按 savefig 的变换计算时可能是 4770.9999… 这样的值，与 int() 截断差1像素：
+    # 高度加微小容差取整，宽度以首条带实际栅格为准
+    height = int(bbox.height * dpi + 1e-6)
+    rows = strip_rows(bbox.width * dpi, max_raster_bytes)
+
+    def render_strip(top):
+        count = min(rows, height - top)
+        # 上下各多渲染 STRIP_OVERLAP 行再裁掉，避免线条在缓冲区边缘被裁剪后抗锯齿与整图不同
+        above = min(STRIP_OVERLAP, top)
+        below = min(STRIP_OVERLAP, height - top - count)
+        total = above + count + below
+        # 条带底边距紧凑边界底边 (height - top - count - below) 像素；高度多取半像素，
+        # 栅格尺寸向下取整后恰为 total 行，且与整图渲染的像素行对齐
+        strip = mtransforms.Bbox.from_bounds(bbox.x0, bbox.y0 + (height - top - count - below) / dpi,
+                                             bbox.width, (total + 0.5) / dpi)
+        raw = _render_raw(fig, dpi, strip)
+        return np.frombuffer(raw, dtype=np.uint8).reshape(total, -1)[above:above + count]
+
+    pixels = render_strip(0)
+    width = pixels.shape[1] // 4
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    strips = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PNG_SIGNATURE)
+            # 8位 RGBA，与 matplotlib 的PNG输出一致
+            _chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            ppm = round(dpi / 0.0254)
+            _chunk(f, b'pHYs', struct.pack('>IIB', ppm, ppm, 1))
+            compressor = zlib.compressobj(compress_level)
+            previous = np.zeros(width * 4, dtype=np.uint8)
+            pending = []
+            for top in range(0, height, rows):
+                if pixels is None:
+                    pixels = render_strip(top)
+                count = pixels.shape[0]
+                filtered = np.empty((count, width * 4 + 1), dtype=np.uint8)
+                filtered[:, 0] = 2                                  # Up 滤波
+                np.subtract(pixels[0], previous, out=filtered[0, 1:])
+                np.subtract(pixels[1:], pixels[:-1], out=filtered[1:, 1:])
+                previous = pixels[-1].copy()
+                pixels = None
+                pending.append(compressor.compress(filtered))
+                del filtered
+                if sum(map(len, pending)) >= _IDAT_BYTES:
+                    _chunk(f, b'IDAT', b''.join(pending))
+                    pending = []
+                strips += 1
+            pending.append(compressor.flush())
+            _chunk(f, b'IDAT', b''.join(pending))
+            _chunk(f, b'IEND', b'')
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return strips
+
+
+def _render_raw(fig, dpi, bbox):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='raw', dpi=dpi, bbox_inches=bbox)
+    return buffer.getbuffer()
+
+
+# ---- 基准 ----
+
+def _rss_bytes():
+    # Linux 上 ru_maxrss 单位为KB，macOS 为字节
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _measure(module_name, chart_name, output_dir, profile_name, max_raster_mb):
+    """在子进程中执行：渲染一张图表，输出峰值RSS与耗时 (JSON)"""
+    import warnings
+    import logging
+    from lazy_imports import ensure_loaded
+    from render_profiles import get_profile
+    module = importlib.import_module(module_name)
+    ensure_loaded(module.plt)
+    warnings.simplefilter('ignore')
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    profile = get_profile(profile_name)
+    if max_raster_mb:
+        profile = replace(profile, max_raster_bytes=int(max_raster_mb * 1024 * 1024))
+    base = _rss_bytes()
+    started = time.perf_counter()
+    module.CHARTS[chart_name](output_dir=output_dir, profile=profile)
+    print(json.dumps({'base': base, 'peak': _rss_bytes(), 'seconds': time.perf_counter() - started}))
+
+
+def _run_measure(module_name, chart_name, output_dir, profile_name, max_raster_mb=None):
+    command = [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--measure',
+               module_name, chart_name, output_dir, profile_name, str(max_raster_mb or 0)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_bench(module_name, chart_name, profile_name, max_raster_mb):
+    from render_profiles import get_profile
+    module = importlib.import_module(module_name)
+    profile = get_profile(profile_name)
+    figsize = chart_figsize(module, chart_name)
+    width, height = raster_size(figsize, output_dpi(figsize, profile))
+    mb = 1024 * 1024
+    print(f"🖼️ {chart_name}：{figsize[0]}×{figsize[1]} 英寸 @ {profile.dpi}dpi = {width}×{height} 像素，"
+          f"RGBA缓冲区 {width * height * 4 / mb:.0f}MB")
+    with tempfile.TemporaryDirectory() as full_dir, tempfile.TemporaryDirectory() as tiled_dir:
+        full = _run_measure(module_name, chart_name, full_dir, profile_name)
+        tiled = _run_measure(module_name, chart_name, tiled_dir, profile_name, max_raster_mb)
+        tiled_profile = replace(profile, max_raster_bytes=int(max_raster_mb * mb))
+        for label, result, estimate in (
+                ('整图渲染', full, estimate_raster_bytes(figsize, profile)),
+                (f'分块渲染 (额度 {max_raster_mb:g}MB)', tiled, estimate_raster_bytes(figsize, tiled_profile))):
+            print(f"   {label:<20} 峰值RSS {result['peak'] / mb:6.0f}MB (基础 {result['base'] / mb:.0f}MB，"
+                  f"增量 {(result['peak'] - result['base']) / mb:5.0f}MB，估算 {estimate / mb:5.0f}MB)  "
+                  f"{result['seconds']:.2f}s")
+        plt = lazy_import('matplotlib.pyplot')
+        name = os.path.basename(chart_name) + profile.extension
+        a = plt.imread(os.path.join(full_dir, name))
+        b = plt.imread(os.path.join(tiled_dir, name))
+        summary = f"   输出 {a.shape[1]}×{a.shape[0]} / {b.shape[1]}×{b.shape[0]}，"
+        if a.shape != b.shape:
+            print(summary + '尺寸不同')
+        else:
+            diff = np.abs(a - b).max(axis=-1)
+            changed = int(np.count_nonzero(diff))
+            print(summary + ('逐像素一致' if not changed else
+                             f"{changed} 个像素不同 ({changed / diff.size:.3%})，最大差 {diff.max():.3f}"))
+    return 0
+
+
+def main(argv=None):
+    if argv is None and len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        _measure(*sys.argv[2:6], float(sys.argv[6]))
+        return 0
+    parser = argparse.ArgumentParser(description='内存受限渲染：峰值内存估算与分块渲染基准')
+    parser.add_argument('--bench', action='store_true', help='在子进程中对比整图与分块渲染的峰值RSS')
+    parser.add_argument('--module', default='progress_visualization', help='图表模块')
+    parser.add_argument('--chart', default='comprehensive_dashboard', help='图表名称')
+    parser.add_argument('--profile', default='publication', help='渲染配置')
+    parser.add_argument('--max-raster-mb', type=float, default=32, help='分块渲染的栅格额度 (MB)')
+    parser.add_argument('--budget-mb', type=float, help='打印该内存预算下全部图表的渲染安排')
+    parser.add_argument('-j', '--workers', type=int, default=4, help='--budget-mb 时期望的工作进程数')
+    args = parser.parse_args(argv)
+    if args.budget_mb:
+        from render_profiles import get_profile
+        module = importlib.import_module(args.module)
+        try:
+            plan = plan_memory(module, list(module.CHARTS), get_profile(args.profile),
+                               int(args.budget_mb * 1024 * 1024), args.workers)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print_memory_plan(plan)
+        for name, estimate in plan.estimates.items():
+            planned = plan.planned[name]
+            print(f"   {name:<32} {estimate / 1024 / 1024:7.0f}MB"
+                  + (f"  分块 → {planned / 1024 / 1024:.0f}MB" if name in plan.tiled else ''))
+    if args.bench:
+        return run_bench(args.module, args.chart, args.profile, args.max_raster_mb)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+渲染分阶段计时 - 可选的图表渲染性能采集
+开启后在matplotlib的关键调用处计时，把一次图表渲染拆分为：
+
+    data_prep    创建第一个figure之前的数据准备
+    artists      创建坐标轴、柱/线/文字等artist
+    tight_layout 紧凑布局计算
+    text_layout  文字排版与字体查找 (含中文字体回退列表的逐个匹配)
+    rasterize    Agg栅格化
+    encode       输出编码与写文件 (PNG编码；SVG/PDF的绘制也计入此项)
+
+各阶段按"独占时间"统计，嵌套调用只计入最内层阶段，各阶段之和等于总耗时。
+多次运行的结果可累加合并，并导出为JSON和Prometheus文本格式 (textfile collector)
+"""
+
+import os
+import json
+import time
+import tempfile
+import functools
+import contextlib
+from dataclasses import dataclass, field
+
+PHASES = ('data_prep', 'artists', 'tight_layout', 'text_layout', 'rasterize', 'encode')
+
+# 渲染总耗时直方图的桶边界 (秒)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRICS_JSON = 'render_metrics.json'
+METRICS_PROM = 'render_metrics.prom'
+
+
+@dataclass
+class RenderMetrics:
+    """单次图表渲染的计时结果"""
+    module: str
+    chart: str
+    total: float = 0.0
+    phases: dict = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    figures: int = 0
+    artists: int = 0
+    bytes_written: int = 0
+
+
+class _PhaseTimer:
+    """阶段栈：进入嵌套阶段时暂停外层阶段的计时"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._stack = []
+        self.saving = 0         # >0 时处于 recorded_save 内，内部的 savefig 不再单独计数
+
+    def push(self, phase):
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.metrics.phases[outer[0]] += now - outer[1]
+        self._stack.append([phase, now])
+
+    def pop(self):
+        now = time.perf_counter()
+        phase, started = self._stack.pop()
+        self.metrics.phases[phase] += now - started
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def figure_created(self):
+        """第一个figure创建时，最外层阶段从数据准备切换为artist创建"""
+        self.metrics.figures += 1
+        if len(self._stack) == 1 and self._stack[0][0] == 'data_prep':
+            self.pop()
+            self.push('artists')
+
+
+# 当前进程中正在采集的计时器；为 None 时所有钩子直接调用原函数
+_active = None
+_installed = False
+
+
+def _timed(phase, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timer = _active
+        if timer is None:
+            return func(*args, **kwargs)
+        timer.push(phase)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.pop()
+    return wrapper
+
+
+def _figure_init(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active is not None:
+            _active.figure_created()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _savefig(func):
+    @functools.wraps(func)
+    def wrapper(fig, fname, *args, **kwargs):
+        timer = _active
+        if timer is None or timer.saving:
+            return func(fig, fname, *args, **kwargs)
+        with recorded_save(fig, fname):
+            return func(fig, fname, *args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def recorded_save(fig, fname):
+    """
+    把 with 块记为一次 savefig：artist 计数一次，耗时计入 encode (其中的栅格化仍计入 rasterize)，
+    结束后按 fname 的文件大小累计写出字节数
+
+    块内再调用的 savefig 不重复计数，供分块渲染等由多次内部保存组成一次输出的场景使用
+    """
+    timer = _active
+    if timer is None:
+        yield
+        return
+    timer.metrics.artists += len(fig.findobj())
+    timer.push('encode')
+    timer.saving += 1
+    try:
+        yield
+    finally:
+        timer.saving -= 1
+        timer.pop()
+        if isinstance(fname, (str, os.PathLike)) and os.path.exists(fname):
+            timer.metrics.bytes_written += os.path.getsize(fname)
+
+
+def _install():
+    """给matplotlib安装计时钩子 (每个进程一次)；未在采集时钩子只多一次判断"""
+    global _installed
+    if _installed:
+        return
+    import matplotlib.image
+    from matplotlib.figure import Figure
+    from matplotlib.text import Text
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    Figure.__init__ = _figure_init(Figure.__init__)
+    Figure.tight_layout = _timed('tight_layout', Figure.tight_layout)
+    Figure.savefig = _savefig(Figure.savefig)
+    FigureCanvasAgg.draw = _timed('rasterize', FigureCanvasAgg.draw)
+    matplotlib.image.imsave = _timed('encode', matplotlib.image.imsave)
+    # Text._get_layout 是私有方法，不同matplotlib版本不一定存在
+    if hasattr(Text, '_get_layout'):
+        Text._get_layout = _timed('text_layout', Text._get_layout)
+    _installed = True
+
+
+class instrument:
+    """
+    在 with 块内采集一次图表渲染
+
+        with instrument('progress_visualization', 'comprehensive_dashboard') as metrics:
+            create_comprehensive_dashboard()
+        metrics.phases['tight_layout']
+    """
+
+    def __init__(self, module, chart):
+        self.metrics = RenderMetrics(module, chart)
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("渲染计时不支持嵌套采集")
+        _install()
+        self._timer = _PhaseTimer(self.metrics)
+        self._start = time.perf_counter()
+        self._timer.push('data_prep')
+        _active = self._timer
+        return self.metrics
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        while self._timer._stack:
+            self._timer.pop()
+        self.metrics.total = time.perf_counter() - self._start
+
+
+class MetricsAggregate:
+    """
+    按 (模块, 图表) 累加多次渲染的计时，可从已保存的结果继续累加
+
+    每个图表记录运行次数、总耗时的和/最小/最大值与直方图、各阶段耗时之和、
+    最近一次的artist数量与累计写出字节数
+    """
+
+    def __init__(self, charts=None):
+        self.charts = charts or {}
+
+    def _entry(self, module, chart):
+        key = f'{module}.{chart}'
+        if key not in self.charts:
+            self.charts[key] = {
+                'module': module, 'chart': chart, 'runs': 0,
+                'total_sum': 0.0, 'total_min': None, 'total_max': 0.0,
+                'buckets': [0] * len(LATENCY_BUCKETS),
+                'phases': dict.fromkeys(PHASES, 0.0),
+                'artists': 0, 'bytes_written': 0,
+            }
+        return self.charts[key]
+
+    def add(self, metrics):
+        entry = self._entry(metrics.module, metrics.chart)
+        entry['runs'] += 1
+        entry['total_sum'] += metrics.total
+        entry['total_min'] = metrics.total if entry['total_min'] is None else min(entry['total_min'], metrics.total)
+        entry['total_max'] = max(entry['total_max'], metrics.total)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if metrics.total <= bound:
+                entry['buckets'][i] += 1
+        for phase, seconds in metrics.phases.items():
+            entry['phases'][phase] = entry['phases'].get(phase, 0.0) + seconds
+        entry['artists'] = metrics.artists
+        entry['bytes_written'] += metrics.bytes_written
+
+    def to_json(self):
+        return {'buckets': list(LATENCY_BUCKETS), 'charts': self.charts}
+
+    @classmethod
+    def load(cls, path):
+        """读取已保存的JSON，文件不存在或桶边界已变化时返回空聚合"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        if data.get('buckets') != list(LATENCY_BUCKETS):
+            return cls()
+        return cls(data['charts'])
+
+    def to_prometheus(self):
+        """Prometheus文本格式"""
+        lines = [
+            '# HELP chart_render_seconds Chart render wall time.',
+            '# TYPE chart_render_seconds histogram',
+        ]
+        for entry in self.charts.values():
+            labels = f'module="{entry["module"]}",chart="{entry["chart"]}"'
+            for bound, count in zip(LATENCY_BUCKETS, entry['buckets']):
+                lines.append(f'chart_render_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'chart_render_seconds_bucket{{{labels},le="+Inf"}} {entry["runs"]}')
+            lines.append(f'chart_render_seconds_sum{{{labels}}} {entry["total_sum"]:.6f}')
+            lines.append(f'chart_render_seconds_count{{{labels}}} {entry["runs"]}')
+        lines += [
+            '# HELP chart_render_phase_seconds_total Exclusive time spent in each render phase.',
+            '# TYPE chart_render_phase_seconds_total counter',
+        ]
+        for entry in self.charts.values():
+            labels = f'module="{entry["module"]}",chart="{entry["chart"]}"'
+            for phase, seconds in entry['phases'].items():
+                lines.append(f'chart_render_phase_seconds_total{{{labels},phase="{phase}"}} {seconds:.6f}')
+        lines += [
+            '# HELP chart_render_artists Artists in the figure at the last save.',
+            '# TYPE chart_render_artists gauge',
+        ]
+        for entry in self.charts.values():
+            labels = f'module="{entry["module"]}",chart="{entry["chart"]}"'
+            lines.append(f'chart_render_artists{{{labels}}} {entry["artists"]}')
+        lines += [
+            '# HELP chart_render_bytes_written_total Bytes written by savefig.',
+            '# TYPE chart_render_bytes_written_total counter',
+        ]
+        for entry in self.charts.values():
+            labels = f'module="{entry["module"]}",chart="{entry["chart"]}"'
+            lines.append(f'chart_render_bytes_written_total{{{labels}}} {entry["bytes_written"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _write_atomic(path, text):
+    """textfile collector 可能随时读取，先写临时文件再替换"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def export_metrics(metrics_list, metrics_dir):
+    """
+    把本次运行的计时并入 metrics_dir 中已有的累计结果，写出JSON与Prometheus文件
+
+    Returns:
+        合并后的 MetricsAggregate
+    """
+    json_path = os.path.join(metrics_dir, METRICS_JSON)
+    aggregate = MetricsAggregate.load(json_path)
+    for metrics in metrics_list:
+        aggregate.add(metrics)
+    _write_atomic(json_path, json.dumps(aggregate.to_json(), ensure_ascii=False, indent=2))
+    _write_atomic(os.path.join(metrics_dir, METRICS_PROM), aggregate.to_prometheus())
+    return aggregate
+
+
+def print_metrics_report(metrics_list):
+    """打印本次各图表的阶段耗时分布"""
+    header = ''.join(f'{phase:>13}' for phase in PHASES)
+    print(f"\n⏱️ 分阶段耗时 (秒)\n{'图表':<30}{'总计':>8}{header}{'artists':>9}{'输出KB':>9}")
+    for m in metrics_list:
+        phases = ''.join(f'{m.phases[phase]:13.3f}' for phase in PHASES)
+        print(f"{m.chart:<30}{m.total:8.3f}{phases}{m.artists:9d}{m.bytes_written / 1024:9.1f}")
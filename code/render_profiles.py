@@ -0,0 +1,127 @@
+"""
+渲染配置 - 预览草稿、网页缩略图与出版质量输出
+每个配置决定分辨率、是否执行紧凑布局、输出格式和PNG压缩级别，
+图表函数统一通过 save_chart() 保存，不再各自硬编码 dpi=300 与 bbox_inches='tight'
+"""
+
+import os
+from dataclasses import dataclass, replace
+from typing import Optional
+
+FORMATS = ('png', 'svg', 'pdf')
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """
+    一组输出参数
+
+    dpi: 栅格分辨率 (SVG/PDF中只影响内嵌的栅格元素)
+    fmt: 输出格式，见 FORMATS
+    tight: True 时先执行 tight_layout 再按紧凑边界保存；False 时直接按figure尺寸保存，省去两次布局计算
+    png_compress: PNG的zlib压缩级别 0-9，越低编码越快、文件越大
+    max_width: 输出宽度上限 (像素)，超出时按比例降低dpi，用于缩略图
+    max_raster_bytes: PNG渲染的栅格内存额度，估算超出时按水平条带分块渲染 (见 render_memory)
+    """
+    name: str
+    dpi: int = 300
+    fmt: str = 'png'
+    tight: bool = True
+    png_compress: int = 6
+    max_width: Optional[int] = None
+    max_raster_bytes: Optional[int] = None
+
+    @property
+    def extension(self):
+        return f'.{self.fmt}'
+
+
+PROFILES = {
+    # 交互预览与CI：低分辨率、不做紧凑布局、最快的PNG压缩
+    'draft': RenderProfile('draft', dpi=72, tight=False, png_compress=1),
+    # 网页缩略图：宽度不超过1200像素，文件体积优先
+    'web': RenderProfile('web', dpi=150, png_compress=9, max_width=1200),
+    # 出版质量：与原先的 dpi=300、bbox_inches='tight' 输出一致
+    'publication': RenderProfile('publication', dpi=300),
+}
+DEFAULT_PROFILE = 'publication'
+
+
+def get_profile(profile=None, fmt=None, dpi=None):
+    """
+    解析渲染配置
+
+    Args:
+        profile: 配置名称、RenderProfile 或 None (默认出版质量)
+        fmt: 覆盖输出格式
+        dpi: 覆盖分辨率
+    """
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"未知渲染配置: {profile} (可选 {', '.join(PROFILES)})")
+        profile = PROFILES[profile]
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise ValueError(f"不支持的输出格式: {fmt} (可选 {', '.join(FORMATS)})")
+        profile = replace(profile, fmt=fmt)
+    if dpi is not None:
+        profile = replace(profile, dpi=dpi)
+    return profile
+
+
+def chart_path(output_dir, chart_name, profile=None):
+    """图表在该配置下的输出路径，扩展名随格式变化"""
+    return os.path.join(output_dir, chart_name + get_profile(profile).extension)
+
+
+def savefig_kwargs(fig, profile=None, bbox=None):
+    """
+    生成 fig.savefig 的参数
+
+    Args:
+        bbox: 复用已计算的紧凑边界 (见 chart_templates)，为 None 时按配置决定
+    """
+    profile = get_profile(profile)
+    dpi = profile.dpi
+    if profile.max_width:
+        dpi = min(dpi, profile.max_width / fig.get_figwidth())
+    kwargs = {'dpi': dpi, 'format': profile.fmt}
+    if bbox is not None:
+        kwargs['bbox_inches'] = bbox
+    elif profile.tight:
+        kwargs['bbox_inches'] = 'tight'
+    if profile.fmt == 'png':
+        kwargs['pil_kwargs'] = {'compress_level': profile.png_compress}
+    else:
+        # 去掉创建时间，相同输入得到相同文件，便于渲染缓存复用
+        kwargs['metadata'] = {'Date': None}
+    return kwargs
+
+
+def save_chart(fig, output_dir, chart_name, profile=None, layout=True):
+    """
+    按配置完成布局并保存图表
+
+    Args:
+        layout: 图表是否需要 tight_layout (自行管理子图间距的图表传 False)
+
+    Returns:
+        输出文件路径
+    """
+    profile = get_profile(profile)
+    if profile.tight and layout:
+        fig.tight_layout()
+    output_path = chart_path(output_dir, chart_name, profile)
+    kwargs = savefig_kwargs(fig, profile)
+    if profile.max_raster_bytes:
+        # 只有设置了栅格额度时才需要分块渲染模块
+        from render_memory import needs_tiling, save_png_tiled
+        if needs_tiling((fig.get_figwidth(), fig.get_figheight()), profile):
+            # 栅格额度不足以整图渲染，按水平条带分块栅格化并流式编码
+            save_png_tiled(fig, output_path, kwargs['dpi'], profile.max_raster_bytes, profile.tight,
+                           profile.png_compress)
+            return output_path
+    fig.savefig(output_path, **kwargs)
+    return output_path
@@ -0,0 +1,541 @@
+"""
+常驻渲染服务 - 保持 matplotlib 热状态，按优先级队列渲染图表请求
+每次运行 progress_visualization.py / aics_mle_analysis.py 都要重新启动解释器、导入 matplotlib/seaborn、
+加载 seaborn-v0_8 样式并逐个匹配中文字体回退列表；服务启动时一次性完成这些工作并预渲染一张图，
+之后每个请求的耗时只剩渲染本身
+
+接口 (仅监听本机):
+    POST /render     {"module": "progress_visualization", "chart": "learning_growth_analysis",
+                      "data": {"learning": {...}}, "profile": "draft", "priority": 0, "wait": true}
+                     data 为图表函数的数据参数，默认值是 dataclass 的参数 (如 LearningPanels) 按字段构造；
+                     priority 越小越先渲染；wait=false 时立即返回任务编号，之后查询 GET /jobs/<编号>
+    GET  /jobs/<id>  任务状态与结果
+    GET  /stats      队列深度、合并与拒绝次数、排队/渲染/总延迟分位数
+    GET  /health
+
+请求中的 output_dir 按服务输出目录 (-o) 下的相对路径解析，解析后不在该目录内的请求返回 400；
+内容相同 (模块、图表、数据、渲染配置、输出目录) 且尚未完成的请求合并为一个任务，共享同一结果；
+排队任务数达到上限时新请求返回 503 与 Retry-After，调用方稍后重试 (render() 即按此重试)
+
+用法:
+    python render_server.py --port 8765 -o /workspace/charts
+    python render_server.py --submit learning_growth_analysis --data learning.json
+    python render_server.py --bench 40          # 对比冷启动子进程与常驻服务的请求延迟
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import hashlib
+import argparse
+import importlib
+import inspect
+import itertools
+import threading
+import traceback
+import subprocess
+import dataclasses
+import http.client
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from lazy_imports import ensure_loaded
+from render_profiles import PROFILES, FORMATS, chart_path, get_profile
+
+# 允许渲染的图表模块 (需提供 CHARTS 注册表和延迟导入的 plt)
+CHART_MODULES = ('progress_visualization', 'aics_mle_analysis')
+DEFAULT_MODULE = 'progress_visualization'
+DEFAULT_PORT = 8765
+DEFAULT_OUTPUT_DIR = '/workspace/charts/server'
+DEFAULT_PRIORITY = 5
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_TIMEOUT = 300
+# 延迟分位数统计的滑动窗口 (最近完成的任务数)
+LATENCY_WINDOW = 1000
+PERCENTILES = (50, 90, 99)
+# 已完成任务保留多少个供 /jobs 查询
+FINISHED_JOBS = 1000
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class QueueFull(Exception):
+    """排队任务数达到上限"""
+
+
+def chart_arguments(func, data):
+    """
+    把请求中的 JSON 数据转换为图表函数参数：默认值为 dataclass 实例的参数按字段构造同类型对象，
+    其余参数原样传入；output_dir / profile 由服务决定，不接受覆盖
+    """
+    params = inspect.signature(func).parameters
+    kwargs = {}
+    for name, value in (data or {}).items():
+        if name in ('output_dir', 'profile') or name not in params:
+            raise ValueError(f"{func.__name__} 不接受数据参数: {name}")
+        default = params[name].default
+        if dataclasses.is_dataclass(default) and isinstance(value, dict):
+            value = type(default)(**value)
+        kwargs[name] = value
+    return kwargs
+
+
+def job_key(module, chart, data, profile, output_dir):
+    """请求的内容地址，相同的键只渲染一次"""
+    payload = json.dumps([module, chart, data or {}, dataclasses.astuple(profile), output_dir],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Job:
+    """一个渲染任务；合并进来的请求共享同一个任务"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, key, module, chart, data, profile, output_dir, priority):
+        self.id = next(self._ids)
+        self.key = key
+        self.module = module
+        self.chart = chart
+        self.data = data
+        self.profile = profile
+        self.output_dir = output_dir
+        self.priority = priority
+        self.state = QUEUED
+        self.requests = 1
+        self.error = None
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+    @property
+    def output_path(self):
+        return chart_path(self.output_dir, self.chart, self.profile)
+
+    def to_dict(self):
+        result = {'id': self.id, 'module': self.module, 'chart': self.chart, 'state': self.state,
+                  'priority': self.priority, 'requests': self.requests, 'output_path': self.output_path}
+        if self.started is not None:
+            result['queue_seconds'] = round(self.started - self.submitted, 6)
+        if self.finished is not None:
+            result['render_seconds'] = round(self.finished - self.started, 6)
+        if self.error is not None:
+            result['error'] = self.error
+        return result
+
+
+class LatencyWindow:
+    """最近 LATENCY_WINDOW 个任务的排队、渲染与总延迟"""
+
+    def __init__(self, size=LATENCY_WINDOW):
+        self.samples = {name: deque(maxlen=size) for name in ('queue', 'render', 'total')}
+
+    def add(self, job):
+        self.samples['queue'].append(job.started - job.submitted)
+        self.samples['render'].append(job.finished - job.started)
+        self.samples['total'].append(job.finished - job.submitted)
+
+    def percentiles(self):
+        """{指标: {'p50': 秒, ...}}，没有样本时为空字典"""
+        result = {}
+        for name, values in self.samples.items():
+            if values:
+                points = np.percentile(np.fromiter(values, dtype=np.float64), PERCENTILES)
+                result[name] = {f'p{p}': round(float(v), 6) for p, v in zip(PERCENTILES, points)}
+        return result
+
+
+class RenderQueue:
+    """
+    优先级渲染队列与单个渲染线程
+
+    pyplot 的全局状态不是线程安全的，所有图表在同一个线程中依次渲染；
+    堆中的条目为 (优先级, 提交序号, 任务)，合并请求提高了任务优先级时重新入堆，旧条目出堆时跳过
+
+    Args:
+        output_dir: 输出根目录；请求指定的输出目录按其下的相对路径解析，
+                    未指定时按任务键分目录输出到该目录下
+        max_queue: 排队 (未开始渲染) 任务数上限，超出时 submit 抛出 QueueFull
+    """
+
+    def __init__(self, output_dir=DEFAULT_OUTPUT_DIR, max_queue=DEFAULT_MAX_QUEUE):
+        self.output_dir = output_dir
+        self.max_queue = max_queue
+        self.latency = LatencyWindow()
+        self.counters = dict.fromkeys(('submitted', 'coalesced', 'rejected', 'completed', 'failed'), 0)
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = {}                      # 任务键 -> 排队或渲染中的任务
+        self._jobs = OrderedDict()              # 任务编号 -> 任务 (含最近完成的)
+        self._queued = 0
+        self._running = None
+        self._lock = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self.modules = {}
+
+    def warm_up(self, modules=CHART_MODULES, chart=None):
+        """导入图表模块并完成 matplotlib 初始化；指定 chart 时再预渲染一张草稿图，提前完成字体匹配"""
+        for name in modules:
+            module = importlib.import_module(name)
+            ensure_loaded(module.plt)
+            self.modules[name] = module
+        if chart is not None:
+            module_name, chart_name = chart
+            job = Job('warm-up', module_name, chart_name, None, get_profile('draft'),
+                      os.path.join(self.output_dir, '_warmup'), 0)
+            self._render(job)
+            if job.error:
+                raise RuntimeError(job.error)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, name='render-worker', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def resolve_output_dir(self, output_dir):
+        """把请求中的输出目录解析到输出根目录下，越出根目录 (含 .. 与符号链接) 时抛出 ValueError"""
+        root = os.path.realpath(self.output_dir)
+        resolved = os.path.realpath(os.path.join(root, output_dir))
+        if os.path.commonpath([root, resolved]) != root:
+            raise ValueError(f"输出目录必须位于 {root} 之下: {output_dir}")
+        return resolved
+
+    def submit(self, chart, module=DEFAULT_MODULE, data=None, profile=None, output_dir=None,
+               priority=DEFAULT_PRIORITY):
+        """
+        提交渲染请求
+
+        Args:
+            output_dir: 输出根目录下的相对路径 (见 resolve_output_dir)，默认按任务键分目录
+
+        Returns:
+            (任务, 是否与已有任务合并)
+        """
+        if module not in self.modules:
+            raise ValueError(f"未加载的图表模块: {module} (可用: {', '.join(self.modules)})")
+        func = self.modules[module].CHARTS.get(chart)
+        if func is None:
+            raise ValueError(f"未知图表: {module}.{chart}")
+        chart_arguments(func, data)         # 提交时校验参数，错误请求不进入队列
+        profile = get_profile(profile)
+        if output_dir is not None:
+            output_dir = self.resolve_output_dir(output_dir)
+        key = job_key(module, chart, data, profile, output_dir)
+        with self._lock:
+            self.counters['submitted'] += 1
+            job = self._pending.get(key)
+            if job is not None:
+                job.requests += 1
+                self.counters['coalesced'] += 1
+                if job.state == QUEUED and priority < job.priority:
+                    job.priority = priority
+                    heapq.heappush(self._heap, (priority, next(self._seq), job))
+                return job, True
+            if self._queued >= self.max_queue:
+                self.counters['rejected'] += 1
+                raise QueueFull(f"渲染队列已满 ({self.max_queue} 个任务排队)")
+            job = Job(key, module, chart, data, profile,
+                      output_dir or os.path.join(self.output_dir, key[:16]), priority)
+            self._pending[key] = job
+            self._jobs[job.id] = job
+            self._queued += 1
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._lock.notify()
+        return job, False
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def depth(self):
+        return self._queued
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters, queue_depth=self._queued, max_queue=self.max_queue,
+                         running=self._running.to_dict() if self._running else None)
+        stats['latency'] = self.latency.percentiles()
+        return stats
+
+    def _next_job(self):
+        with self._lock:
+            while True:
+                while self._heap:
+                    priority, _, job = heapq.heappop(self._heap)
+                    # 跳过提高优先级后留下的旧条目
+                    if job.state == QUEUED and priority == job.priority:
+                        job.state = RUNNING
+                        self._queued -= 1
+                        self._running = job
+                        return job
+                if self._stopped:
+                    return None
+                self._lock.wait()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._render(job)
+            with self._lock:
+                self._running = None
+                self._pending.pop(job.key, None)
+                self.counters['completed' if job.error is None else 'failed'] += 1
+                self.latency.add(job)
+                while len(self._jobs) > FINISHED_JOBS and next(iter(self._jobs.values())).done.is_set():
+                    self._jobs.popitem(last=False)
+            job.done.set()
+
+    def _render(self, job):
+        module = self.modules[job.module]
+        plt = module.plt
+        job.started = time.perf_counter()
+        try:
+            func = module.CHARTS[job.chart]
+            os.makedirs(job.output_dir, exist_ok=True)
+            # 图表修改的 rcParams 在本次渲染结束后恢复，不影响后续请求
+            with plt.rc_context():
+                func(output_dir=job.output_dir, profile=job.profile, **chart_arguments(func, job.data))
+            job.state = DONE
+        except Exception:
+            job.error = traceback.format_exc()
+            job.state = FAILED
+        finally:
+            plt.close('all')
+            job.finished = time.perf_counter()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON over HTTP 接口，self.server.queue 为 RenderQueue"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _reply(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        queue = self.server.queue
+        if self.path == '/health':
+            return self._reply(200, {'status': 'ok', 'modules': list(queue.modules)})
+        if self.path == '/stats':
+            return self._reply(200, queue.stats())
+        if self.path.startswith('/jobs/'):
+            job = queue.job(int(self.path[len('/jobs/'):])) if self.path[len('/jobs/'):].isdigit() else None
+            if job is None:
+                return self._reply(404, {'error': '任务不存在或已过期'})
+            return self._reply(200, job.to_dict())
+        self._reply(404, {'error': f'未知路径: {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/render':
+            return self._reply(404, {'error': f'未知路径: {self.path}'})
+        queue = self.server.queue
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            profile = get_profile(request.get('profile'), request.get('format'), request.get('dpi'))
+            job, coalesced = queue.submit(request['chart'], request.get('module', DEFAULT_MODULE),
+                                          request.get('data'), profile, request.get('output_dir'),
+                                          int(request.get('priority', DEFAULT_PRIORITY)))
+        except QueueFull as exc:
+            # 按当前队列深度与最近的渲染耗时估计重试间隔
+            render = queue.latency.percentiles().get('render', {}).get('p50', 1.0)
+            retry = max(1, int(np.ceil(queue.depth() * render)))
+            return self._reply(503, {'error': str(exc)}, {'Retry-After': str(retry)})
+        except (KeyError, ValueError, TypeError) as exc:
+            return self._reply(400, {'error': f'{type(exc).__name__}: {exc}'})
+        if not request.get('wait', True):
+            return self._reply(202, dict(job.to_dict(), coalesced=coalesced))
+        if not job.done.wait(float(request.get('timeout', DEFAULT_TIMEOUT))):
+            return self._reply(504, dict(job.to_dict(), coalesced=coalesced, error='等待渲染超时'))
+        self._reply(200 if job.error is None else 500, dict(job.to_dict(), coalesced=coalesced))
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, queue, host='127.0.0.1', port=DEFAULT_PORT, verbose=False):
+        super().__init__((host, port), _Handler)
+        self.queue = queue
+        self.verbose = verbose
+
+
+def render(chart, module=DEFAULT_MODULE, data=None, host='127.0.0.1', port=DEFAULT_PORT, retries=5, **options):
+    """
+    向常驻服务提交一个渲染请求并等待结果 (队列满时按 Retry-After 重试)
+
+    Returns:
+        (HTTP状态码, 响应字典)
+    """
+    body = json.dumps(dict(options, module=module, chart=chart, data=data or {}), ensure_ascii=False).encode()
+    for attempt in range(retries + 1):
+        connection = http.client.HTTPConnection(host, port, timeout=options.get('timeout', DEFAULT_TIMEOUT) + 10)
+        try:
+            connection.request('POST', '/render', body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            result = json.loads(response.read())
+        finally:
+            connection.close()
+        if response.status != 503 or attempt == retries:
+            return response.status, result
+        time.sleep(float(response.getheader('Retry-After', 1)))
+
+
+def get_json(path, host='127.0.0.1', port=DEFAULT_PORT):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        connection.request('GET', path)
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def print_stats(stats):
+    print(f"📊 已提交 {stats['submitted']} 个请求：完成 {stats['completed']}，失败 {stats['failed']}，"
+          f"合并 {stats['coalesced']}，拒绝 {stats['rejected']}，当前排队 {stats['queue_depth']}/{stats['max_queue']}")
+    labels = {'queue': '排队', 'render': '渲染', 'total': '总计'}
+    for name, points in stats['latency'].items():
+        print(f"   {labels[name]}延迟 " + '  '.join(f"{p} {v * 1000:8.1f}ms" for p, v in points.items()))
+
+
+def _bench_data(i):
+    """第 i 个基准请求的学习面板数据 (每 4 个请求中有 1 个与前一个相同，用于验证合并)"""
+    rng = np.random.default_rng(i - (i % 4 == 3))
+    return {'learning': {
+        'months': ['1月', '2月', '3月', '4月', '5月', '6月'],
+        'learning_types': ['在线课程', '技术认证', '技术书籍', '项目实践', '技术分享'],
+        'learning_data': rng.integers(0, 50, (5, 6)).tolist(),
+        'investments': ['课程费用', '书籍购买', '会议参加', '工具订阅', '时间投入'],
+        'costs': rng.integers(1000, 10000, 5).tolist(),
+        'benefits': rng.integers(1000, 30000, 5).tolist(),
+    }}
+
+
+def run_bench(n_requests, output_dir, profile='draft', clients=8):
+    """对比每次启动子进程渲染与常驻服务渲染同一图表的延迟"""
+    chart = 'learning_growth_analysis'
+    code_dir = os.path.dirname(os.path.abspath(__file__))
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-W', 'ignore', os.path.join(code_dir, 'progress_visualization.py'),
+                    '--charts', chart, '--profile', profile, '-j', '1', '-o', os.path.join(output_dir, 'cold')],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    cold = time.perf_counter() - started
+    print(f"🧊 冷启动子进程渲染 {chart}：{cold:.2f}s")
+
+    queue = RenderQueue(output_dir)
+    started = time.perf_counter()
+    queue.warm_up(chart=(DEFAULT_MODULE, chart))
+    print(f"🔥 服务预热：{time.perf_counter() - started:.2f}s")
+    queue.start()
+    server = RenderServer(queue, port=0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # 先串行请求测量单个请求的延迟，再并发请求测试排队与合并
+        latencies = []
+        for i in range(min(n_requests, 10)):
+            started = time.perf_counter()
+            status, result = render(chart, data=_bench_data(i * 4), port=port, profile=profile)
+            latencies.append(time.perf_counter() - started)
+            assert status == 200, result
+        print(f"⚡ 常驻服务串行请求：中位数 {np.median(latencies) * 1000:.0f}ms "
+              f"(冷启动的 {np.median(latencies) / cold * 100:.1f}%)")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            results = list(pool.map(lambda i: render(chart, data=_bench_data(i), port=port, profile=profile,
+                                                     priority=i % 3), range(n_requests)))
+        failed = sum(1 for status, _ in results if status != 200)
+        print(f"🚀 {clients} 个客户端并发 {n_requests} 个请求：{time.perf_counter() - started:.2f}s，失败 {failed} 个")
+        print_stats(get_json('/stats', port=port))
+    finally:
+        server.shutdown()
+        server.server_close()
+        queue.stop()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='常驻图表渲染服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认只接受本机连接)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='监听端口')
+    parser.add_argument('-o', '--output-dir', default=DEFAULT_OUTPUT_DIR, help='请求未指定输出目录时的输出根目录')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE, help='排队任务数上限，超出时返回503')
+    parser.add_argument('--modules', nargs='+', choices=CHART_MODULES, default=list(CHART_MODULES),
+                        help='预加载的图表模块')
+    parser.add_argument('--no-warmup', action='store_true', help='启动时不预渲染草稿图')
+    parser.add_argument('-v', '--verbose', action='store_true', help='打印每个HTTP请求')
+    parser.add_argument('--submit', metavar='CHART', help='作为客户端向运行中的服务提交一个图表请求')
+    parser.add_argument('--module', default=DEFAULT_MODULE, choices=CHART_MODULES, help='--submit 的图表模块')
+    parser.add_argument('--data', help='--submit 的数据参数 JSON 文件')
+    parser.add_argument('--profile', choices=list(PROFILES), default=None, help='--submit 的渲染配置')
+    parser.add_argument('--format', choices=FORMATS, default=None, help='--submit 的输出格式')
+    parser.add_argument('--priority', type=int, default=DEFAULT_PRIORITY, help='--submit 的优先级 (越小越先)')
+    parser.add_argument('--stats', action='store_true', help='查询运行中服务的队列与延迟统计')
+    parser.add_argument('--bench', type=int, metavar='N', help='启动临时服务并发送N个请求，与冷启动对比')
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_bench(args.bench, args.output_dir)
+    if args.stats:
+        print_stats(get_json('/stats', args.host, args.port))
+        return 0
+    if args.submit:
+        data = None
+        if args.data:
+            with open(args.data, encoding='utf-8') as f:
+                data = json.load(f)
+        status, result = render(args.submit, args.module, data, args.host, args.port,
+                                profile=args.profile, format=args.format, priority=args.priority)
+        if status != 200:
+            print(f"❌ 渲染失败 ({status}): {result.get('error')}")
+            return 1
+        merged = '，与相同请求合并' if result['coalesced'] else ''
+        print(f"✅ {result['output_path']} (排队 {result['queue_seconds'] * 1000:.0f}ms，"
+              f"渲染 {result['render_seconds'] * 1000:.0f}ms{merged})")
+        return 0
+
+    queue = RenderQueue(args.output_dir, args.max_queue)
+    started = time.perf_counter()
+    warm_chart = None if args.no_warmup else (args.modules[0], next(iter(importlib.import_module(args.modules[0]).CHARTS)))
+    queue.warm_up(args.modules, warm_chart)
+    queue.start()
+    server = RenderServer(queue, args.host, args.port, args.verbose)
+    print(f"🔥 预热完成 ({time.perf_counter() - started:.2f}s)，渲染服务监听 http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        queue.stop()
+        print_stats(queue.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
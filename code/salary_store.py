@@ -0,0 +1,610 @@
+"""
+薪资列式存储 - 图表与调研数据共用的薪资数据集
+每条记录包含公司、岗位、级别、工作年限、地区、币种、年份与金额，按列存储为numpy数组，
+文本列做字典编码；金额在写入时统一换算为千美元，之后的分组统计不再关心原始单位。
+分组查询 (中位数、p25/p75/p90 等) 完全向量化：按分组键排序一次后用下标运算取分位数，
+排序结果按分组键缓存，百万级记录的重复查询只需毫秒级
+
+用法:
+    python salary_store.py                           # 打印数据集摘要
+    python salary_store.py --group role level --filter source=curated
+    python salary_store.py --group company --filter role=MLE role=AICS yoe=3..8   # 文本列取值集合，数值列区间
+    python salary_store.py --bench 2000000           # 合成数据测量分组查询耗时
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import functools
+from dataclasses import dataclass
+
+import numpy as np
+
+from extract_snapshot import EXTRACT_DIR, parse_amount, index_terms, read_document
+
+# 存储中金额的统一单位
+SALARY_UNIT = '千美元'
+
+# 折算为美元的汇率 (2025年均值附近的固定汇率，仅用于横向比较)
+FX_TO_USD = {
+    'USD': 1.0, 'CNY': 1 / 7.2, 'EUR': 1.08, 'GBP': 1.27, 'INR': 1 / 83.0,
+    'AUD': 0.66, 'CAD': 0.73, 'JPY': 1 / 150.0,
+}
+
+# 金额单位 -> 倍数：'万' 即万元这类以1万为单位的数值
+UNIT_SCALES = {'': 1.0, 'K': 1e3, '千': 1e3, '万': 1e4, 'M': 1e6}
+
+CATEGORY_COLUMNS = ('company', 'role', 'level', 'region', 'currency', 'source')
+NUMBER_COLUMNS = ('yoe', 'year', 'amount')
+COLUMNS = CATEGORY_COLUMNS + NUMBER_COLUMNS
+
+# 支持的统计量；pXX 为分位数
+STATS = ('count', 'mean', 'min', 'max', 'median', 'p25', 'p75', 'p90')
+DEFAULT_STATS = ('median', 'p25', 'p75', 'p90')
+_QUANTILES = {'min': 0.0, 'p25': 0.25, 'median': 0.5, 'p75': 0.75, 'p90': 0.9, 'max': 1.0}
+
+# 图表使用的整理数据 (基于levels.fyi、Glassdoor与行业报告，单位千美元)
+CURATED_SOURCE = 'curated'
+LEVELS = ('入门级', '中级', '高级', '资深', '架构师', '高管')
+
+# (岗位, 级别, 工作年限, 年薪)：市场整体水平
+CURATED_MARKET = [
+    ('MLE', '入门级', 1, 118), ('MLE', '中级', 3, 156), ('MLE', '高级', 6, 184),
+    ('MLE', '资深', 9, 240), ('MLE', '架构师', 10, 280), ('MLE', '高管', 15, 400),
+    ('AICS', '入门级', 1.5, 140), ('AICS', '中级', 4.5, 200), ('AICS', '高级', 8, 280),
+    ('AICS', '资深', 10, 350), ('AICS', '架构师', 12.5, 450), ('AICS', '高管', 18, 600),
+]
+
+# 公司 -> (入门级MLE, 中级MLE, 高级MLE, 入门级AICS, 中级AICS, 高级AICS)
+CURATED_COMPANIES = {
+    'OpenAI': (248, 394, 875, 280, 450, 1000),
+    'Google': (180, 280, 450, 200, 320, 500),
+    'NVIDIA': (170, 280, 420, 190, 350, 480),
+    'Meta': (190, 320, 500, 220, 380, 580),
+    'Microsoft': (175, 260, 380, 195, 300, 450),
+    'Amazon': (160, 240, 350, 180, 280, 400),
+    'Apple': (170, 250, 380, 190, 290, 450),
+    'Anthropic': (220, 350, 600, 250, 400, 700),
+}
+CURATED_COMPANY_COLUMNS = [(role, level) for role in ('MLE', 'AICS') for level in LEVELS[:3]]
+
+# 调研数据中的地区名称
+REGIONS = {'United States': '美国', 'India': '印度'}
+
+SALARY_FILES = ('openai_salary_data.json', 'nvidia_salary_data.json', 'ai_expert_salary_report.json')
+# 本模块读取的调研文件，图表缓存键包含它们的内容哈希 (见 render_cache.chart_key)
+EXTRACT_FILES = SALARY_FILES
+
+
+def normalize_amounts(amounts, currency='USD', unit=''):
+    """
+    把金额换算为千美元
+
+    Args:
+        amounts: 数值或数组
+        currency, unit: 币种与单位，可为标量或与 amounts 等长的数组
+
+    Returns:
+        float64 数组；未知币种或单位为NaN
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    fx = _lookup(FX_TO_USD, currency, amounts.shape)
+    scale = _lookup(UNIT_SCALES, unit, amounts.shape)
+    return amounts * scale * fx / 1e3
+
+
+def _lookup(table, keys, shape):
+    if isinstance(keys, str) or keys is None:
+        return np.full(shape, table.get(keys or '', np.nan) if keys is not None else np.nan)
+    uniques, inverse = np.unique(np.asarray(keys, dtype=str), return_inverse=True)
+    return np.array([table.get(k, np.nan) for k in uniques])[inverse.reshape(shape)]
+
+
+@dataclass
+class GroupStats:
+    """分组统计结果：labels[i] 为第i组各分组键的取值，stats[name][i] 为对应统计量"""
+    keys: tuple
+    labels: list
+    stats: dict
+
+    def __len__(self):
+        return len(self.labels)
+
+    def value(self, stat, *labels, default=float('nan')):
+        """取某一组的统计量，组不存在时返回 default"""
+        index = self._index().get(tuple(labels))
+        return default if index is None else self.stats[stat][index]
+
+    def pivot(self, stat, rows, cols):
+        """
+        按第一个分组键为行、其余分组键为列展开为矩阵，缺失组为NaN
+
+        Args:
+            rows: 行取值列表
+            cols: 列取值列表；剩余分组键多于一个时每项为元组
+        """
+        index = self._index()
+        values = self.stats[stat]
+        matrix = np.full((len(rows), len(cols)), np.nan)
+        for i, row in enumerate(rows):
+            for j, col in enumerate(cols):
+                k = index.get((row,) + (col if isinstance(col, tuple) else (col,)))
+                if k is not None:
+                    matrix[i, j] = values[k]
+        return matrix
+
+    def _index(self):
+        if not hasattr(self, '_lookup'):
+            self._lookup = {labels: i for i, labels in enumerate(self.labels)}
+        return self._lookup
+
+
+class SalaryStore:
+    """
+    薪资列式存储
+
+    文本列保存为 int32 编码 + 取值表，数值列为 float64 (缺失为NaN)，金额单位为千美元。
+    写入按批追加，查询前才合并为连续数组；分组排序结果按 (分组键, 统计列) 缓存，写入后失效
+    """
+
+    def __init__(self):
+        self._values = {c: [] for c in CATEGORY_COLUMNS}
+        self._codes = {c: {} for c in CATEGORY_COLUMNS}
+        self._chunks = []
+        self._columns = None
+        self._orders = {}
+
+    # ---- 写入 ----
+
+    def _encode(self, column, values, n):
+        """字典编码：新取值追加到取值表末尾，编码顺序即首次出现顺序"""
+        codes = self._codes[column]
+        if values is None or isinstance(values, str):
+            value = values or ''
+            if value not in codes:
+                codes[value] = len(self._values[column])
+                self._values[column].append(value)
+            return np.full(n, codes[value], dtype=np.int32)
+        uniques, first, inverse = np.unique(np.asarray(values, dtype=str), return_index=True, return_inverse=True)
+        mapped = np.empty(len(uniques), dtype=np.int32)
+        for i in np.argsort(first, kind='stable'):
+            value = str(uniques[i])
+            if value not in codes:
+                codes[value] = len(self._values[column])
+                self._values[column].append(value)
+            mapped[i] = codes[value]
+        return mapped[inverse.reshape(-1)]
+
+    def add_columns(self, amount, currency='USD', unit='', company='', role='', level='',
+                    region='', source='', yoe=np.nan, year=np.nan):
+        """
+        按列批量写入，各参数可为标量 (整批相同) 或等长数组
+
+        金额按 currency / unit 换算为千美元，原始币种保留在 currency 列；
+        无法换算的记录 (未知币种、金额缺失) 被丢弃
+
+        Returns:
+            实际写入的记录数
+        """
+        amount = np.atleast_1d(np.asarray(amount, dtype=np.float64))
+        n = len(amount)
+        normalized = normalize_amounts(amount, currency, unit)
+        keep = ~np.isnan(normalized)
+        chunk = {
+            'amount': normalized,
+            'yoe': np.broadcast_to(np.asarray(yoe, dtype=np.float64), n).copy(),
+            'year': np.broadcast_to(np.asarray(year, dtype=np.float64), n).copy(),
+        }
+        for column, values in (('company', company), ('role', role), ('level', level),
+                               ('region', region), ('currency', currency), ('source', source)):
+            chunk[column] = self._encode(column, values, n)
+        if not keep.all():
+            chunk = {name: values[keep] for name, values in chunk.items()}
+        self._chunks.append(chunk)
+        self._columns = None
+        self._orders.clear()
+        return int(keep.sum())
+
+    def add_records(self, records):
+        """逐条写入字典记录 (键同 add_columns 的参数名，缺失取默认值)"""
+        records = list(records)
+        if not records:
+            return 0
+        columns = {
+            'amount': [r['amount'] for r in records],
+            'currency': [r.get('currency') or 'USD' for r in records],
+            'unit': [r.get('unit') or '' for r in records],
+            'yoe': [np.nan if r.get('yoe') is None else r['yoe'] for r in records],
+            'year': [np.nan if r.get('year') is None else r['year'] for r in records],
+        }
+        for column in ('company', 'role', 'level', 'region', 'source'):
+            columns[column] = [r.get(column) or '' for r in records]
+        return self.add_columns(**columns)
+
+    # ---- 读取 ----
+
+    @property
+    def columns(self):
+        """合并后的列字典：文本列为编码数组"""
+        if self._columns is None:
+            if self._chunks:
+                self._columns = {c: np.concatenate([chunk[c] for chunk in self._chunks]) for c in COLUMNS}
+            else:
+                self._columns = {c: np.empty(0, dtype=np.int32 if c in CATEGORY_COLUMNS else np.float64)
+                                 for c in COLUMNS}
+            self._chunks = [self._columns] if self._chunks else []
+        return self._columns
+
+    def __len__(self):
+        return len(self.columns['amount'])
+
+    def categories(self, column):
+        """文本列的全部取值，下标即编码"""
+        return list(self._values[column])
+
+    def decode(self, column):
+        """文本列解码为字符串数组"""
+        return np.array(self._values[column], dtype=object)[self.columns[column]]
+
+    def mask(self, **filters):
+        """
+        过滤条件 -> 布尔掩码
+
+        文本列取单个值或取值集合；yoe / year / amount 取单个值或 (下限, 上限) 闭区间，None 表示不限
+        """
+        columns = self.columns
+        mask = np.ones(len(self), dtype=bool)
+        for column, wanted in filters.items():
+            if column in CATEGORY_COLUMNS:
+                values = [wanted] if isinstance(wanted, str) else list(wanted)
+                codes = [self._codes[column][v] for v in values if v in self._codes[column]]
+                mask &= np.isin(columns[column], codes)
+            elif column in NUMBER_COLUMNS:
+                lo, hi = wanted if isinstance(wanted, tuple) else (wanted, wanted)
+                if lo is not None:
+                    mask &= columns[column] >= lo
+                if hi is not None:
+                    mask &= columns[column] <= hi
+            else:
+                raise ValueError(f"未知列: {column} (可选 {', '.join(COLUMNS)})")
+        return mask
+
+    def _group_order(self, keys, value):
+        """
+        按 (分组键, 统计列) 排序的记录下标与组合键
+
+        先按统计列排序，再对组合键做稳定排序，组内即按数值有序；
+        统计列为NaN的记录排在组末，由调用方剔除
+        """
+        cache_key = (keys, value)
+        if cache_key not in self._orders:
+            columns = self.columns
+            sizes = [max(len(self._values[k]), 1) for k in keys]
+            combined = np.ravel_multi_index([columns[k] for k in keys], sizes) if keys else np.zeros(len(self), np.int64)
+            by_value = np.argsort(columns[value], kind='stable')
+            order = by_value[np.argsort(combined[by_value], kind='stable')]
+            self._orders[cache_key] = (order, combined[order], sizes)
+        return self._orders[cache_key]
+
+    def groupby(self, keys, stats=DEFAULT_STATS, value='amount', **filters):
+        """
+        分组统计
+
+        Args:
+            keys: 分组列 (文本列) 序列
+            stats: 统计量，见 STATS；分位数按线性插值，与 np.percentile 默认一致
+            value: 统计列，'amount' (千美元) 或 'yoe' / 'year'
+            **filters: 过滤条件，见 mask()
+
+        Returns:
+            GroupStats；组按分组键的编码顺序 (即首次写入顺序) 排列
+        """
+        keys = tuple(keys)
+        for key in keys:
+            if key not in CATEGORY_COLUMNS:
+                raise ValueError(f"只能按文本列分组: {key}")
+        unknown = [s for s in stats if s not in STATS]
+        if unknown:
+            raise ValueError(f"未知统计量: {', '.join(unknown)} (可选 {', '.join(STATS)})")
+
+        order, combined, sizes = self._group_order(keys, value)
+        values = self.columns[value][order]
+        keep = ~np.isnan(values)
+        if filters:
+            keep &= self.mask(**filters)[order]
+        if not keep.all():
+            values, combined = values[keep], combined[keep]
+
+        # 组边界：组合键有序，值变化处即新组开始
+        if len(combined):
+            starts = np.flatnonzero(np.r_[True, combined[1:] != combined[:-1]])
+        else:
+            starts = np.empty(0, dtype=np.int64)
+        counts = np.diff(np.r_[starts, len(combined)])
+        result = {}
+        for stat in stats:
+            if stat == 'count':
+                result[stat] = counts
+            elif stat == 'mean':
+                result[stat] = np.add.reduceat(values, starts) / counts if len(starts) else np.empty(0)
+            else:
+                pos = starts + _QUANTILES[stat] * (counts - 1)
+                lo = np.floor(pos).astype(np.int64)
+                hi = np.minimum(lo + 1, starts + counts - 1)
+                result[stat] = values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+        group_codes = np.unravel_index(combined[starts], sizes) if keys else ()
+        labels = list(zip(*[np.array(self._values[k], dtype=object)[codes] for k, codes in zip(keys, group_codes)])) \
+            if keys else [()] * len(starts)
+        return GroupStats(keys, labels, result)
+
+
+# ---- 数据加载 ----
+
+def curated_records():
+    """图表使用的整理数据"""
+    base = {'region': '美国', 'currency': 'USD', 'year': 2025, 'source': CURATED_SOURCE}
+    for role, level, yoe, amount in CURATED_MARKET:
+        yield dict(base, role=role, level=level, yoe=yoe, amount=amount, unit='K')
+    for company, salaries in CURATED_COMPANIES.items():
+        for (role, level), amount in zip(CURATED_COMPANY_COLUMNS, salaries):
+            yield dict(base, company=company, role=role, level=level, amount=amount, unit='K')
+
+
+# 汇率表之外的币种写法；文本以这些币种开头时改用括号中的美元折算值
+_OTHER_CURRENCIES = re.compile(r'卢比|澳元|英镑|日元')
+_NUMBER_START = re.compile(r'[$¥￥€]?\s*\d')
+
+
+def _amount(text, default_currency='USD'):
+    """
+    解析金额文本为 (数值, 币种)：跳过 "总薪酬约"、"可超过" 等前缀，区间取下界；
+    未标注币种时按所在章节的币种
+    """
+    if isinstance(text, str):
+        head, _, rest = text.partition('（')
+        if _OTHER_CURRENCIES.search(head):
+            text = rest
+        match = _NUMBER_START.search(text)
+        if not match:
+            return float('nan'), ''
+        text = text[match.start():]
+    value, unit = parse_amount(text)
+    if unit == '%':
+        return float('nan'), ''
+    return value, unit or default_currency
+
+
+def _year(temporal_info):
+    years = [int(y) for y in re.findall(r'(20\d\d)', json.dumps(temporal_info or {}, ensure_ascii=False))]
+    return max(years) if years else None
+
+
+def _role(text, default=''):
+    roles = index_terms((), text)['role']
+    return sorted(roles)[0] if roles else default
+
+
+def _level(text):
+    if re.search(r'入门|初级|起薪|Entry', text, re.I):
+        return '入门级'
+    if re.search(r'主管|总监|首席|杰出|领导', text):
+        return '资深'
+    if re.search(r'高级|资深|有经验|Senior', text, re.I):
+        return '高级'
+    return ''
+
+
+def _yoe(text):
+    """'4–6年经验' 取中点，'10年以上' 取下限，'0–1年' 取中点"""
+    match = re.search(r'(\d+)\s*[–\-~]\s*(\d+)\s*年', text)
+    if match:
+        return (int(match.group(1)) + int(match.group(2))) / 2
+    match = re.search(r'(\d+)\s*年以上', text)
+    return float(match.group(1)) if match else None
+
+
+def _openai_records(data, source):
+    year = _year(data.get('temporal_info'))
+    for row in data.get('statistics', {}).get('compensation_by_level', []):
+        amount, currency = _amount(row.get('total_compensation', ''))
+        level = row.get('level', '').split(' ')[0]
+        yield {'company': 'OpenAI', 'role': '软件工程师', 'level': level, 'region': '美国',
+               'amount': amount, 'currency': currency, 'year': year, 'source': source}
+
+
+def _nvidia_records(data, source):
+    year = _year(data.get('temporal_info'))
+    overall = data.get('pricing', {}).get('overall_compensation_range', {})
+    for end in ('low_end', 'high_end'):
+        if end not in overall:
+            continue
+        amount, currency = _amount(overall[end])
+        role = overall.get(f'{end}_role', '')
+        location = overall.get(f'{end}_location', '')
+        yield {'company': 'NVIDIA', 'role': _role(role, role), 'region': REGIONS.get(location, location),
+               'amount': amount, 'currency': currency, 'year': year, 'source': source}
+
+
+def _expert_report_records(data, source):
+    """
+    AI专家薪资报告：区域平均/中位薪资、各岗位薪资与按经验水平的薪资；
+    行业差异与顶级公司个例 (含千万级的个人薪酬包) 离群严重，不纳入统计
+    """
+    year = _year(data.get('temporal_info'))
+    pricing = data.get('pricing', {})
+    base = {'year': year, 'source': source}
+
+    for continent in pricing.get('区域薪资（美元/年）', {}).values():
+        for country, fields in continent.items():
+            for key, text in fields.items():
+                if not re.search(r'平均|中位数|年薪', key):
+                    continue
+                amount, currency = _amount(text)
+                yield dict(base, role=_role(key, 'AI岗位'), region=country, amount=amount, currency=currency)
+
+    def role_entries(group, role):
+        for key, text in group.items():
+            if isinstance(text, dict):
+                yield from role_entries(text, key)
+                continue
+            # 岗位优先取叶子键 ("数据工程师（全球中位）")，否则取所在分组 ("AI伦理官（美国）")
+            region = next((r for r in ('美国', '德国') if r in key or r in role), '全球')
+            amount, currency = _amount(text)
+            yield dict(base, role=_role(key) or _role(role, re.sub(r'（.*?）', '', role)),
+                       level=_level(key), region=region, amount=amount, currency=currency)
+
+    yield from role_entries(pricing.get('不同角色薪资（美元/年）', {}), '')
+
+    for key, text in pricing.get('按经验水平薪资（美元/年）', {}).items():
+        companies = index_terms((), key)['company']
+        amount, currency = _amount(text)
+        yield dict(base, company=sorted(companies)[0] if companies else '', role=_role(key, 'AI岗位'),
+                   level=_level(key), yoe=_yoe(key), region='美国' if '美国' in key else '全球',
+                   amount=amount, currency=currency)
+
+
+_PARSERS = {
+    'openai_salary_data.json': _openai_records,
+    'nvidia_salary_data.json': _nvidia_records,
+    'ai_expert_salary_report.json': _expert_report_records,
+}
+
+
+def extract_records(extract_dir=EXTRACT_DIR):
+    """解析 extract/ 快照中的薪资调研文件；缺失或抓取失败的文件跳过，source 为文件名 (不含扩展名)"""
+    for name in SALARY_FILES:
+        data = read_document(name, extract_dir)
+        if data is not None:
+            yield from _PARSERS[name](data, os.path.splitext(name)[0])
+
+
+def load_salary_store(extract_dir=EXTRACT_DIR, include_extract=True):
+    """整理数据 + extract/ 调研数据"""
+    store = SalaryStore()
+    store.add_records(curated_records())
+    if include_extract:
+        store.add_records(extract_records(extract_dir))
+    return store
+
+
+@functools.lru_cache(maxsize=None)
+def default_salary_store():
+    """进程内共享的默认数据集，首次使用时加载"""
+    return load_salary_store()
+
+
+def market_stats(stats=('median',), value='amount', store=None):
+    """整理数据中按 (岗位, 级别) 的市场整体统计 (不含各公司的记录)"""
+    store = default_salary_store() if store is None else store
+    return store.groupby(('role', 'level'), stats, value=value, source=CURATED_SOURCE, company='')
+
+
+# ---- 命令行 ----
+
+def synthetic_store(n_records, seed=0):
+    """合成数据：人民币按万元、美元按千美元混合写入，用于测量查询耗时"""
+    rng = np.random.default_rng(seed)
+    companies = np.array(list(CURATED_COMPANIES) + [f'公司{i}' for i in range(200)])
+    roles = np.array(['MLE', 'AICS', '数据科学家', '研究科学家', '软件工程师'])
+    regions = np.array(['美国', '中国', '德国', '印度', '英国'])
+    store = SalaryStore()
+    half = n_records // 2
+    for n, currency, unit, scale in ((half, 'USD', 'K', 1.0), (n_records - half, 'CNY', '万', 0.72)):
+        yoe = rng.uniform(0, 20, n)
+        store.add_columns(
+            amount=(100 + 20 * yoe) * rng.lognormal(0, 0.3, n) * scale, currency=currency, unit=unit,
+            company=companies[rng.integers(0, len(companies), n)], role=roles[rng.integers(0, len(roles), n)],
+            level=np.array(LEVELS)[np.minimum(yoe // 3, len(LEVELS) - 1).astype(int)],
+            region=regions[rng.integers(0, len(regions), n)], yoe=yoe, year=rng.integers(2020, 2026, n),
+            source='synthetic')
+    return store
+
+
+def parse_range(text):
+    """
+    数值列的过滤条件：'5' 为单个值，'3..8' 为闭区间，'3..' 与 '..8' 为单侧区间
+
+    Returns:
+        (下限, 上限)，None 表示不限，可直接传给 SalaryStore.mask
+    """
+    def bound(value):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"{value!r} 不是数值") from None
+
+    lo, sep, hi = text.partition('..')
+    if not sep:
+        value = bound(text)
+        return value, value
+    bounds = tuple(bound(b) if b.strip() else None for b in (lo, hi))
+    if bounds == (None, None):
+        raise ValueError("区间至少需要一侧边界")
+    if None not in bounds and bounds[0] > bounds[1]:
+        raise ValueError("下限大于上限")
+    return bounds
+
+
+def print_groups(result, stats):
+    header = ''.join(f'{s:>10}' for s in stats)
+    print(f"{' / '.join(result.keys) or '(全部)':<36}{header}")
+    for i, labels in enumerate(result.labels):
+        cells = ''.join(f'{result.stats[s][i]:10.1f}' if s != 'count' else f'{result.stats[s][i]:10d}'
+                        for s in stats)
+        print(f"{' / '.join(l or '-' for l in labels):<36}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='薪资列式存储：分组统计查询')
+    parser.add_argument('--group', nargs='*', default=['source'], choices=CATEGORY_COLUMNS,
+                        help='分组列 (默认按来源)')
+    parser.add_argument('--stats', nargs='+', default=['count', *DEFAULT_STATS], choices=STATS)
+    parser.add_argument('--filter', nargs='+', default=[], metavar='列=值',
+                        help='过滤条件：文本列可重复列名表示取值集合；数值列 (yoe/year/amount) '
+                             '取单个值或区间，如 yoe=3..8、amount=200..、year=..2024')
+    parser.add_argument('--no-extract', action='store_true', help='只加载图表整理数据')
+    parser.add_argument('--bench', type=int, metavar='N', help='用N条合成记录测量分组查询耗时')
+    args = parser.parse_args(argv)
+
+    filters = {}
+    for item in args.filter:
+        column, sep, value = item.partition('=')
+        if not sep:
+            parser.error(f"过滤条件应为 列=值: {item}")
+        if column not in COLUMNS:
+            parser.error(f"未知列: {column}")
+        if column in CATEGORY_COLUMNS:
+            filters.setdefault(column, []).append(value)
+            continue
+        if column in filters:
+            parser.error(f"数值列 {column} 只能指定一个值或区间 (如 {column}=3..8)")
+        try:
+            filters[column] = parse_range(value)
+        except ValueError as exc:
+            parser.error(f"过滤条件 {item} 无效: {exc}")
+
+    if args.bench:
+        started = time.perf_counter()
+        store = synthetic_store(args.bench)
+        print(f"🧪 合成 {len(store):,} 条记录，写入耗时 {time.perf_counter() - started:.2f}s")
+        for keys in (('role', 'level'), ('company', 'role', 'level')):
+            for label in ('首次 (含排序)', '重复 (缓存排序)', '带过滤'):
+                query_filters = {'region': '美国'} if label == '带过滤' else {}
+                started = time.perf_counter()
+                result = store.groupby(keys, args.stats, **query_filters)
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"⏱️ {' × '.join(keys):<22}{label:<14}{elapsed:8.1f}ms  {len(result)} 组")
+        return 0
+
+    store = load_salary_store(include_extract=not args.no_extract)
+    print(f"💰 薪资数据集：{len(store)} 条记录，来源 {', '.join(store.categories('source'))} (单位：{SALARY_UNIT})")
+    print_groups(store.groupby(args.group, args.stats, **filters), args.stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
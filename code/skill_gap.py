@@ -0,0 +1,374 @@
+"""
+技能差距引擎 - 基于 skill_assessments 的稀疏 用户 × 技能 矩阵
+只保存实际存在的评估 (按 用户编码<<32 | 技能编码 排序的坐标数组)，不构造稠密矩阵；
+差距 = max(目标水平 - 当前水平, 0)，加权差距 = 差距 × 置信度。
+同一用户同一技能以评估日期最新的记录为准 (日期相同取后写入的)
+
+    某用户差距最大的k个技能        行切片 + argpartition
+    某技能差距最大的k个用户        按技能排列的列索引 (写入后惰性重建) + argpartition
+    全部用户各自的前k个差距        一次 lexsort 后按组内名次截取
+
+新评估按批写入：已有坐标原地更新，新坐标按有序位置插入，不需要重建整个矩阵
+
+用法:
+    python skill_gap.py --skills skill_assessments.csv --user <user_id> --skill 机器学习 -k 5
+    python skill_gap.py --bench 2000000          # 合成评估测量写入与查询耗时
+"""
+
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+
+from table_loader import iter_batches
+
+SKILL_COLUMNS = ['user_id', 'dimension', 'category', 'skill_name', 'current_level', 'target_level',
+                 'confidence_score', 'assessment_date']
+
+# 置信度缺失时按中等置信度计
+DEFAULT_CONFIDENCE = 0.5
+# 评估日期缺失时视为最早，任何有日期的评估都会覆盖它
+_NO_DATE = np.iinfo(np.int32).min
+_USER_SHIFT = 32
+
+_VALUE_COLUMNS = ('current', 'target', 'confidence', 'date')
+
+
+@dataclass
+class SkillGap:
+    """单条技能差距"""
+    user_id: str
+    skill_name: str
+    dimension: str
+    category: str
+    current_level: float
+    target_level: float
+    confidence: float
+    gap: float
+    weighted_gap: float
+
+
+class SkillGapIndex:
+    """
+    稀疏技能差距索引
+
+    坐标 (用户, 技能) 编码为 int64 键并保持有序，同一用户的评估在数组中连续，
+    按用户查询直接二分出行切片；按技能查询使用惰性构建的列排列，写入后失效
+    """
+
+    def __init__(self, default_confidence=DEFAULT_CONFIDENCE):
+        self.default_confidence = default_confidence
+        self._users, self._user_codes = [], {}
+        self._skills, self._skill_codes = [], {}
+        # 技能所属的维度与类别 (以最近一次写入为准)
+        self._skill_dimension, self._skill_category = [], []
+        self._keys = np.empty(0, dtype=np.int64)
+        self._data = {
+            'current': np.empty(0, dtype=np.float32),
+            'target': np.empty(0, dtype=np.float32),
+            'confidence': np.empty(0, dtype=np.float32),
+            'date': np.empty(0, dtype=np.int32),
+        }
+        self._scores = None
+        self._columns = None
+
+    # ---- 写入 ----
+
+    @staticmethod
+    def _encode(values, table, codes, n):
+        """字典编码，新取值追加到取值表末尾"""
+        uniques, inverse = np.unique(np.broadcast_to(np.asarray(values, dtype=str), n), return_inverse=True)
+        mapped = np.empty(len(uniques), dtype=np.int64)
+        for i, value in enumerate(uniques.tolist()):
+            if value not in codes:
+                codes[value] = len(table)
+                table.append(value)
+            mapped[i] = codes[value]
+        return mapped[inverse.reshape(-1)]
+
+    def add_columns(self, user_id, skill_name, current_level, target_level, confidence_score=np.nan,
+                    assessment_date=None, dimension='', category=''):
+        """
+        按列批量写入评估，各参数可为标量或等长数组
+
+        当前/目标水平缺失的记录被丢弃；已有 (用户, 技能) 的评估只在新记录日期不早于原记录时覆盖
+
+        Returns:
+            (新增坐标数, 更新坐标数)
+        """
+        current = np.atleast_1d(np.asarray(current_level, dtype=np.float64))
+        n = len(current)
+        target = np.broadcast_to(np.asarray(target_level, dtype=np.float64), n)
+        confidence = np.broadcast_to(np.asarray(confidence_score, dtype=np.float64), n)
+        confidence = np.where(np.isnan(confidence), self.default_confidence, np.clip(confidence, 0, 1))
+        if assessment_date is None:
+            dates = np.full(n, _NO_DATE, dtype=np.int64)
+        else:
+            dates = np.broadcast_to(np.asarray(assessment_date, dtype='datetime64[D]'), n)
+            dates = np.where(np.isnat(dates), _NO_DATE, dates.astype(np.int64))
+        users = self._encode(user_id, self._users, self._user_codes, n)
+        skills = self._encode(skill_name, self._skills, self._skill_codes, n)
+        self._update_skill_info(skills, dimension, category, n)
+
+        keep = ~(np.isnan(current) | np.isnan(target)) & (np.asarray(user_id, dtype=str) != '')
+        keys = (users << _USER_SHIFT) | skills
+        values = {'current': current, 'target': target, 'confidence': confidence, 'date': dates}
+        values = {name: np.asarray(v)[keep] for name, v in values.items()}
+        return self._merge(keys[keep], values)
+
+    def _update_skill_info(self, skills, dimension, category, n):
+        missing = len(self._skills) - len(self._skill_dimension)
+        self._skill_dimension += [''] * missing
+        self._skill_category += [''] * missing
+        for attr, values in ((self._skill_dimension, dimension), (self._skill_category, category)):
+            values = np.broadcast_to(np.asarray(values, dtype=str), n)
+            # 每个技能取本批最后一次出现的取值
+            order = np.unique(skills[::-1], return_index=True)
+            for skill, pos in zip(order[0].tolist(), (n - 1 - order[1]).tolist()):
+                if values[pos]:
+                    attr[skill] = str(values[pos])
+
+    def _merge(self, keys, values):
+        if not len(keys):
+            return 0, 0
+        # 批内去重：同一坐标保留日期最新、位置最后的一条
+        order = np.lexsort((np.arange(len(keys)), values['date'], keys))
+        last = np.r_[keys[order][1:] != keys[order][:-1], True]
+        pick = order[last]
+        keys = keys[pick]
+        values = {name: v[pick] for name, v in values.items()}
+
+        pos = np.searchsorted(self._keys, keys)
+        found = pos < len(self._keys)
+        found[found] = self._keys[pos[found]] == keys[found]
+        newer = found.copy()
+        newer[found] = values['date'][found] >= self._data['date'][pos[found]]
+        for name in _VALUE_COLUMNS:
+            self._data[name][pos[newer]] = values[name][newer]
+
+        new = ~found
+        # keys 有序且互不相同，np.insert 按插入位置一次合并
+        self._keys = np.insert(self._keys, pos[new], keys[new])
+        for name in _VALUE_COLUMNS:
+            self._data[name] = np.insert(self._data[name], pos[new], values[name][new].astype(self._data[name].dtype))
+        self._scores = None
+        self._columns = None
+        return int(new.sum()), int(newer.sum())
+
+    def add_records(self, records):
+        """逐条写入 skill_assessments 字典记录"""
+        records = list(records)
+        if not records:
+            return 0, 0
+        column = lambda name, default=None: [default if r.get(name) is None else r[name] for r in records]
+        return self.add_columns(
+            column('user_id', ''), column('skill_name', ''),
+            column('current_level', np.nan), column('target_level', np.nan),
+            column('confidence_score', np.nan),
+            [None if d is None else str(d)[:10] for d in column('assessment_date')],
+            column('dimension', ''), column('category', ''))
+
+    def add_batch(self, batch):
+        """写入 table_loader.iter_batches 产出的列字典"""
+        n = len(batch['user_id'])
+        return self.add_columns(
+            batch['user_id'], batch['skill_name'], batch['current_level'], batch['target_level'],
+            batch.get('confidence_score', np.full(n, np.nan)), batch.get('assessment_date'),
+            batch.get('dimension', ''), batch.get('category', ''))
+
+    # ---- 查询 ----
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def users(self):
+        return list(self._users)
+
+    @property
+    def skills(self):
+        return list(self._skills)
+
+    def gaps(self):
+        """每个坐标的 (差距, 加权差距)，写入后重新计算"""
+        if self._scores is None:
+            gap = np.maximum(self._data['target'] - self._data['current'], 0)
+            self._scores = (gap, gap * self._data['confidence'])
+        return self._scores
+
+    def entries(self, weighted=True):
+        """全部坐标的 (用户编码, 技能编码, 当前水平, 置信度, 差距) 数组，按用户有序"""
+        skills = self._keys & ((1 << _USER_SHIFT) - 1)
+        return (self._keys >> _USER_SHIFT, skills, self._data['current'], self._data['confidence'],
+                self.gaps()[1 if weighted else 0])
+
+    def _column_index(self):
+        """按技能排列的坐标下标与每个技能的起止位置"""
+        if self._columns is None:
+            skills = self._keys & ((1 << _USER_SHIFT) - 1)
+            order = np.argsort(skills, kind='stable')
+            bounds = np.searchsorted(skills[order], np.arange(len(self._skills) + 1))
+            self._columns = (order, bounds)
+        return self._columns
+
+    def _gap(self, i):
+        gap, weighted = self.gaps()
+        key = int(self._keys[i])
+        user, skill = key >> _USER_SHIFT, key & ((1 << _USER_SHIFT) - 1)
+        return SkillGap(self._users[user], self._skills[skill], self._skill_dimension[skill],
+                        self._skill_category[skill], float(self._data['current'][i]),
+                        float(self._data['target'][i]), float(self._data['confidence'][i]),
+                        float(gap[i]), float(weighted[i]))
+
+    @staticmethod
+    def _top(indices, scores, k):
+        """在 indices 中选出得分最高的k个 (先 argpartition 再只对这k个排序)"""
+        if k < len(indices):
+            part = np.argpartition(-scores, k - 1)[:k]
+            indices, scores = indices[part], scores[part]
+        return indices[np.argsort(-scores, kind='stable')]
+
+    def user_gaps(self, user_id, k=5, weighted=True):
+        """用户差距最大的k个技能 (差距为0的技能不返回)"""
+        user = self._user_codes.get(str(user_id))
+        if user is None:
+            return []
+        lo, hi = np.searchsorted(self._keys, [user << _USER_SHIFT, (user + 1) << _USER_SHIFT])
+        scores = self.gaps()[1 if weighted else 0][lo:hi]
+        rows = np.arange(lo, hi)[scores > 0]
+        return [self._gap(i) for i in self._top(rows, scores[scores > 0], k)]
+
+    def skill_leaders(self, skill_name, k=10, weighted=True):
+        """某技能差距最大的k个用户"""
+        skill = self._skill_codes.get(str(skill_name))
+        if skill is None:
+            return []
+        order, bounds = self._column_index()
+        rows = order[bounds[skill]:bounds[skill + 1]]
+        scores = self.gaps()[1 if weighted else 0][rows]
+        keep = scores > 0
+        return [self._gap(i) for i in self._top(rows[keep], scores[keep], k)]
+
+    def top_gaps(self, k=3, weighted=True):
+        """
+        全部用户各自差距最大的k个技能
+
+        Returns:
+            (用户编码, 技能编码, 得分) 三个等长数组，按用户、得分降序排列；
+            编码可通过 users / skills 属性换回名称
+        """
+        scores = self.gaps()[1 if weighted else 0]
+        users = self._keys >> _USER_SHIFT
+        order = np.lexsort((-scores, users))
+        sorted_users = users[order]
+        starts = np.searchsorted(sorted_users, sorted_users, side='left')
+        rank = np.arange(len(order)) - starts
+        pick = order[(rank < k) & (scores[order] > 0)]
+        return users[pick], self._keys[pick] & ((1 << _USER_SHIFT) - 1), scores[pick]
+
+    def skill_summary(self, weighted=True):
+        """
+        每个技能的评估人数、平均差距与存在差距的人数
+
+        Returns:
+            {技能: (人数, 平均差距, 有差距人数)}
+        """
+        scores = self.gaps()[1 if weighted else 0]
+        skills = self._keys & ((1 << _USER_SHIFT) - 1)
+        n_skills = len(self._skills)
+        counts = np.bincount(skills, minlength=n_skills)
+        sums = np.bincount(skills, weights=scores, minlength=n_skills)
+        open_gaps = np.bincount(skills, weights=scores > 0, minlength=n_skills)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        return {name: (int(counts[i]), float(means[i]), int(open_gaps[i]))
+                for i, name in enumerate(self._skills) if counts[i]}
+
+
+def load_skill_gaps(path, index=None, **filters):
+    """流式读取 skill_assessments 导出并写入索引 (filters 传给 iter_batches，如 user_ids)"""
+    index = SkillGapIndex() if index is None else index
+    for batch in iter_batches(path, 'skill_assessments', columns=SKILL_COLUMNS, **filters):
+        index.add_batch(batch)
+    return index
+
+
+def synthetic_assessments(n_rows, n_users=None, n_skills=200, seed=0):
+    """合成评估列 (基准测试用)：技能按齐普夫分布抽取，少数常见技能覆盖大部分评估"""
+    rng = np.random.default_rng(seed)
+    n_users = n_users or max(1, n_rows // 20)
+    skills = np.minimum(rng.zipf(1.3, n_rows) - 1, n_skills - 1)
+    current = rng.integers(0, 9, n_rows)
+    return {
+        'user_id': np.char.add('u', rng.integers(0, n_users, n_rows).astype(str)),
+        'skill_name': np.char.add('技能', skills.astype(str)),
+        'current_level': current.astype(np.float64),
+        'target_level': np.minimum(current + rng.integers(-1, 5, n_rows), 10).astype(np.float64),
+        'confidence_score': rng.uniform(0.3, 1.0, n_rows).round(2),
+        'assessment_date': np.datetime64('2024-01-01') + rng.integers(0, 500, n_rows),
+        'dimension': 'skill_development',
+        'category': 'technical',
+    }
+
+
+def print_gaps(title, gaps, key):
+    print(f"\n🎯 {title}")
+    if not gaps:
+        print("   (无差距)")
+    for g in gaps:
+        print(f"   {getattr(g, key):<24} 当前 {g.current_level:4.1f} → 目标 {g.target_level:4.1f}  "
+              f"差距 {g.gap:4.1f}  置信度 {g.confidence:.2f}  加权 {g.weighted_gap:5.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='技能差距查询')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--skills', help='skill_assessments 导出 (CSV/JSONL)')
+    source.add_argument('--bench', type=int, metavar='N', help='用N条合成评估测量写入与查询耗时')
+    parser.add_argument('--user', action='append', default=[], help='查询该用户差距最大的技能')
+    parser.add_argument('--skill', action='append', default=[], help='查询该技能差距最大的用户')
+    parser.add_argument('-k', type=int, default=5, help='返回条数')
+    parser.add_argument('--unweighted', action='store_true', help='按原始差距而非置信度加权差距排序')
+    args = parser.parse_args(argv)
+    weighted = not args.unweighted
+
+    if args.bench:
+        columns = synthetic_assessments(args.bench)
+        index = SkillGapIndex()
+        half = args.bench // 2
+        started = time.perf_counter()
+        index.add_columns(**{name: v[:half] if isinstance(v, np.ndarray) else v for name, v in columns.items()})
+        print(f"🧪 写入 {half:,} 条评估：{time.perf_counter() - started:.2f}s，{len(index):,} 个坐标")
+        started = time.perf_counter()
+        added, updated = index.add_columns(**{name: v[half:] if isinstance(v, np.ndarray) else v
+                                              for name, v in columns.items()})
+        print(f"🧪 增量写入 {args.bench - half:,} 条：{time.perf_counter() - started:.2f}s "
+              f"(新增 {added:,}，更新 {updated:,})")
+        user, skill = index.users[0], index.skills[0]
+        for label, query in (('用户前k差距', lambda: index.user_gaps(user, args.k, weighted)),
+                             ('技能前k用户 (首次，含列索引)', lambda: index.skill_leaders(skill, args.k, weighted)),
+                             ('技能前k用户', lambda: index.skill_leaders(skill, args.k, weighted)),
+                             ('全部用户前k差距', lambda: index.top_gaps(args.k, weighted))):
+            started = time.perf_counter()
+            query()
+            print(f"⏱️ {label:<28}{(time.perf_counter() - started) * 1000:9.2f}ms")
+        return 0
+
+    index = load_skill_gaps(args.skills)
+    print(f"📊 {len(index):,} 个 (用户, 技能) 评估，{len(index.users):,} 个用户，{len(index.skills):,} 个技能")
+    if not args.user and not args.skill:
+        summary = sorted(index.skill_summary(weighted).items(), key=lambda item: -item[1][1])
+        print("\n📋 平均差距最大的技能")
+        for name, (count, mean, open_gaps) in summary[:args.k]:
+            print(f"   {name:<24} 平均差距 {mean:5.2f}  有差距 {open_gaps}/{count} 人")
+    for user in args.user:
+        print_gaps(f"用户 {user} 差距最大的 {args.k} 个技能", index.user_gaps(user, args.k, weighted), 'skill_name')
+    for skill in args.skill:
+        print_gaps(f"技能 {skill} 差距最大的 {args.k} 个用户", index.skill_leaders(skill, args.k, weighted), 'user_id')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
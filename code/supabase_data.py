@@ -0,0 +1,670 @@
+"""
+Supabase 数据访问层 - asyncio 并发读取用户数据表
+progress-analysis 函数逐个 await 五张表 (画像、进度、技能评估、职业目标、成就)，
+每个用户五次串行往返；这里改为:
+
+    多用户合并    同一张表的多个用户合并为一次 user_id=in.(...) 请求，结果按用户分组
+    并发          各表、各批次的请求同时发出，由连接池上限约束并发数
+    连接复用      HTTP/1.1 keep-alive 连接池，只依赖标准库
+    重试          连接错误、超时、429/5xx 按指数退避重试 (优先遵循 Retry-After)
+
+接口兼容 PostgREST，同一模块提供一个本地替身服务 (内存数据表)，用于离线开发与验证
+
+用法:
+    python supabase_data.py --user <user_id> --user <user_id>    # 读取 SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY
+    python supabase_data.py --serve tables/ --port 54321          # 以 <表名>.jsonl/.csv 启动本地替身
+    python supabase_data.py --demo 500                            # 本地替身 + 合成数据：逐用户串行 vs 批量并发
+"""
+
+import os
+import csv
+import sys
+import ssl
+import json
+import time
+import random
+import asyncio
+import argparse
+import calendar
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+REST_PREFIX = '/rest/v1/'
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_BATCH_SIZE = 100
+# Supabase 默认单次最多返回1000行，超过时按 limit/offset 翻页
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.2
+DEFAULT_TIMEOUT = 30.0
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# 与 progress-analysis 的 getTimeFilter 一致，未知取值按6个月
+TIME_RANGES = {'1month': 1, '3months': 3, '6months': 6, '1year': 12}
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """用户数据表的读取方式：排序与时间范围过滤所用的日期列"""
+    table: str
+    order: Optional[str] = None
+    date_column: Optional[str] = None
+
+
+# 字段名与 performProgressAnalysis 的入参一致
+USER_TABLES = {
+    'profile': TableQuery('user_profiles'),
+    'progress': TableQuery('progress_records', 'record_date.asc', 'record_date'),
+    'skills': TableQuery('skill_assessments', 'assessment_date.desc'),
+    'goals': TableQuery('career_goals', 'created_at.desc'),
+    'achievements': TableQuery('achievements', 'achievement_date.desc'),
+}
+
+
+@dataclass
+class UserData:
+    """单个用户的全部数据"""
+    user_id: str
+    profile: Optional[dict] = None
+    progress: list = field(default_factory=list)
+    skills: list = field(default_factory=list)
+    goals: list = field(default_factory=list)
+    achievements: list = field(default_factory=list)
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    rows: int = 0
+    connections: int = 0
+
+
+class SupabaseError(RuntimeError):
+    """请求失败 (不可重试的状态码，或重试次数用尽)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def time_filter(time_range, today=None):
+    """时间范围 -> 起始日期 (ISO)，None 表示不过滤"""
+    if time_range is None:
+        return None
+    months = TIME_RANGES.get(time_range, 6)
+    today = today or date.today()
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    day = min(today.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day).isoformat()
+
+
+def in_filter(values):
+    """PostgREST in 过滤，取值加双引号以容纳逗号与括号"""
+    quoted = ('"{}"'.format(str(v).replace('\\', '\\\\').replace('"', '\\"')) for v in values)
+    return f"in.({','.join(quoted)})"
+
+
+def _batches(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# ---- HTTP/1.1 ----
+
+async def _read_response(reader):
+    """读取一个响应，返回 (状态码, 头部, 正文, 连接可否复用)"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionResetError('连接已被服务器关闭')
+    version, status, _ = (line.decode('latin-1').rstrip('\r\n') + '  ').split(' ', 2)
+    headers = await _read_headers(reader)
+    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await _read_headers(reader)
+                break
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b''.join(parts)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return int(status), headers, body, keep_alive
+
+
+async def _read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+class ConnectionPool:
+    """
+    单一主机的 keep-alive 连接池
+
+    同时在途的请求数不超过 max_connections；空闲连接复用，服务器关闭或出错的连接直接丢弃
+    """
+
+    def __init__(self, host, port, use_ssl=False, max_connections=DEFAULT_MAX_CONNECTIONS):
+        self.host, self.port = host, port
+        self._ssl = ssl.create_default_context() if use_ssl else None
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle = []
+        self.opened = 0
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+
+    async def request(self, method, target, headers, timeout=None):
+        """
+        发送请求并读取完整响应
+
+        Args:
+            timeout: 建立连接、发送与读取响应的总超时 (秒)；排队等待连接槽的时间不计入，
+                     否则批量请求中只是在排队的请求也会超时并被重试
+        """
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}", 'Connection: keep-alive']
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        async with self._slots:
+            return await asyncio.wait_for(self._exchange(payload), timeout)
+
+    async def _exchange(self, payload):
+        reused = bool(self._idle)
+        reader, writer = self._idle.pop() if reused else await self._open()
+        try:
+            writer.write(payload)
+            await writer.drain()
+            status, response_headers, body, keep_alive = await _read_response(reader)
+        except ConnectionResetError:
+            writer.close()
+            if not reused:
+                raise
+            # 空闲期间被服务器关闭的连接：换新连接重发一次，不计入重试次数
+            reader, writer = await self._open()
+            try:
+                writer.write(payload)
+                await writer.drain()
+                status, response_headers, body, keep_alive = await _read_response(reader)
+            except BaseException:
+                writer.close()
+                raise
+        except BaseException:
+            # 包括超时取消：读到一半的连接不能放回空闲池
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, response_headers, body
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+# ---- 客户端 ----
+
+class SupabaseClient:
+    """
+    PostgREST 异步客户端
+
+        async with SupabaseClient(url, key) as client:
+            users = await client.fetch_users(user_ids)
+    """
+
+    def __init__(self, url, key, max_connections=DEFAULT_MAX_CONNECTIONS, batch_size=DEFAULT_BATCH_SIZE,
+                 page_size=DEFAULT_PAGE_SIZE, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"无效的 Supabase 地址: {url}")
+        use_ssl = parts.scheme == 'https'
+        self._base = parts.path.rstrip('/')
+        self._pool = ConnectionPool(parts.hostname, parts.port or (443 if use_ssl else 80), use_ssl,
+                                    max_connections)
+        self._headers = {'apikey': key, 'Authorization': f"Bearer {key}", 'Accept': 'application/json'}
+        self.batch_size, self.page_size = batch_size, page_size
+        self.retries, self.backoff, self.timeout = retries, backoff, timeout
+        self.stats = ClientStats()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        url, key = os.environ.get('SUPABASE_URL'), os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+        if not url or not key:
+            raise SupabaseError('缺少 SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY 环境变量')
+        return cls(url, key, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self._pool.close()
+
+    def _delay(self, attempt, headers):
+        retry_after = (headers or {}).get('retry-after')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * 2 ** attempt * (0.5 + random.random())
+
+    async def get(self, table, params):
+        """GET 单页，返回解析后的JSON"""
+        target = f"{self._base}{REST_PREFIX}{table}?{urlencode(params, quote_via=quote, safe='(),.*:')}"
+        for attempt in range(self.retries + 1):
+            headers = None
+            self.stats.requests += 1
+            try:
+                status, headers, body = await self._pool.request('GET', target, self._headers, self.timeout)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                error = SupabaseError(f"{table} 请求失败: {exc!r}")
+            else:
+                if status < 300:
+                    return json.loads(body or b'null')
+                error = SupabaseError(f"{table} 返回 {status}: {body[:200].decode('utf-8', 'replace')}", status)
+                if status not in RETRY_STATUSES:
+                    raise error
+            if attempt == self.retries:
+                raise error
+            self.stats.retries += 1
+            await asyncio.sleep(self._delay(attempt, headers))
+        raise AssertionError('unreachable')
+
+    async def select(self, table, filters=(), order=None, columns='*'):
+        """
+        读取满足过滤条件的全部行 (自动翻页)
+
+        Args:
+            filters: [(列, 'op.值')]，如 [('user_id', 'eq.xxx'), ('record_date', 'gte.2024-01-01')]
+            order: PostgREST 排序，如 'record_date.asc'；翻页时应保证排序唯一
+        """
+        rows = []
+        while True:
+            params = [('select', columns), *filters]
+            if order:
+                params.append(('order', order))
+            params += [('limit', str(self.page_size)), ('offset', str(len(rows)))]
+            page = await self.get(table, params)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                self.stats.rows += len(rows)
+                return rows
+
+    async def _load(self, name, user_ids, since, results):
+        query = USER_TABLES[name]
+        filters = [('user_id', in_filter(user_ids))]
+        if query.date_column and since:
+            filters.append((query.date_column, f"gte.{since}"))
+        # 按用户排序后原排序在每个用户内保持，id 保证翻页稳定
+        order = ','.join(part for part in ('user_id.asc', query.order, 'id.asc') if part)
+        for row in await self.select(query.table, filters, order):
+            user = results.get(str(row.get('user_id')))
+            if user is None:
+                continue
+            if name == 'profile':
+                user.profile = user.profile or row
+            else:
+                getattr(user, name).append(row)
+
+    async def fetch_users(self, user_ids, time_range='6months', fields=tuple(USER_TABLES), today=None):
+        """
+        并发读取多个用户的数据表
+
+        每张表每批 batch_size 个用户一次请求，所有请求同时发出 (受连接池上限约束)；
+        time_range 只作用于 progress_records，与 progress-analysis 一致
+
+        Returns:
+            {user_id: UserData}
+        """
+        user_ids = list(dict.fromkeys(str(u) for u in user_ids))
+        unknown = [name for name in fields if name not in USER_TABLES]
+        if unknown:
+            raise ValueError(f"未知字段: {', '.join(unknown)}")
+        results = {user: UserData(user) for user in user_ids}
+        since = time_filter(time_range, today)
+        tasks = [asyncio.ensure_future(self._load(name, batch, since, results))
+                 for batch in _batches(user_ids, self.batch_size) for name in fields]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self.stats.connections = self._pool.opened
+        return results
+
+    async def fetch_user(self, user_id, time_range='6months', today=None):
+        return (await self.fetch_users([user_id], time_range, today=today))[str(user_id)]
+
+
+def fetch_users(user_ids, url=None, key=None, **kwargs):
+    """同步入口：未指定地址时从环境变量读取"""
+    fetch_args = {name: kwargs.pop(name) for name in ('time_range', 'fields', 'today') if name in kwargs}
+
+    async def run():
+        client = SupabaseClient(url, key, **kwargs) if url else SupabaseClient.from_env(**kwargs)
+        async with client:
+            return await client.fetch_users(user_ids, **fetch_args)
+    return asyncio.run(run())
+
+
+# ---- 本地 PostgREST 替身 ----
+
+def _parse_list(text):
+    inner = text.strip()
+    if inner.startswith('(') and inner.endswith(')'):
+        inner = inner[1:-1]
+    return next(csv.reader([inner], quotechar='"', escapechar='\\'), [])
+
+
+_OPERATORS = {
+    'eq': lambda a, b: a == b, 'neq': lambda a, b: a != b,
+    'gt': lambda a, b: a > b, 'gte': lambda a, b: a >= b,
+    'lt': lambda a, b: a < b, 'lte': lambda a, b: a <= b,
+}
+
+
+def _predicate(op, arg):
+    """PostgREST 过滤条件 -> 作用于单个取值的判断函数"""
+    if op == 'in':
+        wanted = set(_parse_list(arg))
+        return lambda value: value is not None and str(value) in wanted
+    if op == 'is':
+        return (lambda value: value is None) if arg == 'null' else (lambda value: str(value).lower() == arg)
+    if op not in _OPERATORS:
+        raise ValueError(f"不支持的过滤操作: {op}")
+    compare = _OPERATORS[op]
+    try:
+        number = float(arg)
+    except ValueError:
+        number = None
+
+    def check(value):
+        if value is None:
+            return False
+        # 数值列按数值比较，其余 (含ISO日期) 按字符串比较
+        if number is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return compare(float(value), number)
+        return compare(str(value), arg)
+    return check
+
+
+def _sort(rows, order):
+    # 逐列稳定排序 (从最后一列开始)；与 PostgREST 默认一致，升序空值在后、降序空值在前
+    for part in reversed(order.split(',')):
+        column, _, direction = part.partition('.')
+        descending = direction.startswith('desc')
+        rows.sort(key=lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else 0),
+                  reverse=descending)
+    return rows
+
+
+class PostgrestStandIn:
+    """
+    本地 PostgREST 替身：内存数据表 + HTTP/1.1 keep-alive 服务
+
+    支持 select / eq / neq / gt / gte / lt / lte / in / is 过滤、order、limit/offset；
+    delay 模拟网络往返，fail_rate 按概率返回503用于验证重试
+    """
+
+    def __init__(self, tables, key=None, delay=0.0, fail_rate=0.0, seed=0):
+        self.tables = tables
+        self.key = key
+        self.delay, self.fail_rate = delay, fail_rate
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+
+    @classmethod
+    def from_directory(cls, directory, **kwargs):
+        """读取目录中的 <表名>.jsonl / <表名>.csv (CSV 空字符串视为 NULL)"""
+        tables = {}
+        for name in sorted(os.listdir(directory)):
+            table, ext = os.path.splitext(name)
+            path = os.path.join(directory, name)
+            if ext in ('.jsonl', '.ndjson'):
+                with open(path, encoding='utf-8') as f:
+                    tables[table] = [json.loads(line) for line in f if line.strip()]
+            elif ext == '.csv':
+                with open(path, encoding='utf-8', newline='') as f:
+                    tables[table] = [{k: (v if v != '' else None) for k, v in row.items()}
+                                     for row in csv.DictReader(f)]
+        return cls(tables, **kwargs)
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self, host='127.0.0.1', port=0):
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def query(self, table, params):
+        """执行查询，返回 (状态码, 结果)"""
+        if table not in self.tables:
+            return 404, {'message': f'relation "public.{table}" does not exist'}
+        rows = self.tables[table]
+        columns, order, limit, offset = '*', None, None, 0
+        for name, value in params:
+            if name == 'select':
+                columns = value
+            elif name == 'order':
+                order = value
+            elif name == 'limit':
+                limit = int(value)
+            elif name == 'offset':
+                offset = int(value)
+            else:
+                op, _, arg = value.partition('.')
+                try:
+                    check = _predicate(op, arg)
+                except ValueError as exc:
+                    return 400, {'message': str(exc)}
+                rows = [r for r in rows if check(r.get(name))]
+        rows = _sort(list(rows), order) if order else list(rows)
+        rows = rows[offset:None if limit is None else offset + limit]
+        if columns != '*':
+            names = [c.strip() for c in columns.split(',')]
+            rows = [{c: r.get(c) for c in names} for r in rows]
+        return 200, rows
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, _ = (line.decode('latin-1').rstrip('\r\n') + '  ').split(' ', 2)
+                headers = await _read_headers(reader)
+                if headers.get('content-length'):
+                    await reader.readexactly(int(headers['content-length']))
+                self.requests += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                status, payload = self._handle(method, target, headers)
+                body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+                reason = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+                          405: 'Method Not Allowed', 503: 'Service Unavailable'}.get(status, '')
+                writer.write((f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                              f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _handle(self, method, target, headers):
+        if method != 'GET':
+            return 405, {'message': '替身只支持 GET'}
+        if self.key and headers.get('apikey') != self.key:
+            return 401, {'message': 'Invalid API key'}
+        if self.fail_rate and self._random.random() < self.fail_rate:
+            return 503, {'message': '模拟的临时故障'}
+        path, _, query = target.partition('?')
+        if not path.startswith(REST_PREFIX):
+            return 404, {'message': f'未知路径: {path}'}
+        return self.query(path[len(REST_PREFIX):], parse_qsl(query, keep_blank_values=True))
+
+
+def synthetic_tables(n_users, seed=0):
+    """合成五张用户数据表 (演示与基准测试用)"""
+    rng = random.Random(seed)
+    users = [f"00000000-0000-4000-8000-{i:012d}" for i in range(n_users)]
+    tables = {name: [] for name in ('user_profiles', 'progress_records', 'skill_assessments',
+                                    'career_goals', 'achievements')}
+    dimensions = ('skill_development', 'career_advancement', 'network_building', 'innovation_capability')
+    counter = 0
+
+    def row(table, user, **values):
+        nonlocal counter
+        counter += 1
+        tables[table].append({'id': f"r{counter}", 'user_id': user, **values})
+
+    def day():
+        return date.fromordinal(date(2024, 1, 1).toordinal() + rng.randrange(700)).isoformat()
+
+    for user in users:
+        row('user_profiles', user, mbti_type=rng.choice(('INTJ', 'ENTP', 'INFJ', 'ESTJ')),
+            learning_preferences={'learningStyle': rng.choice(('visual', 'reading', 'kinesthetic'))})
+        for _ in range(rng.randrange(5, 40)):
+            row('progress_records', user, dimension=rng.choice(dimensions), indicator='score',
+                score=round(rng.uniform(40, 95), 1), record_date=day())
+        for skill in rng.sample(('Python编程', '机器学习', '深度学习', '大模型应用', '沟通'), 3):
+            row('skill_assessments', user, skill_name=skill, current_level=rng.randrange(1, 9),
+                target_level=9, assessment_date=day())
+        for _ in range(rng.randrange(1, 4)):
+            row('career_goals', user, goal_type='skill', title='目标', created_at=day())
+        for _ in range(rng.randrange(0, 3)):
+            row('achievements', user, achievement_type='certificate', title='认证', achievement_date=day())
+    return users, tables
+
+
+async def _serial_fetch(client, user_ids, time_range, today):
+    """逐用户逐表串行读取 (对照 progress-analysis 的做法)"""
+    since = time_filter(time_range, today)
+    results = {}
+    for user in user_ids:
+        data = UserData(user)
+        for name, query in USER_TABLES.items():
+            filters = [('user_id', f"eq.{user}")]
+            if query.date_column and since:
+                filters.append((query.date_column, f"gte.{since}"))
+            order = ','.join(part for part in (query.order, 'id.asc') if part)
+            rows = await client.select(query.table, filters, order)
+            if name == 'profile':
+                data.profile = rows[0] if rows else None
+            else:
+                setattr(data, name, rows)
+        results[user] = data
+    return results
+
+
+async def _demo(n_users, delay, fail_rate, max_connections):
+    users, tables = synthetic_tables(n_users)
+    today = date(2025, 12, 1)
+    print(f"🧪 合成 {n_users:,} 个用户，{sum(len(t) for t in tables.values()):,} 行，模拟往返 {delay * 1000:.0f}ms")
+    async with PostgrestStandIn(tables, key='local', delay=delay) as server:
+        async with SupabaseClient(server.url, 'local', max_connections=1) as client:
+            started = time.perf_counter()
+            serial = await _serial_fetch(client, users, '1year', today)
+            print(f"⏱️ 逐用户串行：{time.perf_counter() - started:6.2f}s，{client.stats.requests:,} 次请求")
+    async with PostgrestStandIn(tables, key='local', delay=delay, fail_rate=fail_rate) as server:
+        async with SupabaseClient(server.url, 'local', max_connections=max_connections,
+                                  backoff=0.01) as client:
+            started = time.perf_counter()
+            batched = await client.fetch_users(users, '1year', today=today)
+            stats = client.stats
+            print(f"⏱️ 批量并发：  {time.perf_counter() - started:6.2f}s，{stats.requests:,} 次请求 "
+                  f"(重试 {stats.retries}，{stats.connections} 个连接，{stats.rows:,} 行)")
+    same = all(serial[u] == batched[u] for u in users)
+    print(f"{'✅' if same else '❌'} 两种方式结果{'一致' if same else '不一致'}")
+    return 0 if same else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Supabase 用户数据并发读取')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--user', action='append', help='读取该用户的数据 (可重复)')
+    mode.add_argument('--serve', metavar='DIR', help='以目录中的数据表启动本地 PostgREST 替身')
+    mode.add_argument('--demo', type=int, metavar='N', help='本地替身 + N个合成用户，对比串行与批量并发')
+    parser.add_argument('--time-range', default='6months', choices=sorted(TIME_RANGES), help='进度记录时间范围')
+    parser.add_argument('--connections', type=int, default=DEFAULT_MAX_CONNECTIONS, help='最大并发连接数')
+    parser.add_argument('--port', type=int, default=54321, help='替身监听端口')
+    parser.add_argument('--key', help='替身要求的 apikey')
+    parser.add_argument('--delay', type=float, default=0.005, help='替身模拟往返延迟 (秒)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='替身返回503的概率')
+    args = parser.parse_args(argv)
+
+    if args.demo:
+        return asyncio.run(_demo(args.demo, args.delay, args.fail_rate, args.connections))
+
+    if args.serve:
+        async def serve():
+            server = PostgrestStandIn.from_directory(args.serve, key=args.key, delay=args.delay,
+                                                     fail_rate=args.fail_rate)
+            await server.start(port=args.port)
+            print(f"🚀 本地替身：{server.url}{REST_PREFIX} ({', '.join(server.tables)})")
+            await server.serve_forever()
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    try:
+        users = fetch_users(args.user, time_range=args.time_range, max_connections=args.connections)
+    except SupabaseError as exc:
+        print(f"❌ {exc}")
+        return 1
+    for user in users.values():
+        print(f"\n👤 {user.user_id} ({'有' if user.profile else '无'}画像)")
+        for name in ('progress', 'skills', 'goals', 'achievements'):
+            print(f"   {USER_TABLES[name].table:<18} {len(getattr(user, name)):>5} 行")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+数据表导出流式读取 - 按固定行数分块读取CSV/JSONL导出文件
+每块转换为按列存储的类型化数组，并在读取时下推列裁剪和
+user_id / 维度 / 日期范围过滤，无论导出文件多大内存占用都保持有界
+"""
+
+import os
+import csv
+import gzip
+import json
+
+import numpy as np
+
+from progress_data import normalize_dimension
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+# 列类型：text 字符串，number 浮点 (缺失为NaN，可空整数列也按浮点读取)，
+# date 日期 (datetime64[D]，缺失为NaT)，json 保留原始Python对象
+TABLE_SCHEMAS = {
+    'progress_records': {
+        'id': 'text', 'user_id': 'text', 'dimension': 'text', 'indicator': 'text',
+        'score': 'number', 'target_score': 'number', 'evidence': 'json', 'metadata': 'json',
+        'record_date': 'date', 'created_at': 'date',
+    },
+    'skill_assessments': {
+        'id': 'text', 'user_id': 'text', 'dimension': 'text', 'category': 'text', 'skill_name': 'text',
+        'current_level': 'number', 'target_level': 'number', 'confidence_score': 'number',
+        'evidence': 'json', 'assessment_date': 'date', 'created_at': 'date', 'updated_at': 'date',
+    },
+    'learning_activities': {
+        'id': 'text', 'user_id': 'text', 'activity_type': 'text', 'title': 'text', 'description': 'text',
+        'provider': 'text', 'duration_hours': 'number', 'completion_percentage': 'number',
+        'status': 'text', 'start_date': 'date', 'completion_date': 'date', 'certificate_url': 'text',
+        'rating': 'number', 'notes': 'text', 'skills_gained': 'json',
+        'created_at': 'date', 'updated_at': 'date',
+    },
+    'career_goals': {
+        'id': 'text', 'user_id': 'text', 'goal_type': 'text', 'title': 'text', 'description': 'text',
+        'target_value': 'number', 'current_value': 'number', 'target_date': 'date',
+        'priority_level': 'number', 'status': 'text', 'progress_percentage': 'number',
+        'milestones': 'json', 'category': 'text', 'priority': 'text',
+        'created_at': 'date', 'updated_at': 'date',
+    },
+    'user_profiles': {
+        'id': 'text', 'user_id': 'text', 'education_level': 'text', 'work_experience_years': 'number',
+        'current_position': 'text', 'target_position': 'text', 'mbti_type': 'text',
+        'learning_preferences': 'json', 'personality_traits': 'json', 'risk_tolerance': 'json',
+        'created_at': 'date', 'updated_at': 'date',
+    },
+    'network_contacts': {
+        'id': 'text', 'user_id': 'text', 'contact_type': 'text', 'contact_name': 'text',
+        'contact_title': 'text', 'contact_company': 'text', 'contact_email': 'text', 'contact_phone': 'text',
+        'relationship_strength': 'number', 'last_interaction_date': 'date', 'interaction_frequency': 'text',
+        'notes': 'text', 'tags': 'json', 'linkedin_url': 'text', 'created_at': 'date', 'updated_at': 'date',
+    },
+    'mentors': {
+        'id': 'text', 'name': 'text', 'title': 'text', 'bio': 'text', 'twitter_handle': 'text',
+        'avatar_url': 'text', 'category': 'text', 'created_at': 'date', 'updated_at': 'date',
+    },
+    'user_mentor_follows': {
+        'id': 'text', 'user_id': 'text', 'mentor_id': 'text', 'created_at': 'date',
+    },
+}
+
+# 日期范围过滤使用的列，以及支持维度过滤的表
+DATE_COLUMNS = {
+    'progress_records': 'record_date',
+    'skill_assessments': 'assessment_date',
+    'learning_activities': 'start_date',
+    'career_goals': 'target_date',
+    'user_profiles': 'created_at',
+    'network_contacts': 'last_interaction_date',
+    'mentors': 'created_at',
+    'user_mentor_follows': 'created_at',
+}
+DIMENSION_TABLES = {'progress_records', 'skill_assessments'}
+
+
+def _open_text(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    return opener(path, 'rt', encoding='utf-8', newline='')
+
+
+def detect_format(path):
+    """按扩展名判断导出格式 (支持 .gz 压缩)"""
+    name = path[:-3] if path.endswith('.gz') else path
+    ext = os.path.splitext(name)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"无法识别的导出格式: {path} (支持 .csv / .jsonl / .ndjson)")
+
+
+def _iter_csv(path, columns):
+    """逐行产出所需列的值元组，空字符串视为缺失"""
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise ValueError(f"{path} 缺少列: {', '.join(missing)}")
+        idx = [header.index(c) for c in columns]
+        for row in reader:
+            if row:
+                yield tuple(row[i] if row[i] != '' else None for i in idx)
+
+
+def _iter_jsonl(path, columns):
+    with _open_text(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield tuple(record.get(c) for c in columns)
+
+
+def _to_array(values, kind):
+    if kind == 'number':
+        return np.array(values, dtype=np.float64)
+    if kind == 'date':
+        # 时间戳只保留日期部分
+        return np.array([v[:10] if isinstance(v, str) else None for v in values], dtype='datetime64[D]')
+    if kind == 'json':
+        out = np.empty(len(values), dtype=object)
+        out[:] = values
+        return out
+    return np.array(['' if v is None else str(v) for v in values], dtype=str)
+
+
+def _make_filter(table, positions, user_ids, dimensions, date_range):
+    """构造作用于原始行元组的过滤函数，在类型转换前丢弃不需要的行"""
+    checks = []
+    if user_ids is not None:
+        user_ids = {str(u) for u in user_ids}
+        i = positions['user_id']
+        checks.append(lambda row, i=i: row[i] is not None and str(row[i]) in user_ids)
+    if dimensions is not None:
+        if table not in DIMENSION_TABLES:
+            raise ValueError(f"{table} 没有维度列，不支持按维度过滤")
+        wanted = {normalize_dimension(d) or d for d in dimensions}
+        i = positions['dimension']
+        checks.append(lambda row, i=i: (normalize_dimension(row[i]) or row[i]) in wanted)
+    if date_range is not None:
+        # ISO日期字符串可直接按字典序比较；start/end 均为闭区间，None表示不限
+        start, end = (str(d)[:10] if d is not None else None for d in date_range)
+        i = positions[DATE_COLUMNS[table]]
+        checks.append(lambda row, i=i: row[i] is not None
+                      and (start is None or str(row[i])[:10] >= start)
+                      and (end is None or str(row[i])[:10] <= end))
+    if not checks:
+        return None
+    return lambda row: all(check(row) for check in checks)
+
+
+def iter_batches(path, table, columns=None, user_ids=None, dimensions=None, date_range=None,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, fmt=None):
+    """
+    分块读取数据表导出文件
+
+    Args:
+        path: CSV或JSONL导出文件路径 (可为 .gz)
+        table: 表名，见 TABLE_SCHEMAS
+        columns: 需要的列 (列裁剪)，默认全部
+        user_ids: 只保留这些用户的记录
+        dimensions: 只保留这些维度 (代码或中文名称均可)
+        date_range: (起始日期, 结束日期) 闭区间，按 DATE_COLUMNS 中的日期列过滤
+        chunk_rows: 每批最多行数
+        fmt: 'csv' 或 'jsonl'，默认按扩展名判断
+
+    Yields:
+        dict: 列名 -> numpy数组，各列等长
+    """
+    schema = TABLE_SCHEMAS[table]
+    columns = list(columns or schema)
+    unknown = [c for c in columns if c not in schema]
+    if unknown:
+        raise ValueError(f"{table} 没有列: {', '.join(unknown)}")
+
+    # 读取列 = 输出列 + 过滤所需列
+    read_columns = list(columns)
+    for needed, active in (('user_id', user_ids is not None),
+                           ('dimension', dimensions is not None),
+                           (DATE_COLUMNS[table], date_range is not None)):
+        if active and needed not in read_columns:
+            read_columns.append(needed)
+    positions = {c: i for i, c in enumerate(read_columns)}
+    keep = _make_filter(table, positions, user_ids, dimensions, date_range)
+
+    reader = _iter_csv if (fmt or detect_format(path)) == 'csv' else _iter_jsonl
+    buffer = []
+    for row in reader(path, read_columns):
+        if keep is not None and not keep(row):
+            continue
+        buffer.append(row)
+        if len(buffer) >= chunk_rows:
+            yield _columnar(buffer, columns, schema)
+            buffer = []
+    if buffer:
+        yield _columnar(buffer, columns, schema)
+
+
+def _columnar(rows, columns, schema):
+    return {c: _to_array([row[i] for row in rows], schema[c]) for i, c in enumerate(columns)}
+
+
+def concat_batches(batches):
+    """合并多个批次为一个列字典 (用于已经过滤到可接受大小的数据)"""
+    merged = {}
+    for batch in batches:
+        for name, values in batch.items():
+            merged.setdefault(name, []).append(values)
+    return {name: np.concatenate(parts) for name, parts in merged.items()}
+
+
+def iter_rows(path, table, **kwargs):
+    """逐行产出字典，日期转为ISO字符串、缺失数值为None，供按行处理的代码使用"""
+    for batch in iter_batches(path, table, **kwargs):
+        names = list(batch)
+        columns = []
+        for name in names:
+            values = batch[name]
+            if values.dtype.kind == 'M':
+                columns.append([None if np.isnat(v) else str(v) for v in values])
+            elif values.dtype.kind == 'f':
+                columns.append([None if np.isnan(v) else float(v) for v in values])
+            else:
+                columns.append(values.tolist())
+        for row in zip(*columns):
+            yield dict(zip(names, row))
@@ -0,0 +1,321 @@
+"""
+趋势预测引擎 - 对成批时间序列同时拟合简单趋势模型并给出预测区间
+序列按 (序列, 年份) 二维数组输入，缺失值为NaN；各模型对全部序列一次求解，不逐序列循环：
+
+    linear     值 = a + b·t                        加权最小二乘 (批量正规方程)
+    loglinear  ln(值) = a + b·t                    指数增长，年增长率 = e^b - 1
+    quadratic  值 = a + b·t + c·t²                 增速变化的序列
+    cagr       以最后一个观测值为起点按复合年增长率外推；增长率取首末观测的CAGR或外部给定，
+               区间按历史对数年增长率的波动 (随机游走) 随预测步长扩大
+
+预测区间为回归预测区间 (含参数不确定性)，t分位数由Cornish-Fisher展开近似 (自由度1、2用精确式)
+
+用法:
+    python trend_forecast.py                      # 对 extract/ 中的市场与供需序列做预测
+    python trend_forecast.py --bench 10000        # 合成序列测量批量拟合耗时
+"""
+
+import re
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from extract_snapshot import EXTRACT_DIR, read_document
+
+MODELS = ('linear', 'loglinear', 'quadratic', 'cagr')
+DEFAULT_LEVEL = 0.8
+
+# 按年份给出序列的调研文件
+MARKET_FILE = 'ai_chip_market_analysis.json'
+DEMAND_FILE = 'ai_engineer_demand_supply.json'
+# 图表缓存键包含这些文件的内容哈希 (见 render_cache.chart_key)
+EXTRACT_FILES = (MARKET_FILE, DEMAND_FILE)
+
+# 多项式模型的阶数与是否在对数空间拟合
+_POLYNOMIAL = {'linear': (1, False), 'loglinear': (1, True), 'quadratic': (2, False)}
+
+
+def t_quantile(p, df):
+    """
+    Student t 分布的 p 分位数 (df 可为数组)
+
+    自由度1、2用闭式解，其余用 Cornish-Fisher 展开 (自由度≥3时误差小于0.5%)
+    """
+    df = np.asarray(df, dtype=np.float64)
+    z = NormalDist().inv_cdf(p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+             + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3)
+             + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * df ** 4))
+    t = np.where(df == 1, np.tan(np.pi * (p - 0.5)), t)
+    t = np.where(df == 2, (2 * p - 1) / np.sqrt(2 * p * (1 - p)), t)
+    return np.where(df >= 1, t, np.nan)
+
+
+@dataclass
+class Forecast:
+    """
+    批量预测结果，第一维均为序列
+
+    point / lower / upper: (序列, 预测年份) 点预测与区间；拟合点不足的序列为NaN
+    growth: 年增长率 (loglinear / cagr)，其余模型为末年的环比增长率
+    """
+    model: str
+    level: float
+    years: np.ndarray
+    point: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    growth: np.ndarray
+    n_obs: np.ndarray
+
+    def series(self, i):
+        """第 i 条序列的 (点预测, 下界, 上界)"""
+        return self.point[i], self.lower[i], self.upper[i]
+
+
+def _as_matrix(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[None, :] if values.ndim == 1 else values
+
+
+def _fit_polynomial(years, values, future, degree, log, level):
+    """加权最小二乘：权重为观测是否存在，(序列, k, k) 正规方程批量求解"""
+    origin = years.mean()
+    x_obs = np.vander(years - origin, degree + 1, increasing=True)   # (T, k)
+    x_new = np.vander(future - origin, degree + 1, increasing=True)  # (H, k)
+    y = values
+    if log:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            y = np.where(values > 0, np.log(values), np.nan)
+    w = (~np.isnan(y)).astype(np.float64)
+    y0 = np.where(w > 0, y, 0.0)
+    n = w.sum(axis=1)
+    k = degree + 1
+
+    xtwx = np.einsum('st,ti,tj->sij', w, x_obs, x_obs)
+    xtwy = np.einsum('st,ti,st->si', w, x_obs, y0)
+    # 观测点不足的序列用单位阵占位，结果置为NaN
+    enough = n > degree
+    xtwx[~enough] = np.eye(k)
+    inverse = np.linalg.inv(xtwx)
+    beta = np.einsum('sij,sj->si', inverse, xtwy)
+
+    fitted = beta @ x_obs.T
+    dof = n - k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma2 = np.where(dof > 0, (w * (y0 - fitted) ** 2).sum(axis=1) / dof, np.nan)
+    point = beta @ x_new.T
+    # 预测方差 = σ²·(1 + x*ᵀ(XᵀWX)⁻¹x*)
+    leverage = np.einsum('hi,sij,hj->sh', x_new, inverse, x_new)
+    half = t_quantile(0.5 + level / 2, dof)[:, None] * np.sqrt(sigma2[:, None] * (1 + leverage))
+    lower, upper = point - half, point + half
+    if log:
+        point, lower, upper = np.exp(point), np.exp(lower), np.exp(upper)
+        growth = np.expm1(beta[:, 1])
+    else:
+        last = beta @ np.vander(np.array([years[-1], years[-1] - 1.0]) - origin, k, increasing=True).T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = last[:, 0] / last[:, 1] - 1
+    point[~enough] = lower[~enough] = upper[~enough] = growth[~enough] = np.nan
+    return point, lower, upper, growth, n
+
+
+def _fit_cagr(years, values, future, rate, level):
+    """复合增长外推：起点为各序列最后一个观测值"""
+    valid = ~np.isnan(values) & (values > 0)
+    n = valid.sum(axis=1)
+    n_years = len(years)
+    first = np.argmax(valid, axis=1)
+    last = n_years - 1 - np.argmax(valid[:, ::-1], axis=1)
+    rows = np.arange(len(values))
+    v_first, v_last = values[rows, first], values[rows, last]
+    span = years[last] - years[first]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if rate is None:
+            growth = np.where(span > 0, (v_last / v_first) ** (1 / span) - 1, np.nan)
+        else:
+            growth = np.broadcast_to(np.asarray(rate, dtype=np.float64), n.shape).astype(np.float64)
+        # 历史对数年增长率的标准差 (相邻观测按间隔年数折算)
+        logs = np.where(valid, np.log(np.where(valid, values, 1.0)), np.nan)
+        idx = np.where(valid, np.arange(n_years), -1)
+        prev = np.maximum.accumulate(idx, axis=1)
+        prev_shift = np.concatenate([np.full((len(values), 1), -1), prev[:, :-1]], axis=1)
+        has_prev = valid & (prev_shift >= 0)
+        gap = np.where(has_prev, years[None, :] - years[np.maximum(prev_shift, 0)], np.nan)
+        step = np.where(has_prev, (logs - np.take_along_axis(logs, np.maximum(prev_shift, 0), axis=1)) / gap, np.nan)
+        m = has_prev.sum(axis=1)
+        mean_step = np.nansum(step, axis=1) / m
+        sd = np.sqrt(np.nansum((step - mean_step[:, None]) ** 2, axis=1) / (m - 1))
+    sd = np.where(m > 1, sd, np.nan)
+    horizon = future[None, :] - years[last][:, None]
+    point = v_last[:, None] * (1 + growth[:, None]) ** horizon
+    half = t_quantile(0.5 + level / 2, np.maximum(m - 1, 0))[:, None] * sd[:, None] * np.sqrt(np.maximum(horizon, 0))
+    lower, upper = point * np.exp(-half), point * np.exp(half)
+    missing = n == 0
+    point[missing] = lower[missing] = upper[missing] = np.nan
+    return point, lower, upper, growth, n
+
+
+def forecast(years, values, future, model='loglinear', level=DEFAULT_LEVEL, rate=None):
+    """
+    批量拟合并预测
+
+    Args:
+        years: (T,) 观测年份 (可为小数，如 2025.5 表示年中)
+        values: (T,) 或 (序列, T) 观测值，缺失为NaN
+        future: 预测年份序列
+        model: 见 MODELS
+        level: 预测区间的置信水平
+        rate: 仅 cagr 模型：外部给定的年增长率 (标量或每序列一个)，默认按首末观测计算
+
+    Returns:
+        Forecast
+    """
+    if model not in MODELS:
+        raise ValueError(f"未知预测模型: {model} (可选 {', '.join(MODELS)})")
+    years = np.asarray(years, dtype=np.float64)
+    values = _as_matrix(values)
+    future = np.atleast_1d(np.asarray(future, dtype=np.float64))
+    if values.shape[1] != len(years):
+        raise ValueError(f"观测值列数 {values.shape[1]} 与年份数 {len(years)} 不一致")
+    if model == 'cagr':
+        point, lower, upper, growth, n = _fit_cagr(years, values, future, rate, level)
+    else:
+        degree, log = _POLYNOMIAL[model]
+        point, lower, upper, growth, n = _fit_polynomial(years, values, future, degree, log, level)
+    return Forecast(model, level, future, point, lower, upper, growth, n)
+
+
+# ---- extract/ 中的序列 ----
+
+def _number(text):
+    """只接受纯数值 ("12.5"、"+45.6%" 不算)，供需比等比值文本返回None"""
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return float(text)
+    if isinstance(text, str) and re.fullmatch(r'\s*-?\d+(?:\.\d+)?\s*', text):
+        return float(text)
+    return None
+
+
+def _year_key(key):
+    """'2024年' -> 2024，'2025年(上半年)' -> 2025.5 (按年中计)，'2030_market_size_xxx' -> 2030"""
+    match = re.match(r'(20\d\d)', key)
+    if not match:
+        return None
+    return int(match.group(1)) + (0.5 if '上半年' in key else 0.0)
+
+
+def extract_series(extract_dir=EXTRACT_DIR):
+    """
+    读取 extract/ 中按年份给出的序列
+
+    Returns:
+        {序列名: {年份: 值}}；同一年份有多个来源时取中位数，另返回各机构预测的市场CAGR (小数)
+    """
+    series = {}
+    rates = []
+    data = read_document(MARKET_FILE, extract_dir)
+    if data is not None:
+        points = {}
+        for key, value in data.get('temporal_info', {}).get('market_growth_dates', {}).items():
+            year, number = _year_key(key), _number(value)
+            if year is not None and number is not None:
+                points.setdefault(year, []).append(number)
+        series['AI芯片市场规模 (十亿美元)'] = {year: float(np.median(v)) for year, v in points.items()}
+        for item in data.get('statistics', {}).get('cagr_projections', []):
+            number = _number(item.get('value'))
+            if number is not None:
+                rates.append(number / 100)
+
+    data = read_document(DEMAND_FILE, extract_dir)
+    if data is not None:
+        for row in data.get('statistics', {}).get('整体供需分析', []):
+            points = {_year_key(k): _number(v) for k, v in row.items()}
+            points = {year: v for year, v in points.items() if year is not None and v is not None}
+            if len(points) >= 2:
+                series[row.get('指标', '未命名')] = points
+    return series, rates
+
+
+def market_estimates(year, extract_dir=EXTRACT_DIR):
+    """
+    extract/ 中各机构对某一年AI芯片市场规模 (十亿美元) 的直接估计，升序
+
+    注意各机构口径不同 (2024年基数从285亿到529亿美元不等)，只适合作为该年份的估计区间，
+    不宜把其CAGR套用到其他口径的序列上
+    """
+    data = read_document(MARKET_FILE, extract_dir)
+    if data is None:
+        return []
+    values = [_number(value) for key, value in data.get('temporal_info', {}).get('market_growth_dates', {}).items()
+              if _year_key(key) == year]
+    return sorted(v for v in values if v is not None)
+
+
+def series_matrix(series):
+    """{名称: {年份: 值}} -> (名称列表, 年份数组, (序列, 年份) 矩阵)"""
+    names = list(series)
+    years = np.array(sorted({year for points in series.values() for year in points}), dtype=np.float64)
+    matrix = np.full((len(names), len(years)), np.nan)
+    column = {year: j for j, year in enumerate(years)}
+    for i, name in enumerate(names):
+        for year, value in series[name].items():
+            matrix[i, column[year]] = value
+    return names, years, matrix
+
+
+# ---- 命令行 ----
+
+def _fmt(value):
+    return '-' if np.isnan(value) else f'{value:,.1f}'
+
+
+def print_forecast(names, result):
+    print(f"\n📈 模型 {result.model}，{result.level:.0%} 预测区间")
+    for i, name in enumerate(names):
+        cells = '  '.join(f"{year:g}: {_fmt(p)} [{_fmt(lo)}, {_fmt(hi)}]"
+                          for year, p, lo, hi in zip(result.years, *result.series(i)))
+        growth = '-' if np.isnan(result.growth[i]) else f'{result.growth[i]:+.1%}'
+        print(f"  {name:<28} 年增长 {growth:>7}  {cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量趋势预测')
+    parser.add_argument('--model', nargs='+', choices=MODELS, default=list(MODELS))
+    parser.add_argument('--years', nargs='+', type=float, default=[2026, 2028, 2030], help='预测年份')
+    parser.add_argument('--level', type=float, default=DEFAULT_LEVEL, help='预测区间置信水平')
+    parser.add_argument('--bench', type=int, metavar='N', help='用N条合成序列测量批量拟合耗时')
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        rng = np.random.default_rng(0)
+        years = np.arange(2010, 2025, dtype=np.float64)
+        growth = rng.uniform(-0.05, 0.4, (args.bench, 1))
+        values = 10 * np.exp(growth * (years - years[0]) + rng.normal(0, 0.1, (args.bench, len(years))))
+        values[rng.random(values.shape) < 0.1] = np.nan
+        for model in args.model:
+            start = time.perf_counter()
+            forecast(years, values, args.years, model, args.level)
+            print(f"⏱️ {model:<10} {args.bench:,} 条序列 × {len(years)} 年  {(time.perf_counter() - start) * 1000:8.1f}ms")
+        return 0
+
+    series, rates = extract_series()
+    if not series:
+        print("⚠️ extract/ 中没有可用的年份序列")
+        return 1
+    names, years, matrix = series_matrix(series)
+    print(f"📊 {len(names)} 条序列，观测年份 {', '.join(f'{y:g}' for y in years)}")
+    if rates:
+        print(f"   机构预测的市场CAGR：{', '.join(f'{r:.1%}' for r in rates)} (中位 {np.median(rates):.1%})")
+    for model in args.model:
+        print_forecast(names, forecast(years, matrix, args.years, model, args.level))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())